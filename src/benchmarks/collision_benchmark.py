@@ -0,0 +1,56 @@
+"""Compares the collision detection broad phases on recorded game rounds.
+
+Run from the `src` directory with `python3 -m benchmarks.collision_benchmark`
+or with `invoke benchmark-collisions` from the project root.
+"""
+import argparse
+import time
+
+from benchmarks.recording import init_headless_display, load_config, record_round
+from game.collisions import create_broad_phase, intersecting_pairs, CollisionStats
+
+ENGINES = ["brute_force", "spatial_hash", "sweep_and_prune"]
+
+
+def run_engine(broad_phase, snapshots):
+    """Runs the collision detection on every snapshot.
+
+    Returns:
+        A tuple (seconds, pairs_tested, pairs_hit)
+    """
+    collision_stats = CollisionStats()
+    start = time.perf_counter()
+    for snapshot in snapshots:
+        intersecting_pairs(broad_phase.candidate_pairs(snapshot), collision_stats)
+    seconds = time.perf_counter() - start
+    return seconds, collision_stats.pairs_tested, collision_stats.pairs_hit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=600,
+                        help="the number of recorded ticks per level")
+    parser.add_argument("--cell-size", type=float, default=None,
+                        help="the spatial hash cell size (default: from config)")
+    args = parser.parse_args()
+
+    init_headless_display()
+    config = load_config()
+    cell_size = args.cell_size or config.collision_cell_size
+
+    for level_config in config.level_config_selector.level_configs:
+        snapshots = record_round(config, level_config, args.ticks)
+        n_objects = sum(len(x) for x in snapshots) / len(snapshots)
+        print(f"level '{level_config.name()}': {len(snapshots)} ticks, "
+              f"{n_objects:.1f} objects per tick")
+        print(f"{'engine':>16} {'ms/tick':>9} {'tested/tick':>12} {'hit/tick':>9}")
+        for engine in ENGINES:
+            broad_phase = create_broad_phase(engine, cell_size)
+            seconds, tested, hit = run_engine(broad_phase, snapshots)
+            print(f"{engine:>16} {1000 * seconds / len(snapshots):9.3f} "
+                  f"{tested / len(snapshots):12.1f} {hit / len(snapshots):9.2f}")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Measures the Python heap memory used by live bullets and planes.
+
+The memory is measured with tracemalloc so that only the allocations
+made by Python are counted. The pixel data of the images is allocated
+by SDL and is not included.
+
+Run from the `src` directory with `python3 -m benchmarks.memory_benchmark`
+or with `invoke benchmark-memory` from the project root.
+"""
+import argparse
+import gc
+import tracemalloc
+
+# imported before pygame to hide the pygame start message
+from benchmarks.recording import init_headless_display, load_config
+from pygame import Vector2
+
+from game.game_objects import PlaneFactory
+from game.projectiles import ProjectileSystem
+
+
+class _Input:
+    """The part of the PlayerInput interface needed by PlaneFactory."""
+    def bind_plane(self, plane):
+        pass
+
+
+def bytes_per_object(create, n_objects):
+    """Returns the heap memory used per object created with `create`.
+
+    Arguments:
+        `create`: A function returning an object when called with an index
+        `n_objects`: A positive integer
+            The number of objects kept alive at the same time.
+
+    Returns:
+        A float
+    """
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    objects = [create(i) for i in range(n_objects)]
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # the list itself is not part of the objects
+    return (end - start - objects.__sizeof__()) / n_objects
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bullets", type=int, default=10000,
+                        help="the number of live bullets")
+    parser.add_argument("--planes", type=int, default=1000,
+                        help="the number of live planes")
+    args = parser.parse_args()
+
+    init_headless_display()
+    config = load_config()
+    plane_config = config.plane_config
+    projectile_system = ProjectileSystem.from_config(
+        plane_config.gun_config.bullet_config)
+    owner = object()
+
+    def bullet(i):
+        return projectile_system.bullet(Vector2(i, 0), Vector2(0, 0),
+                                        Vector2(1, 0), owner)
+
+    plane_factory = PlaneFactory(plane_config, projectile_system)
+    player_input = _Input()
+    # loads the plane image into the image cache
+    plane_factory.plane(player_input, owner)
+
+    def plane(i):
+        return plane_factory.plane(player_input, owner)
+
+    print(f"{'object':>7} {'count':>7} {'bytes/object':>13}")
+    for name, create, count in [("bullet", bullet, args.bullets),
+                                ("plane", plane, args.planes)]:
+        print(f"{name:>7} {count:7d} {bytes_per_object(create, count):13.1f}")
+
+
+if __name__ == '__main__':
+    main()
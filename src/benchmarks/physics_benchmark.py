@@ -0,0 +1,72 @@
+"""Compares the per-plane update cost of the plane physics implementations.
+
+"decorators" is the chain PhysicsController(WingPhysics(BodyPhysics(
+BasePhysics))) and "force generators" is the flat ControlledPhysics used
+by PlaneFactory. Both are driven with the same scripted controls.
+
+Run from the `src` directory with `python3 -m benchmarks.physics_benchmark`
+or with `invoke benchmark-physics` from the project root.
+"""
+import argparse
+import time
+
+# imported before pygame to hide the pygame start message
+from benchmarks.recording import init_headless_display, load_config
+from pygame import Vector2
+
+from game.gravity import UniformGravity
+from game.physics import BasePhysics, BodyPhysics, WingPhysics, PhysicsController
+from game.physics import ControlledPhysics, WingForce, BodyForce
+
+
+def decorator_physics(plane_config, gravity_callback):
+    """Returns the plane physics as a chain of PhysicsDecorators."""
+    tmp = BasePhysics(Vector2(0, 0), Vector2(0, 0), Vector2(1, 0))
+    tmp = BodyPhysics(tmp, plane_config.body_drag, gravity_callback)
+    tmp = WingPhysics(tmp, plane_config.wing_size)
+    return PhysicsController(tmp, plane_config.acceleration, plane_config.rotation)
+
+
+def force_generator_physics(plane_config, gravity_callback):
+    """Returns the plane physics as a ControlledPhysics."""
+    return ControlledPhysics(
+        Vector2(0, 0), Vector2(0, 0), Vector2(1, 0),
+        plane_config.acceleration, plane_config.rotation,
+        [WingForce(plane_config.wing_size),
+         BodyForce(plane_config.body_drag, gravity_callback)])
+
+
+def fly(physics, n_updates, delta_time):
+    """Flies loops with `physics` and returns the seconds taken."""
+    start = time.perf_counter()
+    for i in range(n_updates):
+        physics.accelerate()
+        if i % 120 < 60:
+            physics.up()
+        physics.update(delta_time)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=100000,
+                        help="the number of updates per implementation")
+    args = parser.parse_args()
+
+    init_headless_display()
+    config = load_config()
+    plane_config = config.plane_config
+    gravity_callback = UniformGravity(Vector2(0, plane_config.gravity)).at
+
+    delta_time = 1 / config.game_fps
+    print(f"{'physics':>17} {'us/update':>10} {'final location':>26}")
+    for name, factory in [("decorators", decorator_physics),
+                          ("force generators", force_generator_physics)]:
+        physics = factory(plane_config, gravity_callback)
+        seconds = fly(physics, args.updates, delta_time)
+        location = f"({physics.location[0]:.3f}, {physics.location[1]:.3f})"
+        print(f"{name:>17} {1e6 * seconds / args.updates:10.3f} {location:>26}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+import itertools
+import math
+import os
+
+# imported before pygame to hide the pygame start message
+from config import CONFIG_PATH, Config
+from pygame import Vector2
+import pygame
+
+from game.game import GameState
+from game.game_objects import PlaneFactory
+from game.projectiles import ProjectileSystem
+from game.shapes import Circle, Rectangle
+from utils.timing import Timer
+
+
+class _Pilot:
+    """A scripted player flying loops and shooting all the time.
+
+    Implements the parts of the Player and PlayerInput interfaces
+    needed by GameState and PlaneFactory."""
+
+    def __init__(self, plane_factory, turn_period):
+        self._plane_factory = plane_factory
+        self._turn_period = turn_period
+        self._plane = None
+        self._time = 0.0
+        self._new_objects = []
+
+    def bind_plane(self, plane):
+        self._plane = plane
+
+    def update(self, delta_time):
+        self._time += delta_time
+        if self._plane is None or not self._plane.alive():
+            self._new_objects.append(self._plane_factory.plane(self, self))
+
+        self._plane.accelerate()
+        if math.sin(2 * math.pi * self._time / self._turn_period) > 0:
+            self._plane.up()
+        else:
+            self._plane.down()
+        self._plane.shoot()
+
+    def new_objects(self):
+        tmp = self._new_objects
+        self._new_objects = []
+        return tmp
+
+    def process_reward(self, score, issuer):
+        pass
+
+    def add_kill(self, target_owner):
+        pass
+
+    def add_shot_fired(self):
+        pass
+
+
+class RecordedObject:
+    """A frozen copy of a GameObject at a single tick.
+
+    Attributes:
+        `shape`: A Shape
+            A copy of the GameObject's shape
+        `collision_category`: An integer
+        `collision_mask`: An integer
+    """
+    def __init__(self, game_object):
+        self.shape = _copy_shape(game_object.shape)
+        self.collision_category = game_object.collision_category
+        self.collision_mask = game_object.collision_mask
+
+
+def _copy_shape(shape):
+    if isinstance(shape, Circle):
+        return Circle(Vector2(shape.center), shape.radius)
+    if isinstance(shape, Rectangle):
+        return Rectangle(Vector2(shape.sides[0].begin), Vector2(shape.sides[3].begin),
+                         Vector2(shape.sides[0].end))
+    # the level geometry is static
+    return shape
+
+
+def init_headless_display():
+    """Initializes pygame so that images can be loaded without a window."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1), flags=pygame.HIDDEN)
+
+
+def load_config():
+    """Returns the game Config"""
+    return Config(CONFIG_PATH)
+
+
+def record_round(config, level_config, n_ticks):
+    """Records the GameObjects of a scripted game round.
+
+    Every starting location of the level is occupied by a plane
+    flying loops and shooting as fast as it can.
+
+    Arguments:
+        `config`: A Config
+        `level_config`: A LevelConfig
+        `n_ticks`: A positive integer
+            The number of recorded ticks.
+
+    Returns:
+        A list of lists of RecordedObject objects:
+            The objects present at each tick.
+    """
+    gravity_field = level_config.gravity_field()
+    projectile_system = ProjectileSystem.from_config(
+        config.plane_config.gun_config.bullet_config, gravity_field)
+    pilots = []
+    for i, start_position in enumerate(level_config.starting_locations()):
+        plane_factory = PlaneFactory(config.plane_config, projectile_system,
+                                     gravity_field)
+        plane_factory.start_position = Vector2(start_position)
+        pilots.append(_Pilot(plane_factory, turn_period=2 + i))
+
+    game_state = GameState(level_config.game_objects(), pilots,
+                           level_config.name(), Timer(),
+                           projectile_system=projectile_system)
+    delta_time = 1 / config.game_fps
+    snapshots = []
+    for _ in range(n_ticks):
+        game_state.run_tick(delta_time)
+        snapshots.append([RecordedObject(x) for x in itertools.chain(
+            game_state.static_objects, game_state.game_objects)])
+    return snapshots
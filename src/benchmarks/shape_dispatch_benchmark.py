@@ -0,0 +1,52 @@
+"""Measures the cost of `Shape.intersects` for every pair of Shape types.
+
+The shapes of each pair overlap so that the bounding box test passes
+and the exact test is looked up from the intersection table.
+
+Run from the `src` directory with `python3 -m benchmarks.shape_dispatch_benchmark`
+or with `invoke benchmark-shape-dispatch` from the project root.
+"""
+import argparse
+import itertools
+import timeit
+
+from pygame import Vector2
+
+from game.shapes import Circle, Line, Rectangle, Polyline
+
+
+def sample_shapes():
+    """Returns a dict from Shape type names to overlapping Shapes."""
+    return {
+        "Circle": Circle(Vector2(5, 5), 1),
+        "Line": Line(Vector2(0, 0), Vector2(10, 10)),
+        "Rectangle": Rectangle(Vector2(4, 4), Vector2(6, 4), Vector2(4, 6)),
+        "Polyline": Polyline.from_points(
+            [Vector2(x, 5 + (-1) ** x) for x in range(11)]),
+    }
+
+
+def time_pair(shape_1, shape_2, number):
+    """Returns the mean time of `shape_1.intersects(shape_2)` in microseconds."""
+    seconds = timeit.timeit(lambda: shape_1.intersects(shape_2), number=number)
+    return 1e6 * seconds / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100000,
+                        help="the number of calls per pair")
+    args = parser.parse_args()
+
+    shapes = sample_shapes()
+    print(f"{'pair':>22} {'us/pair':>9} {'result':>7}")
+    for name_1, name_2 in itertools.product(shapes, repeat=2):
+        shape_1 = shapes[name_1]
+        shape_2 = shapes[name_2]
+        microseconds = time_pair(shape_1, shape_2, args.number)
+        result = shape_1.intersects(shape_2)
+        print(f"{name_1 + ' x ' + name_2:>22} {microseconds:9.3f} {str(result):>7}")
+
+
+if __name__ == '__main__':
+    main()
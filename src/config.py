@@ -14,7 +14,9 @@ import jsonschema
 
 from graphics.graphics import PolylineGraphic
 from game.shapes import Polyline
-from game.game_objects import Ground
+from game.game_objects import Ground, collision_mask_from_names
+from game.physics import WingProfile
+from game.gravity import UniformGravity, GridGravity
 
 
 project_root = Path(__file__).parent.parent
@@ -87,6 +89,10 @@ class Config:
             self.pause_blur_radius = data["pause_blur_radius"]
 
             self.game_fps = data["game_fps"]
+            self.collision_engine = data["collision_engine"]
+            self.collision_cell_size = data["collision_cell_size"]
+            self.sprite_angle_step = data["sprite_angle_step"]
+            self.sprite_cache_megabytes = data["sprite_cache_megabytes"]
 
         except ValidationError as ex:
             logging.critical(ex)
@@ -124,6 +130,18 @@ class LevelConfig:
         """Returns the starting locations for the players' planes"""
         return self._data["starting_locations"][:]
 
+    def gravity_field(self):
+        """Returns the GravityField of the level.
+
+        The field is in the units of the gravity of the planes and
+        the bullets. Without a "gravity_grid" in the level config, it
+        points down with the length of 1 everywhere."""
+        if "gravity_grid" not in self._data:
+            return UniformGravity(Vector2(0, 1))
+        grid = self._data["gravity_grid"]
+        return GridGravity(Vector2(grid["origin"]), grid["cell_size"],
+                           [[Vector2(x) for x in row] for row in grid["values"]])
+
     def game_objects(self):
         result = []
         for ground_line_config in self._data["ground_lines"]:
@@ -133,10 +151,13 @@ class LevelConfig:
     def _read_ground_line_config(self, ground_line_config):
         points = [Vector2(x) for x in ground_line_config["points"]]
         shape = Polyline.from_points(points)
+        shape.hierarchy()
         color = tuple(ground_line_config["color"])
         width = ground_line_config["width"]
         graphic = PolylineGraphic(shape, color, width)
-        return Ground(shape, graphic)
+        mask = collision_mask_from_names(
+            self._data.get("ground_collision_mask", ["plane", "bullet"]))
+        return Ground(shape, graphic, collision_mask=mask)
 
 
 class LevelConfigSelector:
@@ -276,6 +297,8 @@ class PlaneConfig:
         except jsonschema.exceptions.ValidationError as ex:
             msg = str(ex)
             raise ValidationError("Error parsing plane config:\n" + msg)
+        if "wing_profile" in data:
+            self._validate_wing_profile(data["wing_profile"])
         self.image_file_path = plane_config_path.parent / data["image_file_path"]
         self.gun_config = GunConfig(plane_config_path.parent / data["gun_config_path"])
         self.size = Vector2(data["size"]["width"], data["size"]["height"])
@@ -289,6 +312,22 @@ class PlaneConfig:
         self.score_per_damage = data["score_per_damage"]
         self.score_when_destroyed = data["score_when_destroyed"]
         self.cost = data["cost"]
+        self.collision_mask = collision_mask_from_names(
+            data.get("collision_mask", ["ground", "plane", "bullet"]))
+        self.integrator = data["integrator"]
+        if "wing_profile" in data:
+            self.wing_profile = WingProfile.from_config(data["wing_profile"])
+        else:
+            self.wing_profile = WingProfile.symmetric()
+
+    def _validate_wing_profile(self, wing_profile):
+        n_angles = len(wing_profile["angles_of_attack"])
+        if len(wing_profile["lift_coefficients"]) != n_angles \
+                or len(wing_profile["drag_coefficients"]) != n_angles:
+            raise ValidationError(
+                "Error parsing plane config:\n"
+                "wing_profile should have as many lift_coefficients and "
+                "drag_coefficients as angles_of_attack")
 
 class GunConfig:
     """A class for reading and storing the properties of a gun."""
@@ -324,3 +363,6 @@ class BulletConfig:
         self.health = data["health"]
         self.collision_damage = data["collision_damage"]
         self.timeout = data["timeout"]
+        self.pool_size = data["pool_size"]
+        self.collision_mask = collision_mask_from_names(
+            data.get("collision_mask", ["ground", "plane", "bullet"]))
@@ -0,0 +1,85 @@
+class _Node:
+    """A node of a BoundingVolumeHierarchy.
+
+    Leaf nodes have `items` and inner nodes have `left` and `right`."""
+    def __init__(self, bounding_box, items=None, left=None, right=None):
+        self.bounding_box = bounding_box
+        self.items = items
+        self.left = left
+        self.right = right
+
+
+class BoundingVolumeHierarchy:
+    """A bounding volume hierarchy for static Shapes.
+
+    Organizes the Shapes into a binary tree where each node stores the
+    BoundingBox of all of the Shapes under it. Finding the Shapes
+    overlapping a BoundingBox then takes O(log n + k) time instead of O(n).
+
+    NOTE: The Shapes should not be moved after the hierarchy has been built.
+    """
+    def __init__(self, shapes, leaf_size=4):
+        """Initializes BoundingVolumeHierarchy.
+
+        Arguments:
+            `shapes`: A list of Shape objects
+                The Shapes stored in the hierarchy.
+            `leaf_size`: A positive integer
+                The maximum number of Shapes stored in a single leaf node.
+        """
+        if leaf_size < 1:
+            raise ValueError("The leaf size should be positive")
+        self._leaf_size = leaf_size
+        self._root = None
+        if len(shapes) > 0:
+            self._root = self._build(list(shapes))
+
+    def query(self, bounding_box, margin=0.0):
+        """Returns the Shapes whose BoundingBox overlaps `bounding_box`.
+
+        Arguments:
+            `bounding_box`: A BoundingBox
+            `margin`: A non-negative float
+                See BoundingBox.overlaps
+
+        Returns:
+            A list of Shape objects
+        """
+        result = []
+        if self._root is None:
+            return result
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if not node.bounding_box.overlaps(bounding_box, margin):
+                continue
+            if node.items is not None:
+                result.extend(item for item in node.items
+                              if item.bounding_box().overlaps(bounding_box, margin))
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+        return result
+
+    def _build(self, shapes):
+        bounding_box = shapes[0].bounding_box()
+        for shape in shapes[1:]:
+            bounding_box = bounding_box.union(shape.bounding_box())
+
+        if len(shapes) <= self._leaf_size:
+            return _Node(bounding_box, items=shapes)
+
+        # split along the longer axis at the median of the box centers
+        axis = 0
+        if bounding_box.bottom - bounding_box.top > bounding_box.right - bounding_box.left:
+            axis = 1
+        shapes.sort(key=lambda shape: self._center(shape.bounding_box(), axis))
+        middle = len(shapes) // 2
+        return _Node(bounding_box, left=self._build(shapes[:middle]),
+                     right=self._build(shapes[middle:]))
+
+    def _center(self, bounding_box, axis):
+        if axis == 0:
+            return bounding_box.left + bounding_box.right
+        return bounding_box.top + bounding_box.bottom
@@ -0,0 +1,442 @@
+import math
+import itertools
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from constants import EPS
+from game.shapes import Circle, Line, Polyline
+from game.bvh import BoundingVolumeHierarchy
+
+
+class CollisionStats:
+    """A class for counting the work done in the collision detection.
+
+    Attributes:
+        `pairs_tested`: A non-negative integer
+            The number of GameObject pairs whose shapes were tested
+            for intersection.
+        `pairs_hit`: A non-negative integer
+            The number of tested pairs that intersected.
+    """
+    def __init__(self):
+        """Initializes CollisionStats with zero counts."""
+        self.pairs_tested = 0
+        self.pairs_hit = 0
+
+    def reset(self):
+        """Sets all counts to zero."""
+        self.pairs_tested = 0
+        self.pairs_hit = 0
+
+    def hit_fraction(self):
+        """Returns the fraction of the tested pairs that intersected.
+
+        Returns 0.0 if no pairs were tested."""
+        if self.pairs_tested == 0:
+            return 0.0
+        return self.pairs_hit / self.pairs_tested
+
+    def __repr__(self):
+        return (f"CollisionStats(pairs_tested = {self.pairs_tested}, "
+                f"pairs_hit = {self.pairs_hit})")
+
+
+def can_collide(object_1, object_2):
+    """Returns True if the collision masks allow `object_1` and `object_2` to collide.
+
+    Arguments:
+        `object_1`, `object_2`: GameObject objects
+    """
+    return (object_1.collision_category & object_2.collision_mask) != 0 \
+        and (object_2.collision_category & object_1.collision_mask) != 0
+
+
+class BroadPhase(ABC):
+    """A base class for the collision detection broad phases.
+
+    A broad phase selects the GameObject pairs that might intersect
+    so that the exact intersection test is only done for them.
+    The pairs excluded by the collision masks (see `can_collide`) are
+    never returned.
+    """
+    @abstractmethod
+    def candidate_pairs(self, game_objects):
+        """Returns the pairs of GameObjects that might intersect.
+
+        Arguments:
+            `game_objects`: A list of GameObject objects
+
+        Returns:
+            A list of tuples (GameObject, GameObject):
+                Contains all intersecting pairs allowed by the collision
+                masks. Each pair is listed only
+                once and the pairs are in the same order as
+                `itertools.combinations(game_objects, 2)` would list them.
+        """
+        pass
+
+
+class BruteForceBroadPhase(BroadPhase):
+    """A broad phase returning all of the GameObject pairs."""
+    def candidate_pairs(self, game_objects):
+        """See the base class"""
+        return [(object_1, object_2)
+                for object_1, object_2 in itertools.combinations(game_objects, 2)
+                if can_collide(object_1, object_2)]
+
+
+class SpatialHashBroadPhase(BroadPhase):
+    """A uniform grid broad phase for the collision detection.
+
+    Each GameObject is inserted to every grid cell overlapped by the
+    bounding box of its shape. Only the GameObjects sharing at least
+    one cell are paired.
+
+    GameObjects overlapping more than `max_cells` cells (e.g. the level
+    borders) are not inserted to the grid but are paired with every
+    other GameObject instead.
+    """
+    def __init__(self, cell_size, max_cells=64):
+        """Initializes SpatialHashBroadPhase.
+
+        Arguments:
+            `cell_size`: A positive float
+                The width and height of a single grid cell in the game
+                world coordinates.
+            `max_cells`: A positive integer
+                The maximum number of cells a single GameObject is
+                inserted to.
+        """
+        if cell_size <= 0:
+            raise ValueError("The cell size should be positive")
+        self._cell_size = cell_size
+        self._max_cells = max_cells
+
+    def candidate_pairs(self, game_objects):
+        """See the base class"""
+        cells = {}
+        large = []
+        for index, game_object in enumerate(game_objects):
+            bounding_box = game_object.shape.bounding_box()
+            if bounding_box.is_empty():
+                continue
+            cell_range = self._cell_range(bounding_box)
+            if self._n_cells(cell_range) > self._max_cells:
+                large.append(index)
+                continue
+            for cell in self._cells(cell_range):
+                cells.setdefault(cell, []).append(index)
+
+        pairs = set()
+        for indices in cells.values():
+            pairs.update(itertools.combinations(indices, 2))
+
+        for large_index in large:
+            for index in range(len(game_objects)):
+                if index != large_index:
+                    pairs.add((min(index, large_index), max(index, large_index)))
+
+        return [(game_objects[i], game_objects[j]) for i, j in sorted(pairs)
+                if can_collide(game_objects[i], game_objects[j])]
+
+    def _cell_range(self, bounding_box):
+        # the shapes closer than EPS are considered intersecting
+        return (math.floor((bounding_box.left - EPS) / self._cell_size),
+                math.floor((bounding_box.top - EPS) / self._cell_size),
+                math.floor((bounding_box.right + EPS) / self._cell_size),
+                math.floor((bounding_box.bottom + EPS) / self._cell_size))
+
+    def _n_cells(self, cell_range):
+        left, top, right, bottom = cell_range
+        return (right - left + 1) * (bottom - top + 1)
+
+    def _cells(self, cell_range):
+        left, top, right, bottom = cell_range
+        for x in range(left, right + 1):
+            for y in range(top, bottom + 1):
+                yield (x, y)
+
+
+class SweepAndPruneBroadPhase(BroadPhase):
+    """A sort and sweep broad phase for the collision detection.
+
+    The GameObjects are sorted by the left edge of their bounding boxes
+    and swept from left to right. Only the GameObjects overlapping
+    both horizontally and vertically are paired.
+
+    The order from the previous call is used as the starting point of
+    the sort. As the GameObjects move only a little between ticks, the
+    order is almost sorted and insertion sort runs in close to linear time.
+    """
+    def __init__(self):
+        """Initializes SweepAndPruneBroadPhase."""
+        self._order = []
+
+    def candidate_pairs(self, game_objects):
+        """See the base class"""
+        indices = {id(game_object): index
+                   for index, game_object in enumerate(game_objects)}
+        order = [x for x in self._order if id(x) in indices]
+        known = set(id(x) for x in order)
+        order.extend(x for x in game_objects if id(x) not in known)
+
+        boxes = [x.shape.bounding_box() for x in order]
+        self._insertion_sort(order, boxes)
+        self._order = order
+
+        pairs = []
+        # the swept GameObjects whose boxes can still reach the next ones
+        active = []
+        for game_object, box in zip(order, boxes):
+            if box.is_empty():
+                continue
+            # the boxes ending before `box` are dropped in place while
+            # the rest are tested against `box`
+            n_kept = 0
+            for entry in active:
+                other, other_box = entry
+                if other_box.right + EPS < box.left:
+                    continue
+                active[n_kept] = entry
+                n_kept += 1
+                if not can_collide(other, game_object):
+                    continue
+                if other_box.top <= box.bottom + EPS \
+                        and box.top <= other_box.bottom + EPS:
+                    index_1 = indices[id(other)]
+                    index_2 = indices[id(game_object)]
+                    pairs.append((min(index_1, index_2), max(index_1, index_2)))
+            del active[n_kept:]
+            active.append((game_object, box))
+
+        pairs.sort()
+        return [(game_objects[i], game_objects[j]) for i, j in pairs]
+
+    def _insertion_sort(self, order, boxes):
+        """Sorts `order` and `boxes` in place by the left edges of `boxes`"""
+        for i in range(1, len(order)):
+            game_object = order[i]
+            box = boxes[i]
+            j = i - 1
+            while j >= 0 and boxes[j].left > box.left:
+                order[j + 1] = order[j]
+                boxes[j + 1] = boxes[j]
+                j -= 1
+            order[j + 1] = game_object
+            boxes[j + 1] = box
+
+
+class StaticObjectIndex:
+    """Finds the candidate pairs between moving and static GameObjects.
+
+    The static GameObjects are indexed once into a
+    BoundingVolumeHierarchy, so each tick only the moving GameObjects
+    are looked up from it and the static GameObjects are never paired
+    with each other.
+
+    NOTE: The static GameObjects should not be moved after the index
+    has been built.
+    """
+    def __init__(self, static_objects):
+        """Initializes StaticObjectIndex.
+
+        Arguments:
+            `static_objects`: A list of GameObject objects
+        """
+        self._objects = {id(x.shape): x for x in static_objects}
+        self._hierarchy = BoundingVolumeHierarchy(
+            [x.shape for x in static_objects if not x.shape.bounding_box().is_empty()])
+
+    def candidate_pairs(self, game_objects):
+        """Returns the pairs of moving and static GameObjects that might intersect.
+
+        Arguments:
+            `game_objects`: A list of GameObject objects
+                The moving GameObjects
+
+        Returns:
+            A list of tuples (GameObject, GameObject):
+                The first GameObject of each pair is from `game_objects`
+                and the second one is static. Contains all intersecting pairs
+                allowed by the collision masks.
+        """
+        pairs = []
+        for game_object in game_objects:
+            bounding_box = game_object.shape.bounding_box()
+            if bounding_box.is_empty():
+                continue
+            for shape in self._hierarchy.query(bounding_box, EPS):
+                static_object = self._objects[id(shape)]
+                if can_collide(game_object, static_object):
+                    pairs.append((game_object, static_object))
+        return pairs
+
+
+def create_broad_phase(collision_engine, cell_size):
+    """Creates the broad phase selected by `collision_engine`.
+
+    Arguments:
+        `collision_engine`: A string
+            "brute_force", "spatial_hash" or "sweep_and_prune"
+        `cell_size`: A positive float
+            The cell size used by the spatial hash broad phase.
+
+    Returns:
+        A BroadPhase
+    """
+    if collision_engine == "brute_force":
+        return BruteForceBroadPhase()
+    if collision_engine == "spatial_hash":
+        return SpatialHashBroadPhase(cell_size)
+    if collision_engine == "sweep_and_prune":
+        return SweepAndPruneBroadPhase()
+    raise ValueError(f"Unknown collision engine '{collision_engine}'")
+
+
+def circles_intersect_segments(centers, radii, begins, ends):
+    """Tests circles against line segments with a single vectorized pass.
+
+    Row `i` of the arguments describes the circle and the segment of
+    the `i`th pair. Gives the same results as `Line._intersects_circle`.
+
+    Arguments:
+        `centers`: A numpy array of shape (n, 2)
+        `radii`: A numpy array of shape (n,)
+        `begins`: A numpy array of shape (n, 2)
+        `ends`: A numpy array of shape (n, 2)
+            NOTE: The segments should have a positive length.
+
+    Returns:
+        A boolean numpy array of shape (n,):
+            True for the intersecting pairs.
+    """
+    v = ends - begins
+    p = centers - begins
+    pos = (v * p).sum(axis=1) / (v * v).sum(axis=1)
+    projection = p - pos[:, np.newaxis] * v
+    to_end = p - v
+    distance = np.where(
+        (0.0 <= pos) & (pos <= 1.0),
+        np.sqrt((projection * projection).sum(axis=1)),
+        np.minimum(np.sqrt((p * p).sum(axis=1)),
+                   np.sqrt((to_end * to_end).sum(axis=1))))
+    return distance < radii + EPS
+
+
+class CircleSegmentBatch:
+    """Collects Circle vs. Line/Polyline pairs and tests them together.
+
+    Bullets are Circles and the ground is made of Lines, so most of the
+    narrow phase tests are between a circle and a line segment. Instead of
+    testing the pairs one by one, the circles and the nearby segments are
+    stacked into arrays and tested with `circles_intersect_segments`.
+    """
+    def __init__(self):
+        """Initializes an empty CircleSegmentBatch."""
+        self._pairs = []
+
+    @staticmethod
+    def accepts(shape_1, shape_2):
+        """Returns True if the pair of `shape_1` and `shape_2` can be batched"""
+        if isinstance(shape_1, Circle):
+            return isinstance(shape_2, (Line, Polyline))
+        if isinstance(shape_2, Circle):
+            return isinstance(shape_1, (Line, Polyline))
+        return False
+
+    def add(self, object_1, object_2):
+        """Adds a GameObject pair whose shapes are accepted by `accepts`"""
+        self._pairs.append((object_1, object_2))
+
+    def resolve(self):
+        """Tests all of the added pairs and empties `self`.
+
+        Returns:
+            A list of tuples (GameObject, GameObject):
+                The intersecting pairs in the order they were added.
+        """
+        pairs = self._pairs
+        return [pairs[i] for i in self.resolve_indices()]
+
+    def resolve_indices(self):
+        """Tests all of the added pairs and empties `self`.
+
+        Returns:
+            An increasing list of the indices of the intersecting pairs
+            in the order they were added.
+        """
+        centers = []
+        radii = []
+        begins = []
+        ends = []
+        pair_indices = []
+        for index, (object_1, object_2) in enumerate(self._pairs):
+            circle, segments = object_1.shape, object_2.shape
+            if not isinstance(circle, Circle):
+                circle, segments = segments, circle
+            center = (circle.center[0], circle.center[1])
+            for line in self._nearby_lines(circle, segments):
+                centers.append(center)
+                radii.append(circle.radius)
+                begins.append((line.begin[0], line.begin[1]))
+                ends.append((line.end[0], line.end[1]))
+                pair_indices.append(index)
+
+        self._pairs = []
+        if len(pair_indices) == 0:
+            return []
+
+        hits = circles_intersect_segments(np.array(centers), np.array(radii),
+                                          np.array(begins), np.array(ends))
+        return np.unique(np.array(pair_indices)[hits]).tolist()
+
+    def _nearby_lines(self, circle, segments):
+        circle_box = circle.bounding_box()
+        if not circle_box.overlaps(segments.bounding_box(), EPS):
+            return []
+        if isinstance(segments, Line):
+            return [segments]
+        return segments.hierarchy().query(circle_box, EPS)
+
+
+def intersecting_pairs(candidate_pairs, collision_stats):
+    """The narrow phase of the collision detection.
+
+    Circle vs. Line/Polyline pairs are tested together with
+    CircleSegmentBatch and the other pairs with `Shape.intersects`.
+
+    Arguments:
+        `candidate_pairs`: An iterable of tuples (GameObject, GameObject)
+            The pairs returned by a BroadPhase
+        `collision_stats`: A CollisionStats
+            The tested and intersecting pairs are added to this.
+
+    Returns:
+        A list of tuples (GameObject, GameObject):
+            The pairs whose shapes intersect in the order of
+            `candidate_pairs`.
+    """
+    result = []
+    # the batched pairs are kept in `result` at their positions in the
+    # candidate order until the batch tells which of them missed
+    batched_positions = []
+    batch = CircleSegmentBatch()
+    for object_1, object_2 in candidate_pairs:
+        collision_stats.pairs_tested += 1
+        if batch.accepts(object_1.shape, object_2.shape):
+            batch.add(object_1, object_2)
+            batched_positions.append(len(result))
+            result.append((object_1, object_2))
+        elif object_1.shape.intersects(object_2.shape):
+            result.append((object_1, object_2))
+
+    if batched_positions:
+        missed = set(batched_positions)
+        for index in batch.resolve_indices():
+            missed.discard(batched_positions[index])
+        if missed:
+            result = [pair for position, pair in enumerate(result)
+                      if position not in missed]
+    collision_stats.pairs_hit += len(result)
+    return result
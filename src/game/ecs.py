@@ -0,0 +1,177 @@
+import math
+from abc import ABC, abstractmethod
+
+from pygame import Vector2
+
+# The names of the component stores of a World:
+#   "transform": A Transform
+#   "physics": An object with `update(delta_time)`, `location` and `front`
+#       (e.g. a ControlledPhysics). Moves the "transform" of the entity.
+#   "collider": An object with `shape`, `collision_category`,
+#       `collision_mask`, `collision_damage` and `collide(other)`
+#   "health": An object with `alive()`. Entities without health never die.
+#   "timer": A Timer
+#   "graphic": A Graphic
+#   "owner": A Player
+#   "spawner": An object with `new_objects()` returning the new
+#       GameObjects it has created since the previous call
+COMPONENT_NAMES = ("transform", "physics", "collider", "health", "timer",
+                   "graphic", "owner", "spawner")
+
+# used by `World.query` to detect a missing component
+_MISSING = object()
+
+
+class ComponentStore:
+    """A class storing the components of a single type.
+
+    The components are kept in a dense list parallel to the list of
+    their entities. Removing a component moves the last component to
+    its place, so the order of the components is not preserved.
+
+    Attributes:
+        `entities`: A list of integers
+            The entities having a component in the store.
+            NOTE: Should not be modified outside the store!
+        `components`: A list
+            `components[i]` is the component of `entities[i]`.
+            NOTE: Should not be modified outside the store!
+    """
+    def __init__(self):
+        self.entities = []
+        self.components = []
+        self._indices = {}
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __contains__(self, entity):
+        return entity in self._indices
+
+    def __iter__(self):
+        """Iterates over the (entity, component) pairs"""
+        return zip(self.entities, self.components)
+
+    def add(self, entity, component):
+        """Sets the component of `entity` to `component`."""
+        if entity in self._indices:
+            self.components[self._indices[entity]] = component
+            return
+        self._indices[entity] = len(self.entities)
+        self.entities.append(entity)
+        self.components.append(component)
+
+    def get(self, entity, default=None):
+        """Returns the component of `entity` or `default` if there is none"""
+        index = self._indices.get(entity)
+        if index is None:
+            return default
+        return self.components[index]
+
+    def remove(self, entity):
+        """Removes the component of `entity` if there is one."""
+        index = self._indices.pop(entity, None)
+        if index is None:
+            return
+        last_entity = self.entities.pop()
+        last_component = self.components.pop()
+        if index < len(self.entities):
+            self.entities[index] = last_entity
+            self.components[index] = last_component
+            self._indices[last_entity] = index
+
+
+class World:
+    """A class storing the components of the entities of a game round.
+
+    An entity is an integer id, e.g. the id given by a
+    GameObjectRegistry, and it can have at most one component in each of
+    the stores named in `COMPONENT_NAMES`.
+    """
+    def __init__(self):
+        self._stores = {name: ComponentStore() for name in COMPONENT_NAMES}
+
+    def store(self, name):
+        """Returns the ComponentStore named `name`"""
+        return self._stores[name]
+
+    def add_entity(self, entity, components):
+        """Adds the components of `entity`.
+
+        Arguments:
+            `entity`: An integer
+            `components`: A dict from the names in `COMPONENT_NAMES`
+                to the components of `entity`
+        """
+        for name, component in components.items():
+            if name not in self._stores:
+                raise ValueError(f"Unknown component '{name}'")
+            self._stores[name].add(entity, component)
+
+    def remove_entity(self, entity):
+        """Removes all of the components of `entity`"""
+        for store in self._stores.values():
+            store.remove(entity)
+
+    def query(self, *names):
+        """Iterates over the entities having all of the components `names`.
+
+        Yields:
+            Tuples (entity, component_1, component_2, ...) with the
+            components in the order of `names`
+        """
+        stores = [self._stores[name] for name in names]
+        smallest = min(stores, key=len)
+        # copied so that the stores can be modified during the iteration
+        for entity in list(smallest.entities):
+            components = []
+            for store in stores:
+                component = store.get(entity, _MISSING)
+                if component is _MISSING:
+                    break
+                components.append(component)
+            else:
+                yield (entity, *components)
+
+
+def sync_transform(transform, physics):
+    """Moves `transform` to the location and direction of `physics`"""
+    transform.set(Vector2(physics.location),
+                  -math.radians(physics.front.as_polar()[1]))
+
+
+class System(ABC):
+    """A base class for the systems updating the components of a World."""
+    @abstractmethod
+    def update(self, world, delta_time):
+        """Updates the components of `world`.
+
+        Arguments:
+            `world`: A World
+            `delta_time`: A non-negative float
+                The time passed since the last update
+        """
+        pass
+
+
+class TimerSystem(System):
+    """Advances all of the timers."""
+    def update(self, world, delta_time):
+        """See the base class"""
+        for timer in world.store("timer").components:
+            timer.update(delta_time)
+
+
+class PhysicsSystem(System):
+    """Moves the entities having both physics and a transform."""
+    def update(self, world, delta_time):
+        """See the base class"""
+        for _, physics, transform in world.query("physics", "transform"):
+            physics.update(delta_time)
+            sync_transform(transform, physics)
+
+
+def dead_entities(world):
+    """Returns a list of the entities whose health is not alive"""
+    health_store = world.store("health")
+    return [entity for entity, health in health_store if not health.alive()]
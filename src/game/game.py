@@ -1,10 +1,14 @@
 import sys
-import logging
 import itertools
+import logging
 
 from pygame import Vector2
 
 from game.game_stats import RoundStats
+from game.collisions import CollisionStats, BruteForceBroadPhase
+from game.collisions import intersecting_pairs, StaticObjectIndex
+from game.registry import GameObjectRegistry
+from game.ecs import World, TimerSystem, PhysicsSystem, dead_entities
 from database_connection import DatabaseError
 
 class GameNotification:
@@ -182,14 +186,26 @@ class GameState:
 
     Attributes:
        `game_objects`: A list of GameObject objects
-            The GameObjects currently present in the game round
+            The non-static GameObjects currently present in the game round.
+            NOTE: This is the list of `registry` and should not be modified.
+       `static_objects`: A list of GameObject objects
+            The static GameObjects of the level (see `GameObject.static`).
+            They are not in `registry` and are never updated.
+       `registry`: A GameObjectRegistry
+            Stores the GameObjects and sends the spawn and death events
+       `world`: A World
+            The components of the GameObjects in `registry`. The entity
+            of a GameObject is its id in `registry`.
        `players`: A list of Player objects
             The Players participating the game round
        `level_name`: A string
             The name of the current level
+       `collision_stats`: A CollisionStats
+            The number of pairs tested and hit during the last tick
 
     """
-    def __init__(self, game_objects, players, level_name, timer):
+    def __init__(self, game_objects, players, level_name, timer,
+                 broad_phase=None, projectile_system=None):
         """Initializes a GameState.
 
         Arguments:
@@ -201,11 +217,31 @@ class GameState:
                 The name of the current level
             `timer`: A Timer
                 The timer defining the length of the round
+            `broad_phase`: A BroadPhase or None
+                Used to select the pairs of non-static GameObjects tested
+                for collisions. If None, then all pairs are tested.
+            `projectile_system`: A ProjectileSystem or None
+                Moves the bullets of the round. Updated after the
+                GameObjects on every tick.
         """
-        self.game_objects = game_objects
+        self.registry = GameObjectRegistry()
+        self.world = World()
+        self.registry.bind_spawn(self._add_components)
+        self.registry.bind_death(self._remove_components)
+        self.static_objects = [x for x in game_objects if x.static]
+        for game_object in game_objects:
+            if not game_object.static:
+                self.registry.spawn(game_object)
+        self._static_index = StaticObjectIndex(self.static_objects)
+        self._systems = [TimerSystem(), PhysicsSystem()]
         self.players = players
         self.level_name = level_name
+        self.collision_stats = CollisionStats()
         self._timer = timer
+        if broad_phase is None:
+            broad_phase = BruteForceBroadPhase()
+        self._broad_phase = broad_phase
+        self._projectile_system = projectile_system
 
     def run_tick(self, delta_time):
         """Updates `self` to the next state.
@@ -215,15 +251,21 @@ class GameState:
                 The time difference between the next and current states.
         """
 
+        for transform in self.world.store("transform").components:
+            transform.store_previous()
         self._timer.update(delta_time)
         self._update_players(delta_time)
-        # update the game object list _before_ game object update so that
+        # update the game object registry _before_ game object update so that
         # the newly created bullets will be moved with the plane (otherwise
         # the plane might hit the bullets at high speeds)
-        self._update_game_object_list()
+        self._update_registry()
         self._update_game_objects(delta_time)
         self._handle_collisions()
 
+    @property
+    def game_objects(self):
+        return self.registry.objects
+
     def game_over(self):
         """Returns True if the round has ended and otherwise False"""
         return self._timer.expired()
@@ -236,47 +278,92 @@ class GameState:
         for player in self.players:
             player.update(delta_time)
 
+    def _add_components(self, object_id, game_object):
+        self.world.add_entity(object_id, game_object.components())
+
+    def _remove_components(self, object_id, game_object):
+        self.world.remove_entity(object_id)
+
     def _update_game_objects(self, delta_time):
-        for game_object in self.game_objects:
-            game_object.update(delta_time)
+        for system in self._systems:
+            system.update(self.world, delta_time)
+        if self._projectile_system is not None:
+            self._projectile_system.update(delta_time)
 
     def _handle_collisions(self):
-        for object_1, object_2 in itertools.combinations(self.game_objects, 2):
-            if object_1.shape.intersects(object_2.shape):
-                object_1.collide(object_2)
-                object_2.collide(object_1)
-
-    def _update_game_object_list(self):
-        new_game_objects = []
-        for game_object in self.game_objects:
-            new_game_objects.extend(game_object.new_objects())
+        self.collision_stats.reset()
+        colliders = self.world.store("collider").components
+        # the static pairs first so that e.g. a plane hitting the ground
+        # crashes before it is shot down on the same tick
+        candidate_pairs = itertools.chain(
+            self._static_index.candidate_pairs(colliders),
+            self._broad_phase.candidate_pairs(colliders))
+        for object_1, object_2 in intersecting_pairs(candidate_pairs,
+                                                     self.collision_stats):
+            object_1.collide(object_2)
+            object_2.collide(object_1)
+
+    def _update_registry(self):
+        registry = self.registry
+        # copied as the spawned objects can be spawners too. Their new
+        # objects are collected on the next tick.
+        for spawner in list(self.world.store("spawner").components):
+            for new_object in spawner.new_objects():
+                registry.spawn(new_object)
 
         for player in self.players:
-            new_game_objects.extend(player.new_objects())
+            for new_object in player.new_objects():
+                registry.spawn(new_object)
 
-        self.game_objects = new_game_objects
+        for object_id in dead_entities(self.world):
+            registry.despawn(object_id)
 
 
 class Game:
     """A class representing a single game round.
 
+    The simulation is run with a fixed time step of `clock.delta_time`
+    independent of the rendering. The real time passed since the previous
+    frame is accumulated and as many ticks are run as fit into it. If
+    the rendering falls behind, the following frames run extra ticks to
+    catch up. The frames are rendered between the two last simulated
+    states using the time left in the accumulator.
+
     Attributes:
         `game_state`: A GameState object
             The current state of the game round.
     """
-    def __init__(self, game_input, game_state, game_renderer, clock):
+    def __init__(self, game_input, game_state, game_renderer, clock,
+                 max_ticks_per_frame=5):
+        """Initializes Game.
+
+        Arguments:
+            `game_input`: A GameInput
+            `game_state`: A GameState
+            `game_renderer`: A GameRenderer
+            `clock`: A Clock
+                Defines the frame rate and the simulation time step.
+            `max_ticks_per_frame`: A positive integer
+                The maximum number of ticks run before rendering a frame.
+                If more time has passed, the rest is dropped and the game
+                slows down instead of falling further behind.
+        """
         self._game_input = game_input
         self.game_state = game_state
         self._game_renderer = game_renderer
         self._clock = clock
+        self._max_ticks_per_frame = max_ticks_per_frame
         self._paused = False
         self._busy_frac_history = []
+        self._accumulator = 0.0
 
     def run(self):
         self._paused = False
         self._game_input.bind_pause(self._toggle_pause)
         self._clock.reset()
         self._busy_frac_history = []
+        # run the first tick immediately
+        self._accumulator = self._clock.delta_time
         while True:
             if self._paused:
                 self._game_input.handle_pause_inputs()
@@ -289,20 +376,49 @@ class Game:
             if self._paused:
                 self._game_renderer.render_pause(self.game_state)
             else:
-                self.game_state.run_tick(self._clock.delta_time)
-                self._game_renderer.render(self.game_state)
+                self._run_ticks()
+                self._game_renderer.render(
+                    self.game_state, self._accumulator / self._clock.delta_time)
 
             if self.game_state.game_over():
                 break
 
             self._clock.tick()
+            if not self._paused:
+                self._accumulator += self._clock.frame_time()
             self._log()
 
+    def _run_ticks(self):
+        delta_time = self._clock.delta_time
+        n_ticks = 0
+        while self._accumulator >= delta_time:
+            if n_ticks == self._max_ticks_per_frame:
+                logging.debug("Dropping time, cannot catch up")
+                self._accumulator = self._accumulator % delta_time
+                break
+            # the game over is checked after each frame, so only the
+            # catch-up ticks need to check it here
+            if n_ticks > 0 and self.game_state.game_over():
+                break
+            # the controls are cleared after each tick, so the held keys
+            # are applied again to the catch-up ticks
+            if n_ticks > 0:
+                self._game_input.handle_held_keys()
+            self.game_state.run_tick(delta_time)
+            self._accumulator -= delta_time
+            n_ticks += 1
+
     def _log(self):
         self._busy_frac_history.append(self._clock.busy_fraction())
+        collision_stats = self.game_state.collision_stats
+        drawn_culled = " ".join(f"{x.drawn}/{x.culled}"
+                                for x in self._game_renderer.render_stats())
         logging.debug(
             f"busy frac: {self._clock.busy_fraction():5.3f}, "
-            f"average(10): {self._mean(self._busy_frac_history):6.3f}"
+            f"average(10): {self._mean(self._busy_frac_history):6.3f}, "
+            f"pairs tested: {collision_stats.pairs_tested}, "
+            f"pairs hit: {collision_stats.pairs_hit}, "
+            f"drawn/culled per view: {drawn_culled}"
         )
         if len(self._busy_frac_history) >= 10:
             self._busy_frac_history = self._busy_frac_history[1:]
@@ -1,11 +1,41 @@
-import math
 from pygame import Vector2
 from graphics.graphics import ImageGraphic
-from game.shapes import Rectangle, Circle
-from game.physics import BasePhysics, BodyPhysics, WingPhysics
-from game.physics import PhysicsController
+from game.shapes import Rectangle
+from game.physics import ControlledPhysics, WingForce, BodyForce
+from game.physics import create_integrator
+from game.gravity import UniformGravity
+from game.ecs import sync_transform
 from utils.timing import Timer
 
+# The collision categories of GameObjects. A pair of GameObjects
+# is tested for collision only if the category of each is included in
+# the collision mask of the other.
+GROUND_CATEGORY = 1
+PLANE_CATEGORY = 2
+BULLET_CATEGORY = 4
+ALL_CATEGORIES = GROUND_CATEGORY | PLANE_CATEGORY | BULLET_CATEGORY
+
+COLLISION_CATEGORY_NAMES = {
+    "ground": GROUND_CATEGORY,
+    "plane": PLANE_CATEGORY,
+    "bullet": BULLET_CATEGORY,
+}
+
+
+def collision_mask_from_names(category_names):
+    """Returns the collision mask containing the named categories.
+
+    Arguments:
+        `category_names`: An iterable of strings
+            The keys of `COLLISION_CATEGORY_NAMES`
+    """
+    result = 0
+    for name in category_names:
+        if name not in COLLISION_CATEGORY_NAMES:
+            raise ValueError(f"Unknown collision category '{name}'")
+        result |= COLLISION_CATEGORY_NAMES[name]
+    return result
+
 
 def damage_score_generator(damage_score, destroying_score):
     """A closure for a score generator.
@@ -42,7 +72,7 @@ class PlaneFactory:
             The starting position of planes generated by the factory.
     """
 
-    def __init__(self, plane_config):
+    def __init__(self, plane_config, projectile_system, gravity_field=None):
         """Initializes a PlaneFactory class.
 
         NOTE: currently only a reference to `plane_config` is stored
@@ -51,8 +81,18 @@ class PlaneFactory:
         Arguments:
             `plane_config`: A PlaneConfig class
                 The class defining the properties of the generated planes.
+            `projectile_system`: A ProjectileSystem
+                Stores and moves the bullets fired by the generated planes.
+            `gravity_field`: A GravityField or None
+                The gravity of the level in the units of
+                `plane_config.gravity`. If None, then the gravity
+                points down everywhere.
         """
         self._config = plane_config
+        self._projectile_system = projectile_system
+        if gravity_field is None:
+            gravity_field = UniformGravity(Vector2(0, 1))
+        self._gravity_field = gravity_field.scaled(plane_config.gravity)
         self.start_position = Vector2(0, 0)
 
     def plane(self, player_input, owner):
@@ -67,26 +107,22 @@ class PlaneFactory:
         rectangle = self._plane_rectangle(self._config.size)
         image_graphic = ImageGraphic.from_image_path(self._config.image_file_path,
                                                      Vector2(0, 0), self._config.size)
-        gravity = self._config.gravity
-
-        def gravity_callback(position):
-            return Vector2(0, 1) * gravity
-
-        tmp = BasePhysics(Vector2(self.start_position),
-                          Vector2(0, 0), Vector2(1, 0))
-        tmp = BodyPhysics(tmp, self._config.body_drag, gravity_callback)
-        tmp = WingPhysics(tmp, self._config.wing_size)
-        plane_physics = PhysicsController(
-            tmp, self._config.acceleration, self._config.rotation)
+        plane_physics = ControlledPhysics(
+            Vector2(self.start_position), Vector2(0, 0), Vector2(1, 0),
+            self._config.acceleration, self._config.rotation,
+            [WingForce(self._config.wing_size, self._config.wing_profile),
+             BodyForce(self._config.body_drag, self._gravity_field.at)],
+            create_integrator(self._config.integrator))
 
-        gun = Gun.from_config(self._config.gun_config)
+        gun = Gun.from_config(self._config.gun_config, self._projectile_system)
 
 
         _score_generator = damage_score_generator(self._config.score_per_damage,
                                                   self._config.score_when_destroyed)
         plane = Plane(rectangle, image_graphic, plane_physics, gun,
                       _score_generator, owner, health=self._config.health,
-                      collision_damage=self._config.collision_damage)
+                      collision_damage=self._config.collision_damage,
+                      collision_mask=self._config.collision_mask)
         player_input.bind_plane(plane)
 
         return plane
@@ -103,50 +139,16 @@ class PlaneFactory:
                          Vector2(-size[0]/2, size[1]/2))
 
 
-class BulletFactory:
-    """A factory class for Bullet objects"""
-    def __init__(self, bullet_config):
-        """Initializes a BulletFactory.
-
-        Arguments:
-            `bullet_config`: A BulletConfig
-        """
-        self._config = bullet_config
-
-    def bullet(self, location, velocity, front, owner):
-        """Factory method for Bullet.
-
-        Arguments:
-            `location`: A pygame.Vector2
-            `velocity`: A pygame.Vector2
-            `front`: A pygame.Vector2
-                The vector pointing to the front of the bullet.
-                Should have the length of 1.
-            `owner`: A Player
-                The owner of the Bullet
-        """
-        image_graphic = ImageGraphic.from_image_path(self._config.image_file_path,
-                                                     Vector2(0, 0),
-                                                     Vector2(self._config.diameter))
-        circle = Circle(Vector2(0), self._config.diameter)
-        gravity = self._config.gravity
-        def gravity_callback(position):
-            return Vector2(0, 1) * gravity
-        tmp = BasePhysics(location, velocity, front)
-        physics = BodyPhysics(tmp, self._config.body_drag, gravity_callback)
-        return Bullet(circle, image_graphic, physics, owner,
-                      Timer(self._config.timeout), self._config.health,
-                      self._config.collision_damage)
-
 class Gun:
     """A class representing a Gun"""
-    def __init__(self, bullet_factory, timer, spawn_offset, speed):
+    __slots__ = ('_projectile_system', '_timer', '_spawn_offset', '_speed')
+
+    def __init__(self, projectile_system, timer, spawn_offset, speed):
         """Initializes a Gun.
 
         Arguments:
-            `bullet_factory`: BulletFactory
-                The factory used to make the Bullet objects fired
-                by the Gun.
+            `projectile_system`: ProjectileSystem
+                Used to make the Bullet objects fired by the Gun.
             `timer`: A Timer
                 The timer defining the minimum time between consecutive shots.
             `spawn_offset`: A float
@@ -158,22 +160,28 @@ class Gun:
             `speed`: A float
                 The initial speed of the bullet
         """
-        self._bullet_factory = bullet_factory
+        self._projectile_system = projectile_system
         self._timer = timer
         self._spawn_offset = spawn_offset
         self._speed = speed
 
     @classmethod
-    def from_config(cls, gun_config):
+    def from_config(cls, gun_config, projectile_system):
         """Initializes Gun from a config file.
 
         Arguments:
             `gun_config`: A GunConfig
+            `projectile_system`: A ProjectileSystem
+                Should be created from `gun_config.bullet_config`.
         """
-        bullet_factory = BulletFactory(gun_config.bullet_config)
-        return cls(bullet_factory, Timer(gun_config.bullet_spawn_time),
+        return cls(projectile_system, Timer(gun_config.bullet_spawn_time),
                    gun_config.bullet_spawn_offset, gun_config.bullet_speed)
 
+    @property
+    def timer(self):
+        """The Timer defining the minimum time between consecutive shots"""
+        return self._timer
+
     def update(self, delta_time):
         """Updates the Gun's timer.
 
@@ -207,11 +215,15 @@ class Gun:
             bullet_location = location + self._spawn_offset * front
             bullet_velocity = velocity + self._speed * front
             bullet_front = Vector2(front)
-            return [self._bullet_factory.bullet(
+            return [self._projectile_system.bullet(
                 bullet_location, bullet_velocity, bullet_front, owner)]
         return []
 
 
+# returned by `GameObject.new_objects` when nothing was created
+NO_OBJECTS = ()
+
+
 class GameObject:
     """Base class for game objects.
 
@@ -220,17 +232,36 @@ class GameObject:
     Attributes:
         shape: a Shape class object
         graphic: a Graphic class object
+        transform: a Transform class object
+            The location and rotation shared by `shape` and `graphic`
         owner: a Player class object or None
         collision_damage: A non-negative scalar
             The damage done by `self` to other GameObject when colliding
+        collision_category: One of the *_CATEGORY constants
+            The collision category `self` belongs to
+        collision_mask: An integer
+            The bitwise or of the collision categories `self` collides with
+        static: A boolean
+            True for the level geometry that never moves, dies or creates
+            new GameObjects. GameState does not update static GameObjects.
         """
+    __slots__ = ('shape', 'graphic', 'transform', 'owner', 'collision_damage',
+                 'collision_category', 'collision_mask')
+    static = False
+
+    def __init__(self, shape, graphic, owner, collision_damage,
+                 collision_category, collision_mask):
+        """Initializes a new GameObject
 
-    def __init__(self, shape, graphic, owner, collision_damage):
-        """Initializes a new GameObject"""
+        NOTE: `graphic` is set to use the Transform of `shape`."""
         self.shape = shape
         self.graphic = graphic
+        self.transform = shape.transform
+        graphic.transform = self.transform
         self.owner = owner
         self.collision_damage = collision_damage
+        self.collision_category = collision_category
+        self.collision_mask = collision_mask
 
     def alive(self):
         """Returns True if `self` is alive"""
@@ -245,32 +276,35 @@ class GameObject:
         Does not modify the state of `other`"""
         pass
 
-    def update(self, delta_time):
-        """Updates the state of `self`.
+    def components(self):
+        """Returns the components of `self` for a World.
 
-        Arguments:
-            delta_time: a non-negative scalar
+        Returns:
+            A dict from the names in `game.ecs.COMPONENT_NAMES`
+            to the components
         """
-
-        pass
+        components = {"transform": self.transform, "collider": self,
+                      "health": self, "graphic": self.graphic}
+        if self.owner is not None:
+            components["owner"] = self.owner
+        return components
 
     def new_objects(self):
         """Returns the new GameObjects created by `self`.
 
         Only returns the objects created since last `new_objects` call.
+        `self` is removed from the game when `alive` returns False.
 
-        Returns: A list of GameObjects
-
-        NOTE: also returns `self` if `self` should still exist in the game
-        object pool"""
-        return [self]
+        Returns: A sequence of GameObjects
+        """
+        return NO_OBJECTS
 
 
 class Plane(GameObject):
     """Class for Planes.
 
     Attributes:
-        plane_physics: A PhysicsController class object
+        plane_physics: A ControlledPhysics class object
             The object responsible for moving the plane
         gun: A Gun class object
         score_generator: A function (damage, destroyed) -> float
@@ -282,9 +316,10 @@ class Plane(GameObject):
             The remaining health of the plane
 
     """
+    __slots__ = ('plane_physics', 'gun', 'score_generator', 'health', '_new_objects')
 
     def __init__(self, shape, graphic, plane_physics, gun, score_generator,
-                 owner, health, collision_damage):
+                 owner, health, collision_damage, collision_mask=ALL_CATEGORIES):
         """Initializes Plane
 
 
@@ -293,7 +328,7 @@ class Plane(GameObject):
                 The object responsible for calculating the collisions
             graphic: A Graphic class object
                 The object responsible for drawing the plane
-            plane_physics: A PhysicsController class object
+            plane_physics: A ControlledPhysics class object
                 The object responsible for moving the plane
             gun: A Gun class object
             score_generator: A function (damage, destroyed) -> float
@@ -308,8 +343,11 @@ class Plane(GameObject):
             collision_damage: A non-negative scalar
                 The damage that the plane does to other game objects
                 when colliding
+            collision_mask: An integer
+                The collision categories the plane collides with
             """
-        super().__init__(shape, graphic, owner, collision_damage)
+        super().__init__(shape, graphic, owner, collision_damage,
+                         PLANE_CATEGORY, collision_mask)
 
         self.plane_physics = plane_physics
         self.gun = gun
@@ -317,7 +355,7 @@ class Plane(GameObject):
         self.health = health
 
         self._new_objects = []
-        self._update_locations()
+        sync_transform(self.transform, self.plane_physics)
 
     def up(self):
         """Turns plane upwards"""
@@ -334,7 +372,10 @@ class Plane(GameObject):
     def shoot(self):
         """Shoots a bullet
 
-        Requests self.gun to shoot a bullet."""
+        Requests self.gun to shoot a bullet. A destroyed plane
+        does not shoot."""
+        if not self.alive():
+            return
         self._new_objects.extend(
             self.gun.shoot(self.plane_physics.location, self.plane_physics.velocity,
                            self.plane_physics.front, self.owner))
@@ -370,74 +411,88 @@ class Plane(GameObject):
 
         return damage_taken, destroyed
 
-    def update(self, delta_time):
+    def components(self):
         """See base class"""
-        if not self.alive():
-            return
-
-        self.gun.update(delta_time)
-        self.plane_physics.update(delta_time)
-
-        self._update_locations()
-
-    def _update_locations(self):
-        self.graphic.location = Vector2(self.plane_physics.location)
-        self.graphic.rotation = - \
-            math.radians(self.plane_physics.front.as_polar()[1])
-
-        self.shape.location = Vector2(self.plane_physics.location)
-        self.shape.rotation = - \
-            math.radians(self.plane_physics.front.as_polar()[1])
+        components = super().components()
+        components["physics"] = self.plane_physics
+        components["timer"] = self.gun.timer
+        components["spawner"] = self
+        return components
 
     def new_objects(self):
         """See base class"""
-        if not self.alive():
-            return []
+        if not self._new_objects:
+            return NO_OBJECTS
         tmp = self._new_objects
         self._new_objects = []
-        tmp.append(self)
-
         return tmp
 
 
 class Bullet(GameObject):
     """Class for Bullets.
 
+    A Bullet is a view to a single bullet stored in a ProjectileSystem.
+    The ProjectileSystem moves all of its bullets at once, so a Bullet
+    has no physics component. When the bullet is removed from the ProjectileSystem,
+    the view is dead and writes to it are ignored until the
+    ProjectileSystem reuses it for a new bullet.
+
     Attributes:
-        physics: An object implementing BasePhysics interface
-            The object responsible for moving the bullet
         health: A scalar
             The remaining health of the bullet
     """
+    __slots__ = ('_projectile_system', '_index')
 
-    def __init__(self, shape, graphic, physics, owner, timer, health=100,
-                 collision_damage=100):
+    def __init__(self, projectile_system, index, shape, graphic, owner,
+                 collision_damage=100, collision_mask=ALL_CATEGORIES):
         """Initializes the bullet.
 
         Arguments:
+            projectile_system: A ProjectileSystem
+                The system storing the state of the bullet
+            index: A non-negative integer or None
+                The index of the bullet in `projectile_system`.
+                None for a dead view.
             shape: A Shape class object
                 The object responsible for calculating the collisions
             graphic: A Graphic class object
                 The object responsible for drawing the bullet
-            physics: A PhysicsController class object
-                The object responsible for moving the bullet
             owner: A Player class object or None
                 The owner of the bullet
-            health: A positive scalar
-                The initial health of the bullet
             collision_damage: A non-negative scalar
                 The damage that the bullet does to other game objects
                 when colliding
-            timer: A Timer class object
-                The bullet will disappear when the timer expires.
+            collision_mask: An integer
+                The collision categories the bullet collides with
         """
+        self._projectile_system = projectile_system
+        self._index = index
+        super().__init__(shape, graphic, owner, collision_damage,
+                         BULLET_CATEGORY, collision_mask)
+
+    @property
+    def owner(self):
+        if self._index is None:
+            return None
+        return self._projectile_system.owner(self._index)
+
+    @owner.setter
+    def owner(self, value):
+        if self._index is None:
+            return
+        self._projectile_system.set_owner(self._index, value)
 
-        super().__init__(shape, graphic, owner, collision_damage)
-        self.physics = physics
-        self.timer = timer
-        self.health = health
+    @property
+    def health(self):
+        if self._index is None:
+            return 0
+        return self._projectile_system.health(self._index)
 
-        self._update_locations()
+    @health.setter
+    def health(self, value):
+        if self._index is None:
+            return
+        self._projectile_system.set_health(self._index, value)
 
     def alive(self):
         return self.health > 0
@@ -446,43 +501,37 @@ class Bullet(GameObject):
         """Collides `other` to `self`.
 
         Damages `self` but doesn't modify `other`."""
-        if not self.alive:
+        if not self.alive():
             return
 
         damage_taken = min(other.collision_damage, self.health)
         self.health -= damage_taken
 
-    def update(self, delta_time):
-        """See base class"""
+    def components(self):
+        """See base class
 
-        if not self.alive():
-            return
-
-        self.timer.update(delta_time)
-        if self.timer.expired():
-            self.health = 0
-
-        self.physics.update(delta_time)
-        self._update_locations()
-
-    def new_objects(self):
-        """See base class"""
-        if not self.alive():
-            return []
-
-        return [self]
-
-    def _update_locations(self):
-        self.graphic.location = Vector2(self.physics.location)
-        self.graphic.rotation = -math.radians(self.physics.front.as_polar()[1])
-
-        self.shape.location = Vector2(self.physics.location)
-        self.shape.rotation = -math.radians(self.physics.front.as_polar()[1])
+        The ProjectileSystem moves the bullet and stores its owner, so
+        the bullet has no physics or owner components."""
+        return {"transform": self.transform, "collider": self,
+                "health": self, "graphic": self.graphic}
 
 
 class Ground(GameObject):
     """A class for ground"""
+    __slots__ = ()
+    static = True
+
 
-    def __init__(self, shape, graphic, owner=None, collision_damage=100):
+    def __init__(self, shape, graphic, owner=None, collision_damage=100,
+                 collision_mask=PLANE_CATEGORY | BULLET_CATEGORY):
         """See base class"""
-        super().__init__(shape, graphic, owner, collision_damage)
+        super().__init__(shape, graphic, owner, collision_damage,
+                         GROUND_CATEGORY, collision_mask)
+
+    def components(self):
+        """See base class
+
+        The ground cannot be destroyed so it has no health component."""
+        components = super().components()
+        del components["health"]
+        return components
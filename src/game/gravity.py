@@ -0,0 +1,121 @@
+import math
+from abc import ABC, abstractmethod
+
+import numpy as np
+from pygame import Vector2
+
+
+class GravityField(ABC):
+    """A base class for the gravity of a level.
+
+    The vectors returned by `at` are shared between the callers and
+    should not be modified.
+    """
+    @abstractmethod
+    def at(self, location):
+        """Returns the gravitational acceleration at `location`.
+
+        Arguments:
+            `location`: A pygame.Vector2
+
+        Returns:
+            A pygame.Vector2:
+                A shared vector. Should not be modified!
+        """
+        pass
+
+    @abstractmethod
+    def at_array(self, locations):
+        """Returns the gravitational accelerations at `locations`.
+
+        Arguments:
+            `locations`: A NumPy array of shape (n, 2)
+
+        Returns:
+            A NumPy array that can be broadcast to the shape (n, 2)
+        """
+        pass
+
+    @abstractmethod
+    def scaled(self, factor):
+        """Returns a GravityField with the accelerations multiplied by `factor`"""
+        pass
+
+
+class UniformGravity(GravityField):
+    """The same gravity everywhere."""
+    def __init__(self, acceleration):
+        """Initializes UniformGravity.
+
+        Arguments:
+            `acceleration`: A pygame.Vector2
+        """
+        self._acceleration = Vector2(acceleration)
+        self._array = np.array([self._acceleration.x, self._acceleration.y])
+
+    def at(self, location):
+        """See the base class"""
+        return self._acceleration
+
+    def at_array(self, locations):
+        """See the base class"""
+        return self._array
+
+    def scaled(self, factor):
+        """See the base class"""
+        return UniformGravity(factor * self._acceleration)
+
+
+class GridGravity(GravityField):
+    """Gravity sampled on a grid of square cells.
+
+    The gravity is constant within each cell. Outside the grid the
+    gravity of the closest cell is used.
+    """
+    def __init__(self, origin, cell_size, accelerations):
+        """Initializes GridGravity.
+
+        Arguments:
+            `origin`: A pygame.Vector2
+                The top left corner of the grid
+            `cell_size`: A positive float
+                The width and height of the cells
+            `accelerations`: A list of lists of pygame.Vector2 objects
+                The rows of the grid from top to bottom. The
+                `accelerations[i][j]` is the gravity of the cell on row `i`
+                and column `j`. All of the rows should have the same length.
+        """
+        if len(accelerations) == 0 or len(accelerations[0]) == 0:
+            raise ValueError("The grid should have at least one cell")
+        if any(len(row) != len(accelerations[0]) for row in accelerations):
+            raise ValueError("The rows of the grid should have the same length")
+
+        self._origin = Vector2(origin)
+        self._cell_size = cell_size
+        self._accelerations = [[Vector2(x) for x in row] for row in accelerations]
+        self._n_rows = len(accelerations)
+        self._n_columns = len(accelerations[0])
+        self._array = np.array([[(x[0], x[1]) for x in row]
+                                for row in self._accelerations], dtype=float)
+
+    def at(self, location):
+        """See the base class"""
+        column = math.floor((location[0] - self._origin.x) / self._cell_size)
+        row = math.floor((location[1] - self._origin.y) / self._cell_size)
+        column = min(max(column, 0), self._n_columns - 1)
+        row = min(max(row, 0), self._n_rows - 1)
+        return self._accelerations[row][column]
+
+    def at_array(self, locations):
+        """See the base class"""
+        columns = np.floor((locations[:, 0] - self._origin.x) / self._cell_size)
+        rows = np.floor((locations[:, 1] - self._origin.y) / self._cell_size)
+        columns = np.clip(columns, 0, self._n_columns - 1).astype(int)
+        rows = np.clip(rows, 0, self._n_rows - 1).astype(int)
+        return self._array[rows, columns]
+
+    def scaled(self, factor):
+        """See the base class"""
+        return GridGravity(self._origin, self._cell_size,
+                           [[factor * x for x in row]
+                            for row in self._accelerations])
@@ -54,16 +54,25 @@ class GameInput:
         """
         self.should_quit = False
         callbacks = self._handle_pause_and_quit()
+        callbacks.extend(self._pressed_key_callbacks())
 
-        pressed = self._event_handler.get_pressed()
+        for f in callbacks:
+            f()
 
-        for keycode in self._keymaps:
-            if pressed[keycode]:
-                callbacks.append(self._keymaps[keycode])
+    def handle_held_keys(self):
+        """Calls the functions bound to the keys that are pressed.
 
-        for f in callbacks:
+        Unlike `handle_inputs`, does not read the input events, so
+        it can be called again before each of the simulation ticks
+        run on the same frame."""
+        for f in self._pressed_key_callbacks():
             f()
 
+    def _pressed_key_callbacks(self):
+        pressed = self._event_handler.get_pressed()
+        return [self._keymaps[keycode] for keycode in self._keymaps
+                if pressed[keycode]]
+
     def handle_pause_inputs(self):
         """Handles inputs during the paused game.
 
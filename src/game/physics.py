@@ -1,4 +1,6 @@
 import math
+from abc import ABC, abstractmethod
+import numpy as np
 from pygame import Vector2
 from constants import EPS
 
@@ -6,7 +8,9 @@ from constants import EPS
 class BasePhysics:
     """A class for basic physical properties.
 
-    Can be extended with PhysicsDecorator classes.
+    Can be extended with PhysicsDecorator classes. The state is moved
+    with an Integrator. Because the PhysicsDecorators only add to
+    `acceleration`, it is kept constant over an update.
 
     Attributes:
         `location': A pygame.Vector2
@@ -16,7 +20,9 @@ class BasePhysics:
             Should be normalized to have length of 1
         `acceleration`: A pygame.Vector2
     """
-    def __init__(self, location, velocity, front):
+    __slots__ = ('location', 'velocity', 'front', 'acceleration', 'integrator')
+
+    def __init__(self, location, velocity, front, integrator=None):
         """Initializes BasePhysics.
 
         Arguments:
@@ -24,11 +30,16 @@ class BasePhysics:
             `velocity`: A pygame.Vector2
             `front`: A pygame.Vector2
                 A vector pointing to the direction of the front of `self`.
+            `integrator`: An Integrator or None
+                Used to move the state. If None, then ExplicitEuler.
         """
         self.location = location
         self.velocity = velocity
         self.front = front / front.magnitude()
         self.acceleration = Vector2(0)
+        if integrator is None:
+            integrator = ExplicitEuler()
+        self.integrator = integrator
 
     def update(self, delta_time):
         """Updates the attributes.
@@ -41,13 +52,16 @@ class BasePhysics:
             `delta_time`: A float
 
         """
-        self.location += delta_time * self.velocity
-        self.velocity += delta_time * self.acceleration
+        acceleration = self.acceleration
+        self.integrator.step(self, lambda location, velocity: acceleration,
+                             delta_time)
         self.acceleration = Vector2(0)
 
 
 class PhysicsDecorator:
     """A base class for decorators for BasePhysics classes"""
+    __slots__ = ('_physics',)
+
     def __init__(self, physics):
         """Initializes PhysicsDecorator.
 
@@ -93,6 +107,7 @@ class PhysicsDecorator:
 
 class BodyPhysics(PhysicsDecorator):
     """A PhysicsDecorator adding gravity and drag for a symmetric body"""
+    __slots__ = ('body_drag', 'gravity')
 
     def __init__(self, physics, body_drag, gravity):
         """Inits BodyPhysics.
@@ -118,6 +133,7 @@ class WingPhysics(PhysicsDecorator):
 
     For lift and drag see http://www.aerospaceweb.org/question/airfoils/q0150b.shtml
     """
+    __slots__ = ('wing_size',)
 
     def __init__(self, physics, wing_size):
         """Initializes WingPhysics.
@@ -131,45 +147,16 @@ class WingPhysics(PhysicsDecorator):
         self.wing_size = wing_size
 
     def update(self, delta_time):
-        self.acceleration += self._acceleration()
+        self.acceleration += wing_acceleration(self.velocity, self.front,
+                                               self.wing_size)
         self._physics.update(delta_time)
 
-    def _acceleration(self):
-        result = Vector2(0)
-        angle_of_attack = self._angle_of_attack()
-        result += self._calculate_wing_drag(angle_of_attack)
-        result += self._calculate_wing_lift(angle_of_attack)
-        return result
-
-    def _angle_of_attack(self):
-        return angle_between(self.velocity, self.front)
-
-    def _calculate_wing_drag(self, angle_of_attack):
-        return -self.wing_size * (1 - math.cos(2*angle_of_attack)) \
-            * self.velocity.magnitude() * self.velocity
-
-    def _calculate_wing_lift(self, angle_of_attack):
-        lift_coefficient = 0
-        angle_mod = angle_of_attack
-        if angle_mod < 0:
-            angle_mod += math.pi
-
-        if angle_mod < math.pi/9:
-            lift_coefficient = angle_mod * 9 / math.pi
-        elif angle_mod > math.pi - math.pi/9:
-            lift_coefficient = -(math.pi - angle_mod) * 9 / math.pi
-        else:
-            lift_coefficient = math.sin(2*angle_mod)
-
-        return self.wing_size * lift_coefficient \
-            * self.velocity.magnitude() * self._lift_velocity()
-
-    def _lift_velocity(self):
-        return self.velocity.rotate_rad(-math.pi/2)
-
 
 class PhysicsController(PhysicsDecorator):
     """A PhysicsDecorator adding controls for acceleration and rotation"""
+    __slots__ = ('_max_acceleration', '_max_rotation', '_next_rotation',
+                 '_next_acceleration')
+
     def __init__(self, physics, max_acceleration, max_rotation):
         """Initializes PhysicsController.
 
@@ -212,6 +199,490 @@ class PhysicsController(PhysicsDecorator):
         return self._next_acceleration * self.front
 
 
+class ForceGenerator(ABC):
+    """A base class for the force generators of ForcePhysics.
+
+    `apply` can be called several times during one update (see Integrator)
+    so it should not change the state of `self`. The changes that should
+    happen once per update belong to `prepare`.
+    """
+    __slots__ = ()
+
+    def prepare(self, state, delta_time):
+        """Called once at the start of each update before any `apply`.
+
+        Arguments:
+            `state`: A ForcePhysics
+                The state of the moved object.
+            `delta_time`: A float
+                The length of the next update.
+        """
+        pass
+
+    @abstractmethod
+    def apply(self, state, delta_time):
+        """Adds the acceleration caused by `self` to `state.acceleration`.
+
+        Arguments:
+            `state`: An object with the attributes `location`, `velocity`,
+            `front` and `acceleration` (see BasePhysics)
+                The state at which the acceleration is evaluated.
+            `delta_time`: A float
+                The length of the next update.
+        """
+        pass
+
+
+class BodyForce(ForceGenerator):
+    """Gravity and drag for a symmetric body. See BodyPhysics."""
+    __slots__ = ('body_drag', 'gravity')
+
+    def __init__(self, body_drag, gravity):
+        """Initializes BodyForce.
+
+        Arguments:
+            `body_drag`: a non-negative scalar
+            `gravity`: a function Vector2 -> Vector2
+                `gravity(x)` should return the gravity at `x`
+        """
+        self.body_drag = body_drag
+        self.gravity = gravity
+
+    def apply(self, state, delta_time):
+        """See the base class"""
+        velocity = state.velocity
+        state.acceleration += -self.body_drag * velocity.magnitude() * velocity
+        state.acceleration += self.gravity(state.location)
+
+
+class WingForce(ForceGenerator):
+    """Lift and drag of a wing. See WingPhysics and WingProfile."""
+    __slots__ = ('wing_size', 'wing_profile')
+
+    def __init__(self, wing_size, wing_profile=None):
+        """Initializes WingForce.
+
+        Arguments:
+            `wing_size`: A non-negative float
+                The value by which the effects of the wing are scaled.
+            `wing_profile`: A WingProfile or None
+                The lift and drag curves of the wing. If None, then
+                the symmetric wing of WingPhysics.
+        """
+        self.wing_size = wing_size
+        if wing_profile is None:
+            wing_profile = SYMMETRIC_WING
+        self.wing_profile = wing_profile
+
+    def apply(self, state, delta_time):
+        """See the base class"""
+        state.acceleration += self.wing_profile.acceleration(
+            state.velocity, state.front, self.wing_size)
+
+
+class ControlForce(ForceGenerator):
+    """Thrust and rotation controls. See PhysicsController.
+
+    NOTE: Rotates `state.front` so it should be applied before the
+    other ForceGenerators."""
+    __slots__ = ('_max_acceleration', '_max_rotation', '_next_rotation',
+                 '_next_acceleration', '_thrust')
+
+    def __init__(self, max_acceleration, max_rotation):
+        """Initializes ControlForce.
+
+        Arguments:
+            `max_acceleration`: A float
+                The maximum added acceleration per time unit.
+            `max_rotation`: A float
+                The maximum rotation per time unit.
+        """
+        self._max_acceleration = max_acceleration
+        self._max_rotation = max_rotation
+        self._next_rotation = 0.0
+        self._next_acceleration = 0.0
+        self._thrust = 0.0
+
+    def up(self):
+        """Sets the state to be rotated upward at the next update"""
+        self._next_rotation = self._max_rotation
+
+    def down(self):
+        """Sets the state to be rotated downwards at the next update"""
+        self._next_rotation = -self._max_rotation
+
+    def accelerate(self):
+        """Sets the state to be accelerated forward at the next update"""
+        self._next_acceleration = self._max_acceleration
+
+    def prepare(self, state, delta_time):
+        """Rotates `state.front` and sets the thrust of the update"""
+        state.front = state.front.rotate(
+            -delta_time * math.degrees(self._next_rotation))
+        self._thrust = self._next_acceleration
+        self._next_rotation = 0.0
+        self._next_acceleration = 0.0
+
+    def apply(self, state, delta_time):
+        """See the base class"""
+        state.acceleration += self._thrust * state.front
+
+
+class ForcePhysics(BasePhysics):
+    """BasePhysics moved by a list of ForceGenerators.
+
+    A flat alternative to a chain of PhysicsDecorators: the state is
+    stored in plain attributes and each update evaluates the
+    ForceGenerators in order before moving the state. With ExplicitEuler
+    gives the same trajectories as the corresponding PhysicsDecorator
+    chain.
+
+    Unlike with the PhysicsDecorators, the Integrator can evaluate the
+    ForceGenerators at the intermediate states of the update.
+
+    Attributes:
+        `force_generators`: A list of ForceGenerator objects
+    """
+    __slots__ = ('force_generators',)
+
+    def __init__(self, location, velocity, front, force_generators,
+                 integrator=None):
+        """Initializes ForcePhysics.
+
+        Arguments:
+            `location`, `velocity`, `front`, `integrator`: See BasePhysics
+            `force_generators`: A list of ForceGenerator objects
+                Applied in the order of the list.
+        """
+        super().__init__(location, velocity, front, integrator)
+        self.force_generators = force_generators
+
+    def update(self, delta_time):
+        """See BasePhysics"""
+        for force_generator in self.force_generators:
+            force_generator.prepare(self, delta_time)
+
+        def acceleration(location, velocity):
+            state = _ForceState(location, velocity, self.front,
+                                Vector2(self.acceleration))
+            for force_generator in self.force_generators:
+                force_generator.apply(state, delta_time)
+            return state.acceleration
+
+        self.integrator.step(self, acceleration, delta_time)
+        self.acceleration = Vector2(0)
+
+
+class _ForceState:
+    """The state passed to `ForceGenerator.apply` by ForcePhysics"""
+    __slots__ = ('location', 'velocity', 'front', 'acceleration')
+
+    def __init__(self, location, velocity, front, acceleration):
+        self.location = location
+        self.velocity = velocity
+        self.front = front
+        self.acceleration = acceleration
+
+
+class ControlledPhysics(ForcePhysics):
+    """ForcePhysics with the controls of PhysicsController.
+
+    Replaces the chain PhysicsController(WingPhysics(BodyPhysics(...)))
+    with ForcePhysics applying ControlForce, WingForce and BodyForce."""
+    __slots__ = ('_control',)
+
+    def __init__(self, location, velocity, front, max_acceleration,
+                 max_rotation, force_generators, integrator=None):
+        """Initializes ControlledPhysics.
+
+        Arguments:
+            `location`, `velocity`, `front`, `integrator`: See BasePhysics
+            `max_acceleration`, `max_rotation`: See ControlForce
+            `force_generators`: A list of ForceGenerator objects
+                Applied after the ControlForce.
+        """
+        self._control = ControlForce(max_acceleration, max_rotation)
+        super().__init__(location, velocity, front,
+                         [self._control] + force_generators, integrator)
+
+    def up(self):
+        """Sets `self` to be rotated upward at the next update"""
+        self._control.up()
+
+    def down(self):
+        """Sets `self` to be rotated downwards at the next update"""
+        self._control.down()
+
+    def accelerate(self):
+        """Sets `self` to be accelerated forward at the next update"""
+        self._control.accelerate()
+
+
+class Integrator(ABC):
+    """A base class for the numerical integrators moving BasePhysics."""
+    __slots__ = ()
+
+    @abstractmethod
+    def step(self, state, acceleration, delta_time):
+        """Moves `state` forward by `delta_time`.
+
+        Arguments:
+            `state`: A BasePhysics
+                Its `location` and `velocity` are updated.
+            `acceleration`: A function (location, velocity) -> pygame.Vector2
+                Returns the acceleration at the given state.
+            `delta_time`: A float
+        """
+        pass
+
+
+class ExplicitEuler(Integrator):
+    """Moves the location with the velocity at the start of the step.
+
+    First order. Adds energy to oscillating motion, so it needs
+    short time steps to stay stable."""
+    __slots__ = ()
+
+    def step(self, state, acceleration, delta_time):
+        """See the base class"""
+        state_acceleration = acceleration(state.location, state.velocity)
+        state.location += delta_time * state.velocity
+        state.velocity += delta_time * state_acceleration
+
+
+class SemiImplicitEuler(Integrator):
+    """Moves the location with the velocity at the end of the step.
+
+    First order but as cheap as ExplicitEuler and much more stable."""
+    __slots__ = ()
+
+    def step(self, state, acceleration, delta_time):
+        """See the base class"""
+        state.velocity += delta_time * acceleration(state.location,
+                                                    state.velocity)
+        state.location += delta_time * state.velocity
+
+
+class VelocityVerlet(Integrator):
+    """Velocity Verlet with a predicted velocity for the second evaluation.
+
+    Second order. Evaluates the acceleration twice per step."""
+    __slots__ = ()
+
+    def step(self, state, acceleration, delta_time):
+        """See the base class"""
+        location = state.location
+        velocity = state.velocity
+        acceleration_1 = acceleration(location, velocity)
+        new_location = location + delta_time * velocity \
+            + 0.5 * delta_time * delta_time * acceleration_1
+        acceleration_2 = acceleration(new_location,
+                                      velocity + delta_time * acceleration_1)
+        state.location = new_location
+        state.velocity = velocity \
+            + 0.5 * delta_time * (acceleration_1 + acceleration_2)
+
+
+class RungeKutta4(Integrator):
+    """The classical fourth order Runge-Kutta method.
+
+    Evaluates the acceleration four times per step."""
+    __slots__ = ()
+
+    def step(self, state, acceleration, delta_time):
+        """See the base class"""
+        half_step = 0.5 * delta_time
+        location = state.location
+        velocity_1 = state.velocity
+        acceleration_1 = acceleration(location, velocity_1)
+        velocity_2 = velocity_1 + half_step * acceleration_1
+        acceleration_2 = acceleration(location + half_step * velocity_1,
+                                      velocity_2)
+        velocity_3 = velocity_1 + half_step * acceleration_2
+        acceleration_3 = acceleration(location + half_step * velocity_2,
+                                      velocity_3)
+        velocity_4 = velocity_1 + delta_time * acceleration_3
+        acceleration_4 = acceleration(location + delta_time * velocity_3,
+                                      velocity_4)
+        state.location = location + delta_time / 6 * (
+            velocity_1 + 2 * velocity_2 + 2 * velocity_3 + velocity_4)
+        state.velocity = velocity_1 + delta_time / 6 * (
+            acceleration_1 + 2 * acceleration_2 + 2 * acceleration_3
+            + acceleration_4)
+
+
+def create_integrator(name):
+    """Creates the Integrator selected by `name`.
+
+    Arguments:
+        `name`: A string
+            "explicit_euler", "semi_implicit_euler", "velocity_verlet"
+            or "runge_kutta_4"
+
+    Returns:
+        An Integrator
+    """
+    if name == "explicit_euler":
+        return ExplicitEuler()
+    if name == "semi_implicit_euler":
+        return SemiImplicitEuler()
+    if name == "velocity_verlet":
+        return VelocityVerlet()
+    if name == "runge_kutta_4":
+        return RungeKutta4()
+    raise ValueError(f"Unknown integrator '{name}'")
+
+
+# The number of intervals in the WingProfile tables. The linear
+# interpolation between the samples adds an error to the lift and drag
+# with a kink at every sample. With fewer samples (e.g. 720) that error
+# is larger than the error of VelocityVerlet and RungeKutta4 at 30 Hz,
+# so the higher order integrators would not be more accurate.
+WING_TABLE_SAMPLES = 14400
+
+
+class WingProfile:
+    """The lift and drag coefficients of a wing.
+
+    The coefficients are functions of the angle of attack. They are
+    sampled at construction into a table with evenly spaced angles
+    covering [-pi, pi] and looked up with linear interpolation.
+    See `WING_TABLE_SAMPLES` for the size of the table.
+
+    The accelerations follow
+    http://www.aerospaceweb.org/question/airfoils/q0150b.shtml
+    """
+    def __init__(self, angles_of_attack, lift_coefficients, drag_coefficients,
+                 n_samples=WING_TABLE_SAMPLES):
+        """Initializes WingProfile from sampled coefficient curves.
+
+        The curves are treated as periodic, so the values between the
+        last and the first sample are interpolated over the +-pi border.
+
+        Arguments:
+            `angles_of_attack`: A list of floats
+                Increasing angles in radians in [-pi, pi]
+            `lift_coefficients`: A list of floats
+                The lift coefficient at each of the `angles_of_attack`
+            `drag_coefficients`: A list of floats
+                The drag coefficient at each of the `angles_of_attack`
+            `n_samples`: A positive integer
+                The number of intervals in the lookup table
+        """
+        if not (len(angles_of_attack) == len(lift_coefficients)
+                == len(drag_coefficients)):
+            raise ValueError("The coefficient curves should have as many "
+                             "samples as there are angles of attack")
+        if len(angles_of_attack) == 0:
+            raise ValueError("At least one angle of attack needed")
+
+        table_angles = np.linspace(-math.pi, math.pi, n_samples + 1)
+        self._lift_table = np.interp(table_angles, angles_of_attack,
+                                     lift_coefficients,
+                                     period=2 * math.pi).tolist()
+        self._drag_table = np.interp(table_angles, angles_of_attack,
+                                     drag_coefficients,
+                                     period=2 * math.pi).tolist()
+        self._samples_per_radian = n_samples / (2 * math.pi)
+        self._n_samples = n_samples
+
+    @classmethod
+    def symmetric(cls, n_samples=WING_TABLE_SAMPLES):
+        """Returns the WingProfile of a symmetric wing.
+
+        The lift grows linearly until the stall at 20 degrees and
+        follows `sin(2 * angle)` after that. The drag is `1 - cos(2 * angle)`.
+        """
+        angles = np.linspace(-math.pi, math.pi, n_samples + 1)
+        return cls(angles, [_symmetric_lift_coefficient(x) for x in angles],
+                   [1 - math.cos(2 * x) for x in angles], n_samples)
+
+    @classmethod
+    def from_config(cls, wing_profile_config):
+        """Initializes WingProfile from the sampled curves of a config file.
+
+        Arguments:
+            `wing_profile_config`: A dict
+                With the keys "angles_of_attack" (in degrees),
+                "lift_coefficients" and "drag_coefficients".
+        """
+        return cls([math.radians(x) for x in wing_profile_config["angles_of_attack"]],
+                   wing_profile_config["lift_coefficients"],
+                   wing_profile_config["drag_coefficients"])
+
+    def coefficients(self, angle_of_attack):
+        """Returns the lift and drag coefficients at `angle_of_attack`.
+
+        Arguments:
+            `angle_of_attack`: Radians in [-pi, pi]
+
+        Returns:
+            A tuple (lift coefficient, drag coefficient)
+        """
+        position = (angle_of_attack + math.pi) * self._samples_per_radian
+        index = min(int(position), self._n_samples - 1)
+        fraction = position - index
+        lift_table = self._lift_table
+        drag_table = self._drag_table
+        lift = lift_table[index] + fraction * (lift_table[index + 1]
+                                               - lift_table[index])
+        drag = drag_table[index] + fraction * (drag_table[index + 1]
+                                               - drag_table[index])
+        return lift, drag
+
+    def acceleration(self, velocity, front, wing_size):
+        """Returns the acceleration caused by the wing.
+
+        Arguments:
+            `velocity`: A pygame.Vector2
+            `front`: A pygame.Vector2
+                The direction of the wing. Should have the length of 1.
+            `wing_size`: A non-negative float
+                The value by which the effects of the wing are scaled.
+        """
+        velocity_x, velocity_y = velocity
+        front_x, front_y = front
+        # the same angle as `angle_between(velocity, front)`
+        angle_of_attack = math.atan2(front_x * velocity_y - front_y * velocity_x,
+                                     front_x * velocity_x + front_y * velocity_y)
+        lift, drag = self.coefficients(angle_of_attack)
+        scale = wing_size * math.sqrt(velocity_x * velocity_x
+                                      + velocity_y * velocity_y)
+        # the lift is perpendicular to the velocity: velocity.rotate_rad(-pi/2)
+        return Vector2(scale * (lift * velocity_y - drag * velocity_x),
+                       scale * (-lift * velocity_x - drag * velocity_y))
+
+
+def _symmetric_lift_coefficient(angle_of_attack):
+    angle_mod = angle_of_attack
+    if angle_mod < 0:
+        angle_mod += math.pi
+
+    if angle_mod < math.pi/9:
+        return angle_mod * 9 / math.pi
+    if angle_mod > math.pi - math.pi/9:
+        return -(math.pi - angle_mod) * 9 / math.pi
+    return math.sin(2*angle_mod)
+
+
+SYMMETRIC_WING = WingProfile.symmetric()
+
+
+def wing_acceleration(velocity, front, wing_size, wing_profile=SYMMETRIC_WING):
+    """Returns the acceleration caused by a wing.
+
+    Arguments:
+        `velocity`: A pygame.Vector2
+        `front`: A pygame.Vector2
+            The direction of the wing. Should have the length of 1.
+        `wing_size`: A non-negative float
+            The value by which the effects of the wing are scaled.
+        `wing_profile`: A WingProfile
+            The lift and drag curves of the wing
+    """
+    return wing_profile.acceleration(velocity, front, wing_size)
+
+
 def angle_between(start, end):
     """Angle from `start` end `end`.
 
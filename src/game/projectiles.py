@@ -0,0 +1,283 @@
+import math
+
+import numpy as np
+from pygame import Vector2
+
+from graphics.graphics import ImageGraphic
+from game.shapes import Circle
+from game.gravity import UniformGravity
+from game.game_objects import Bullet
+
+
+class PoolStats:
+    """A class for counting the reuse of the Bullet views.
+
+    Attributes:
+        `hits`: A non-negative integer
+            The number of bullets created by reusing a pooled view.
+        `misses`: A non-negative integer
+            The number of bullets that needed a new view.
+        `high_water_mark`: A non-negative integer
+            The largest number of bullets stored at the same time.
+    """
+    def __init__(self):
+        """Initializes PoolStats with zero counts."""
+        self.hits = 0
+        self.misses = 0
+        self.high_water_mark = 0
+
+    def hit_fraction(self):
+        """Returns the fraction of the bullets that reused a view.
+
+        Returns 0.0 if no bullets were created."""
+        if self.hits + self.misses == 0:
+            return 0.0
+        return self.hits / (self.hits + self.misses)
+
+    def __repr__(self):
+        return (f"PoolStats(hits = {self.hits}, misses = {self.misses}, "
+                f"high_water_mark = {self.high_water_mark})")
+
+
+class _BulletArrays:
+    """The state of the bullets of a ProjectileSystem in NumPy arrays.
+
+    Attributes:
+        `n_bullets`: A non-negative integer
+            The number of used rows. The rest of the rows are free.
+        `locations`, `velocities`: Arrays of shape (capacity, 2)
+        `ages`, `healths`: Arrays of shape (capacity,)
+        `owner_indices`: An integer array of shape (capacity,)
+    """
+    def __init__(self, capacity):
+        """Initializes _BulletArrays without bullets.
+
+        Arguments:
+            `capacity`: A positive integer
+                The initial number of rows. The arrays grow when needed.
+        """
+        self.n_bullets = 0
+        self.locations = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.ages = np.zeros(capacity)
+        self.healths = np.zeros(capacity)
+        self.owner_indices = np.zeros(capacity, dtype=int)
+
+    def append(self, location, velocity, health, owner_index):
+        """Adds a bullet to the first free row.
+
+        Returns:
+            The index of the row
+        """
+        if self.n_bullets == len(self.ages):
+            self._grow()
+        index = self.n_bullets
+        self.locations[index] = (location[0], location[1])
+        self.velocities[index] = (velocity[0], velocity[1])
+        self.ages[index] = 0.0
+        self.healths[index] = health
+        self.owner_indices[index] = owner_index
+        self.n_bullets += 1
+        return index
+
+    def keep(self, kept):
+        """Moves the rows `kept` to the start and frees the rest.
+
+        Arguments:
+            `kept`: An increasing integer array of row indices
+        """
+        n_kept = len(kept)
+        for array in self._arrays():
+            array[:n_kept] = array[kept]
+        self.n_bullets = n_kept
+
+    def _arrays(self):
+        return (self.locations, self.velocities, self.ages, self.healths,
+                self.owner_indices)
+
+    def _grow(self):
+        capacity = 2 * len(self.ages)
+        self.locations = self._resized(self.locations, capacity)
+        self.velocities = self._resized(self.velocities, capacity)
+        self.ages = self._resized(self.ages, capacity)
+        self.healths = self._resized(self.healths, capacity)
+        self.owner_indices = self._resized(self.owner_indices, capacity)
+
+    def _resized(self, array, capacity):
+        result = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+        result[:len(array)] = array
+        return result
+
+
+class ProjectileSystem:
+    """Stores and moves all of the bullets of a game round.
+
+    The state of the bullets is stored in NumPy arrays with one row per
+    bullet and all of the bullets are moved with a single vectorized step.
+    The Bullet objects returned by `bullet` are views to the rows.
+
+    The bullets are moved like BodyPhysics would move them: the drag
+    and the gravity are computed from the velocity at the start of the step
+    and the location is moved with the velocity at the start of the step.
+
+    The rows of the dead bullets are removed at the start of the next
+    `update`. After that the Bullet views of the removed rows are dead
+    and they are kept in a pool. New bullets reuse the pooled views
+    instead of creating new Bullet, Shape and Graphic objects.
+
+    Attributes:
+        `pool_stats`: A PoolStats
+            The reuse of the Bullet views since the construction
+    """
+    def __init__(self, image_graphic, bullet_config, gravity_field=None,
+                 capacity=64):
+        """Initializes an empty ProjectileSystem.
+
+        Arguments:
+            `image_graphic`: An ImageGraphic
+                Copied to draw each of the bullets
+            `bullet_config`: A BulletConfig
+                The properties of the bullets. Its `image_file_path` is
+                not used.
+            `gravity_field`: A GravityField or None
+                The gravity of the level in the units of
+                `bullet_config.gravity`. If None, then the gravity points
+                down everywhere.
+            `capacity`: A positive integer
+                The initial number of rows in the arrays. The arrays
+                grow when needed.
+        """
+        self._image_graphic = image_graphic
+        self._config = bullet_config
+        if gravity_field is None:
+            gravity_field = UniformGravity(Vector2(0, 1))
+        self._gravity_field = gravity_field.scaled(bullet_config.gravity)
+
+        self._arrays = _BulletArrays(capacity)
+        self._views = []
+        self._owners = []
+        self._pool = [self._new_view() for _ in range(bullet_config.pool_size)]
+        self.pool_stats = PoolStats()
+
+    @classmethod
+    def from_config(cls, bullet_config, gravity_field=None):
+        """Initializes ProjectileSystem from a config file.
+
+        Arguments:
+            `bullet_config`: A BulletConfig
+            `gravity_field`: A GravityField or None
+                See the constructor.
+        """
+        # the bullets are round so they are drawn unrotated
+        image_graphic = ImageGraphic.from_image_path(bullet_config.image_file_path,
+                                                     Vector2(0, 0),
+                                                     Vector2(bullet_config.diameter),
+                                                     rotates=False)
+        return cls(image_graphic, bullet_config, gravity_field=gravity_field)
+
+    def __len__(self):
+        """Returns the number of stored bullets (including the dead ones)"""
+        return self._arrays.n_bullets
+
+    def bullet(self, location, velocity, front, owner):
+        """Adds a new bullet.
+
+        Arguments:
+            `location`: A pygame.Vector2
+            `velocity`: A pygame.Vector2
+            `front`: A pygame.Vector2
+                The vector pointing to the front of the bullet.
+                Should have the length of 1.
+            `owner`: A Player
+                The owner of the Bullet
+
+        Returns:
+            A Bullet:
+                The view to the new bullet.
+        """
+        index = self._arrays.append(location, velocity, self._config.health,
+                                    self._owner_index(owner))
+        self.pool_stats.high_water_mark = max(self.pool_stats.high_water_mark,
+                                              self._arrays.n_bullets)
+
+        if self._pool:
+            bullet = self._pool.pop()
+            self.pool_stats.hits += 1
+        else:
+            bullet = self._new_view()
+            self.pool_stats.misses += 1
+        bullet._index = index
+        bullet.transform.set(Vector2(location), -math.radians(front.as_polar()[1]))
+        # a reused view should not be interpolated from its previous life
+        bullet.transform.store_previous()
+        self._views.append(bullet)
+        return bullet
+
+    def update(self, delta_time):
+        """Removes the dead bullets and moves the rest.
+
+        Arguments:
+            `delta_time`: A non-negative float
+        """
+        self._remove_dead()
+        arrays = self._arrays
+        n_bullets = arrays.n_bullets
+        locations = arrays.locations[:n_bullets]
+        velocities = arrays.velocities[:n_bullets]
+        speeds = np.sqrt((velocities * velocities).sum(axis=1))
+        acceleration = -self._config.body_drag * speeds[:, np.newaxis] * velocities
+        acceleration += self._gravity_field.at_array(locations)
+
+        locations += delta_time * velocities
+        velocities += delta_time * acceleration
+
+        ages = arrays.ages[:n_bullets]
+        ages += delta_time
+        arrays.healths[:n_bullets][ages >= self._config.timeout] = 0
+
+        for bullet, (x, y) in zip(self._views, locations.tolist()):
+            bullet.transform.location = Vector2(x, y)
+
+    def owner(self, index):
+        """Returns the owner of the bullet at `index`"""
+        return self._owners[self._arrays.owner_indices[index]]
+
+    def set_owner(self, index, owner):
+        """Sets the owner of the bullet at `index`"""
+        self._arrays.owner_indices[index] = self._owner_index(owner)
+
+    def health(self, index):
+        """Returns the health of the bullet at `index`"""
+        return float(self._arrays.healths[index])
+
+    def set_health(self, index, health):
+        """Sets the health of the bullet at `index`"""
+        self._arrays.healths[index] = health
+
+    def _new_view(self):
+        return Bullet(self, None, Circle(Vector2(0), self._config.diameter),
+                      self._image_graphic.copy(), None,
+                      self._config.collision_damage, self._config.collision_mask)
+
+    def _owner_index(self, owner):
+        for index, known_owner in enumerate(self._owners):
+            if known_owner is owner:
+                return index
+        self._owners.append(owner)
+        return len(self._owners) - 1
+
+    def _remove_dead(self):
+        alive = self._arrays.healths[:self._arrays.n_bullets] > 0
+        if alive.all():
+            return
+
+        for index in np.flatnonzero(~alive):
+            bullet = self._views[index]
+            bullet._index = None
+            self._pool.append(bullet)
+
+        kept = np.flatnonzero(alive)
+        self._arrays.keep(kept)
+        self._views = [self._views[index] for index in kept]
+        for index, bullet in enumerate(self._views):
+            bullet._index = index
@@ -0,0 +1,84 @@
+class GameObjectRegistry:
+    """A class storing the GameObjects present in a game round.
+
+    The GameObjects are kept in a dense list which can be iterated
+    without copying. Each GameObject gets a stable id when it is spawned.
+    Despawning moves the last GameObject to the place of the removed one,
+    so both spawning and despawning take constant time but the order
+    of the GameObjects is not preserved.
+
+    The functions bound with `bind_spawn` and `bind_death` are called
+    with (id, GameObject) when a GameObject is spawned or despawned.
+
+    Attributes:
+        `objects`: A list of GameObject objects
+            The GameObjects currently in the registry.
+            NOTE: Should not be modified outside the registry!
+    """
+    def __init__(self):
+        """Initializes an empty GameObjectRegistry."""
+        self.objects = []
+        self._ids = []
+        self._indices = {}
+        self._next_id = 0
+        self._spawn_listeners = []
+        self._death_listeners = []
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    def __contains__(self, object_id):
+        return object_id in self._indices
+
+    def bind_spawn(self, function):
+        """Calls `function(id, game_object)` for every spawned GameObject"""
+        self._spawn_listeners.append(function)
+
+    def bind_death(self, function):
+        """Calls `function(id, game_object)` for every despawned GameObject"""
+        self._death_listeners.append(function)
+
+    def get(self, object_id):
+        """Returns the GameObject with `object_id`"""
+        return self.objects[self._indices[object_id]]
+
+    def spawn(self, game_object):
+        """Adds `game_object` to the registry.
+
+        Returns:
+            An integer:
+                The id of `game_object`. Not reused during the lifetime
+                of the registry.
+        """
+        object_id = self._next_id
+        self._next_id += 1
+        self._indices[object_id] = len(self.objects)
+        self.objects.append(game_object)
+        self._ids.append(object_id)
+        for listener in self._spawn_listeners:
+            listener(object_id, game_object)
+        return object_id
+
+    def despawn(self, object_id):
+        """Removes the GameObject with `object_id` from the registry."""
+        self._remove_at(self._indices[object_id])
+
+    def _remove_at(self, index):
+        objects = self.objects
+        ids = self._ids
+        game_object = objects[index]
+        object_id = ids[index]
+
+        last_object = objects.pop()
+        last_id = ids.pop()
+        if index < len(objects):
+            objects[index] = last_object
+            ids[index] = last_id
+            self._indices[last_id] = index
+        del self._indices[object_id]
+
+        for listener in self._death_listeners:
+            listener(object_id, game_object)
@@ -1,10 +1,13 @@
 from utils.timing import Timer, Clock, busy_wait
 from game.game import Player, GameState, Game, GameNotification
 from game.game_objects import PlaneFactory
+from game.projectiles import ProjectileSystem
+from game.collisions import create_broad_phase
 from game.inputs import GameInput, PlayerInput
 from game.game_stats import PlayerRecorder
 from graphics.game_rendering import GameRenderer, GameView, PauseOverlay, GameBackground, InfoBar
 from graphics.camera import Camera
+from graphics.image import IMAGE_CACHE
 from user import UserSelector
 
 
@@ -38,23 +41,29 @@ class GameFactory:
         self._event_handler = event_handler
         self._screen = screen
         self.user_selectors = []
+        self._image_paths = set()
         self._update_players()
 
     def game(self):
         """Creates a Game based on the state of the `self`"""
         level_config = self._level_config_selector.get_selected()
+        self._load_images()
         game_input = GameInput(self._event_handler, self._config.game_input_config)
 
         game_notifications = []
         plane_factories = []
 
         start_positions = level_config.starting_locations()
+        gravity_field = level_config.gravity_field()
+        projectile_system = ProjectileSystem.from_config(
+            self._config.plane_config.gun_config.bullet_config, gravity_field)
 
         for i in range(self._n_players):
             game_notifications.append(
                 GameNotification(self._config.press_key_to_start_message,
                                  self._config.until_spawn_message))
-            plane_factories.append(PlaneFactory(self._config.plane_config))
+            plane_factories.append(PlaneFactory(self._config.plane_config,
+                                                projectile_system, gravity_field))
             plane_factories[i].start_position = start_positions[i]
 
         players = []
@@ -73,7 +82,10 @@ class GameFactory:
 
         game_length = self._config.game_length
         game_state = GameState(level_config.game_objects(), players,
-                               level_config.name(), Timer(game_length))
+                               level_config.name(), Timer(game_length),
+                               create_broad_phase(self._config.collision_engine,
+                                                  self._config.collision_cell_size),
+                               projectile_system)
 
         background = GameBackground.from_config(self._config.background_config)
 
@@ -91,6 +103,27 @@ class GameFactory:
         game = Game(game_input, game_state, renderer, game_clock)
         return game
 
+    def _load_images(self):
+        """Loads the images of the next Game to the IMAGE_CACHE.
+
+        The images of the previous Game that are not needed anymore
+        are evicted from the cache."""
+        plane_config = self._config.plane_config
+        bullet_config = plane_config.gun_config.bullet_config
+        background_config = self._config.background_config
+        images = [
+            (plane_config.image_file_path, plane_config.size),
+            (bullet_config.image_file_path, (bullet_config.diameter,
+                                             bullet_config.diameter)),
+            (background_config.image_file_path, background_config.image_size)
+        ]
+        image_paths = {path for path, size in images}
+        for path in self._image_paths - image_paths:
+            IMAGE_CACHE.evict(path)
+        for path, size in images:
+            IMAGE_CACHE.preload(path, size[0], size[1])
+        self._image_paths = image_paths
+
     def add_player(self):
         """Add a new player to the new Game"""
         self._n_players += 1
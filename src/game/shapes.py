@@ -1,6 +1,225 @@
+import math
 from abc import ABC, abstractmethod
 from pygame import Vector2
 from constants import EPS
+from game.bvh import BoundingVolumeHierarchy
+
+
+class BoundingBox:
+    """An axis-aligned bounding box in the game world coordinates.
+
+    A BoundingBox with `left` > `right` or `top` > `bottom` is empty
+    and doesn't overlap anything.
+
+    Attributes:
+        `left`: A float
+            The smallest x coordinate inside the box
+        `top`: A float
+            The smallest y coordinate inside the box
+        `right`: A float
+            The largest x coordinate inside the box
+        `bottom`: A float
+            The largest y coordinate inside the box
+    """
+    __slots__ = ('left', 'right', 'top', 'bottom')
+
+    def __init__(self, left, top, right, bottom):
+        """Initializes BoundingBox.
+
+        Arguments:
+            `left`, `top`, `right`, `bottom`: floats
+                See the class attributes.
+        """
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+
+    @classmethod
+    def empty(cls):
+        """Returns a BoundingBox that contains no points."""
+        return cls(float('inf'), float('inf'), -float('inf'), -float('inf'))
+
+    @classmethod
+    def from_points(cls, points):
+        """Returns the smallest BoundingBox containing all of `points`.
+
+        Arguments:
+            `points`: An iterable of pygame.Vector2 objects
+        """
+        result = cls.empty()
+        for point in points:
+            result.left = min(result.left, point[0])
+            result.top = min(result.top, point[1])
+            result.right = max(result.right, point[0])
+            result.bottom = max(result.bottom, point[1])
+        return result
+
+    def is_empty(self):
+        """Returns True if `self` contains no points, otherwise False"""
+        return self.left > self.right or self.top > self.bottom
+
+    def union(self, other):
+        """Returns the smallest BoundingBox containing `self` and `other`.
+
+        Arguments:
+            `other`: A BoundingBox
+        """
+        return BoundingBox(min(self.left, other.left), min(self.top, other.top),
+                           max(self.right, other.right),
+                           max(self.bottom, other.bottom))
+
+    def overlaps(self, other, margin=0.0):
+        """Returns True if `self` and `other` overlap, otherwise False.
+
+        Arguments:
+            `other`: A BoundingBox
+            `margin`: A non-negative float
+                The boxes closer than `margin` to each other are
+                considered overlapping.
+        """
+        return self.left <= other.right + margin \
+            and other.left <= self.right + margin \
+            and self.top <= other.bottom + margin \
+            and other.top <= self.bottom + margin
+
+    def __repr__(self):
+        return (f"BoundingBox(left = {self.left}, top = {self.top}, "
+                f"right = {self.right}, bottom = {self.bottom})")
+
+
+_INTERSECTION_TESTS = {}
+
+
+def register_intersection(type_1, type_2, test):
+    """Registers the exact intersection test of two Shape types.
+
+    The test is registered for both orders of the types so it only
+    has to be written once for each pair.
+
+    Arguments:
+        `type_1`, `type_2`: Shape subclasses
+        `test`: A function (type_1, type_2) -> bool
+            Returns True if the Shapes intersect. Called only
+            if the bounding boxes of the Shapes overlap.
+    """
+    _INTERSECTION_TESTS[(type_1, type_2)] = test
+    if type_1 is not type_2:
+        _INTERSECTION_TESTS[(type_2, type_1)] = \
+            lambda shape_2, shape_1: test(shape_1, shape_2)
+
+
+def _unknown_pair_error(type_1, type_2):
+    return TypeError(f"No intersection test between '{type_1.__name__}' "
+                     f"and '{type_2.__name__}'")
+
+
+class Transform:
+    """The location and rotation of one or more Shapes.
+
+    A Transform can be shared by several Shapes (e.g. the collision
+    shape and the drawn rectangle of a GameObject) so that moving
+    all of them is a single write. The Shapes are notified of the
+    changes so that they can clear their cached geometry.
+
+    The Transform can also remember its state from the previous
+    simulation tick so that the renderer can draw the Shapes between
+    the two last states (see `store_previous` and `interpolate`).
+
+    Attributes:
+        `location`: A pygame.Vector2
+        `rotation`: Radians
+            See the Shape class.
+    """
+    __slots__ = ('_location', '_rotation', '_shapes', '_previous', '_current')
+
+    def __init__(self):
+        """Initializes Transform to identity."""
+        self._location = Vector2(0, 0)
+        self._rotation = 0.0
+        self._shapes = []
+        self._previous = None
+        self._current = None
+
+    @property
+    def location(self):
+        return self._location
+
+    @location.setter
+    def location(self, value):
+        self._location = value
+        self._notify()
+
+    @property
+    def rotation(self):
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, value):
+        self._rotation = value
+        self._notify()
+
+    def set(self, location, rotation):
+        """Sets both `location` and `rotation` with a single notification.
+
+        Arguments:
+            `location`: A pygame.Vector2
+            `rotation`: Radians
+        """
+        self._location = location
+        self._rotation = rotation
+        self._notify()
+
+    def store_previous(self):
+        """Remembers the current state as the previous state."""
+        self._previous = (Vector2(self._location), self._rotation)
+
+    def interpolate(self, alpha):
+        """Moves `self` between the previous and the current state.
+
+        The rotation is interpolated along the shorter arc. The current
+        state is kept so that it can be returned to with `restore`.
+
+        Arguments:
+            `alpha`: A float between 0 and 1
+                0 corresponds to the previous state and 1 to the
+                current state.
+
+        Returns:
+            A boolean:
+                True if `self` was moved and `restore` has to be called,
+                otherwise False. `self` is not moved if there is no
+                previous state or if the state has not changed.
+        """
+        if self._previous is None or alpha >= 1:
+            return False
+        previous_location, previous_rotation = self._previous
+        if (previous_location == self._location
+                and previous_rotation == self._rotation):
+            return False
+
+        alpha = max(alpha, 0.0)
+        self._current = (self._location, self._rotation)
+        rotation_change = ((self._rotation - previous_rotation + math.pi)
+                           % (2 * math.pi) - math.pi)
+        self.set(previous_location.lerp(self._location, alpha),
+                 previous_rotation + alpha * rotation_change)
+        return True
+
+    def restore(self):
+        """Returns to the current state after `interpolate`."""
+        self.set(*self._current)
+        self._current = None
+
+    def _attach(self, shape):
+        self._shapes.append(shape)
+
+    def _detach(self, shape):
+        self._shapes.remove(shape)
+
+    def _notify(self):
+        for shape in self._shapes:
+            shape._transform_changed()
 
 
 class Shape(ABC):
@@ -10,6 +229,11 @@ class Shape(ABC):
     location/rotation as if the Shape was first rotated to
     `rotation` and then translated by the vector from origo to `location`.
 
+    The Shapes store their geometry in the local coordinates and only
+    the transform is updated when `location` or `rotation` changes.
+    The geometry in the game world coordinates is computed lazily
+    when it is needed and cached until the transform changes again.
+
     NOTE: The `location` doesn't always correspond to the intuitive location
     of the shape. For example, we might have a Shape which is a circle drawn
     around point (1, 1). The location of this might still be (0
@@ -21,33 +245,99 @@ class Shape(ABC):
         `rotation`: Radians
             Positive rotation mean counter-clockwise
             (in coordinates where x grows right and y grows down)
+        `transform`: A Transform
+            Holds `location` and `rotation`. Can be shared with other
+            Shapes.
 
     """
+    __slots__ = ('_transform',)
+
+    def __init__(self):
+        """Initializes the transform of the Shape to identity."""
+        self._transform = Transform()
+        self._transform._attach(self)
+        self._transform_changed()
+
     @property
-    @abstractmethod
     def location(self):
-        pass
+        return self._transform.location
 
     @location.setter
-    @abstractmethod
     def location(self, value):
-        pass
+        self._transform.location = value
 
     @property
-    @abstractmethod
     def rotation(self):
-        pass
+        return self._transform.rotation
 
     @rotation.setter
-    @abstractmethod
     def rotation(self, value):
+        self._transform.rotation = value
+
+    @property
+    def transform(self):
+        return self._transform
+
+    @transform.setter
+    def transform(self, value):
+        if value is self._transform:
+            return
+        self._transform._detach(self)
+        self._transform = value
+        self._transform._attach(self)
+        self._transform_changed()
+
+    def intersects(self, shape):
+        """Returns True if `self` intersects `shape`, False otherwise.
+
+        The exact test is looked up from the intersection table with
+        the types of `self` and `shape` (see `register_intersection`).
+
+        Raises:
+            TypeError: If no test is registered for the pair of types.
+        """
+        if not self._bounding_boxes_overlap(shape):
+            return False
+        test = _INTERSECTION_TESTS.get((type(self), type(shape)))
+        if test is None:
+            raise _unknown_pair_error(type(self), type(shape))
+        return test(self, shape)
+
+    @abstractmethod
+    def bounding_box(self):
+        """Returns the BoundingBox of `self` in the game world coordinates.
+
+        The BoundingBox is cached and only recomputed after `location` or
+        `rotation` has changed.
+
+        NOTE: The returned BoundingBox should NOT be modified!
+        """
         pass
 
     @abstractmethod
-    def intersects(self, shape):
-        """Returns True if `self` intersects `shape`, False otherwise."""
+    def _transform_changed(self):
+        """Clears the cached game world geometry of `self`."""
         pass
 
+    def _to_world(self, point):
+        """Returns `point` transformed from the local to the world coordinates.
+
+        NOTE: Returns `point` itself if the transform is identity."""
+        location = self._transform._location
+        rotation = self._transform._rotation
+        if rotation == 0:
+            if location[0] == 0 and location[1] == 0:
+                return point
+            return point + location
+        return point.rotate_rad(-rotation) + location
+
+    def _bounding_boxes_overlap(self, shape):
+        """Returns False if `self` and `shape` can't intersect.
+
+        Used to reject distant Shapes before doing the exact intersection
+        test. The Shapes closer than EPS are considered overlapping."""
+        return self.bounding_box().overlaps(shape.bounding_box(), EPS)
+
 
 class Circle(Shape):
     """A class representing a Circle.
@@ -58,6 +348,8 @@ class Circle(Shape):
         `radius`: A non_negative float (read only)
             The radius of the circle
         """
+    __slots__ = ('_local_center', '_radius', '_center', '_bounding_box')
+
     def __init__(self, center, radius):
         """Initializes Circle
 
@@ -72,52 +364,40 @@ class Circle(Shape):
         """
         if radius < 0:
             raise ValueError("The radius should be nonnegative")
-        self._center = center
+        self._local_center = Vector2(center)
         self._radius = radius
-        self._location = Vector2(0, 0)
-        self._rotation = 0.0
+        super().__init__()
 
     @property
     def center(self):
+        if self._center is None:
+            self._center = self._to_world(self._local_center)
         return self._center
 
     @property
     def radius(self):
         return self._radius
 
-    @property
-    def location(self):
-        return self._location
-
-    @location.setter
-    def location(self, value):
-        self._center += value - self._location
-        self._location = value
-
-    @property
-    def rotation(self):
-        return self._rotation
-
-    @rotation.setter
-    def rotation(self, value):
-        tmp = self._location
-        self.location = Vector2(0, 0)
-        self._center.rotate_ip_rad(-(value - self._rotation))
-        self.location = tmp
-        self._rotation = value
-
-    def intersects(self, shape):
+    def bounding_box(self):
         """See the base class"""
-        if isinstance(shape, Circle):
-            return self._intersects_circle(shape)
-        return shape.intersects(self)
+        if self._bounding_box is None:
+            center = self.center
+            self._bounding_box = BoundingBox(center[0] - self._radius,
+                                             center[1] - self._radius,
+                                             center[0] + self._radius,
+                                             center[1] + self._radius)
+        return self._bounding_box
+
+    def _transform_changed(self):
+        self._center = None
+        self._bounding_box = None
 
     def _intersects_circle(self, circle):
-        distance = (circle._center - self._center).magnitude()
+        distance = (circle.center - self.center).magnitude()
         return distance < self._radius + circle._radius + EPS
 
     def __repr__(self):
-        return (f"Circle(center = {self._center}, radius = {self._radius}, "
+        return (f"Circle(center = {self.center}, radius = {self._radius}, "
                f"location = {self.location}, rotation = {self.rotation})")
 
 
@@ -130,6 +410,8 @@ class Line(Shape):
         `end`: A pygame.Vector2 (read only)
             The end point of the line
     """
+    __slots__ = ('_local_begin', '_local_end', '_begin', '_end', '_bounding_box')
+
     def __init__(self, begin, end):
         """Initializes Line
 
@@ -148,51 +430,31 @@ class Line(Shape):
         if (begin-end).magnitude() < EPS:
             raise ValueError("The Line must have a positive length")
 
-        self._begin = begin
-        self._end = end
-        self._location = Vector2(0, 0)
-        self._rotation = 0.0
+        self._local_begin = Vector2(begin)
+        self._local_end = Vector2(end)
+        super().__init__()
 
     @property
     def begin(self):
+        if self._begin is None:
+            self._begin = self._to_world(self._local_begin)
         return self._begin
 
     @property
     def end(self):
+        if self._end is None:
+            self._end = self._to_world(self._local_end)
         return self._end
 
-    @property
-    def location(self):
-        return self._location
-
-    @location.setter
-    def location(self, value):
-        self._begin += value - self._location
-        self._end += value - self._location
-        self._location = value
-
-    @property
-    def rotation(self):
-        return self._rotation
-
-    @rotation.setter
-    def rotation(self, value):
-        tmp = self.location
-        self.location = Vector2(0, 0)
-        d_rotation = value - self._rotation
-        self._begin.rotate_ip_rad(-d_rotation)
-        self._end.rotate_ip_rad(-d_rotation)
-        self.location = tmp
-        self._rotation = value
-
     def projection_param(self, point):
         """Projects `point` to `self` and returns the parameter of the result.
 
         Arguments:
             `point`: A pygame.Vector2
         """
-        v = self._end - self._begin
-        p = point - self._begin
+        begin = self.begin
+        v = self.end - begin
+        p = point - begin
         return v.dot(p) / v.dot(v)
 
     def distance_to(self, point):
@@ -202,40 +464,51 @@ class Line(Shape):
             `point`: A pygame.Vector2
         """
         pos = self.projection_param(point)
-        v = self._end - self._begin
-        p = point - self._begin
+        begin = self.begin
+        v = self.end - begin
+        p = point - begin
         if 0.0 <= pos <= 1.0:
             return (p - pos * v).magnitude()
         return min(p.magnitude(), (p - v).magnitude())
 
-    def intersects(self, shape):
+    def bounding_box(self):
         """See the base class"""
-        if isinstance(shape, Circle):
-            return self._intersects_circle(shape)
-        if isinstance(shape, Line):
-            return self._intersects_line(shape)
-        return shape.intersects(self)
+        if self._bounding_box is None:
+            begin = self.begin
+            end = self.end
+            self._bounding_box = BoundingBox(min(begin[0], end[0]),
+                                             min(begin[1], end[1]),
+                                             max(begin[0], end[0]),
+                                             max(begin[1], end[1]))
+        return self._bounding_box
+
+    def _transform_changed(self):
+        self._begin = None
+        self._end = None
+        self._bounding_box = None
 
     def _intersects_circle(self, circle):
         return self.distance_to(circle.center) < circle.radius + EPS
 
     def _intersects_line(self, line):
-        v = self._end - self._begin
-        p1 = line._begin - self._begin
-        p2 = line._end - self._begin
+        begin = self.begin
+        v = self.end - begin
+        p1 = line.begin - begin
+        p2 = line.end - begin
         if v.cross(p1) * v.cross(p2) > EPS:
             return False
 
-        v = line._end - line._begin
-        p1 = self._begin - line._begin
-        p2 = self._end - line._begin
+        begin = line.begin
+        v = line.end - begin
+        p1 = self.begin - begin
+        p2 = self.end - begin
         if v.cross(p1) * v.cross(p2) > EPS:
             return False
 
         return True
 
     def __repr__(self):
-        return (f"Line(begin = {self._begin}, end = {self._end}, "
+        return (f"Line(begin = {self.begin}, end = {self.end}, "
                f"location = {self.location}, rotation = {self.rotation})")
 
 
@@ -243,11 +516,15 @@ class Rectangle(Shape):
     """A class representing a rectangle.
 
     Attributes:
-        `sides`: A list of Line objects
-            The sides of the Rectangle.
+        `sides`: A list of Line objects (read only)
+            The sides of the Rectangle in the order left, bottom,
+            right, top.
 
             NOTE: Should NOT be modified!
     """
+    __slots__ = ('_local_corners', '_local_center', '_world_corners', '_sides',
+                 '_bounding_box')
+
 
     def __init__(self, topleft, topright, bottomleft):
         """Initializes a Rectangle.
@@ -274,49 +551,56 @@ class Rectangle(Shape):
 
         bottomright = bottomleft + topright - topleft
 
-        self._left = Line(Vector2(topleft), Vector2(bottomleft))
-        bottom = Line(Vector2(bottomleft), Vector2(bottomright))
-        right = Line(Vector2(bottomright), Vector2(topright))
-        self._top = Line(Vector2(topright), Vector2(topleft))
-        self.sides = [self._left, bottom, right, self._top]
-
-        self._location = Vector2(0, 0)
-        self._rotation = 0.0
+        # in the order of the sides: each side begins from its corner
+        self._local_corners = [Vector2(topleft), Vector2(bottomleft),
+                               Vector2(bottomright), Vector2(topright)]
+        self._local_center = (self._local_corners[0] + self._local_corners[2]) / 2
+        super().__init__()
 
     @classmethod
     def from_rect(cls, rect):
         return Rectangle(Vector2(rect.topleft), Vector2(rect.topright),
                          Vector2(rect.bottomleft))
 
-    @property
-    def location(self):
-        return self._location
+    def copy(self):
+        """Returns a Rectangle with the same local geometry as `self`.
 
-    @location.setter
-    def location(self, value):
-        for i in range(len(self.sides)):
-            self.sides[i].location = value
-        self._location = value
+        The returned Rectangle has its own Transform initialized to identity.
+        """
+        topleft, bottomleft, _, topright = self._local_corners
+        return Rectangle(topleft, topright, bottomleft)
 
     @property
-    def rotation(self):
-        return self._rotation
-
-    @rotation.setter
-    def rotation(self, value):
-        for i in range(len(self.sides)):
-            self.sides[i].rotation = value
-        self._rotation = value
-
-    def intersects(self, shape):
+    def sides(self):
+        if self._sides is None:
+            corners = self._corners()
+            self._sides = [Line(corners[i], corners[(i + 1) % 4])
+                           for i in range(4)]
+        return self._sides
+
+    def bounding_box(self):
         """See the base class"""
-        if isinstance(shape, Circle):
-            return self._intersects_circle(shape)
-        if isinstance(shape, Line):
-            return self._intersects_line(shape)
-        if isinstance(shape, Rectangle):
-            return self._intersects_rectangle(shape)
-        return shape.intersects(self)
+        if self._bounding_box is None:
+            xs = [corner[0] for corner in self._corners()]
+            ys = [corner[1] for corner in self._corners()]
+            self._bounding_box = BoundingBox(min(xs), min(ys), max(xs), max(ys))
+        return self._bounding_box
+
+    def _transform_changed(self):
+        self._world_corners = None
+        self._sides = None
+        self._bounding_box = None
+
+    def _corners(self):
+        """Returns the corners in the world coordinates.
+
+        The order is topleft, bottomleft, bottomright, topright."""
+        if self._world_corners is None:
+            location = self._transform.location
+            rotation = -self._transform.rotation
+            self._world_corners = [x.rotate_rad(rotation) + location
+                                   for x in self._local_corners]
+        return self._world_corners
 
     def _intersects_circle(self, circle):
         if self._contains(circle.center):
@@ -328,8 +612,9 @@ class Rectangle(Shape):
 
     def _contains(self, point):
         '''Returns True if `point` is inside self, otherwise False'''
-        return -EPS < self._top.projection_param(point) < 1 + EPS \
-            and -EPS < self._left.projection_param(point) < 1 + EPS
+        sides = self.sides
+        return -EPS < sides[3].projection_param(point) < 1 + EPS \
+            and -EPS < sides[0].projection_param(point) < 1 + EPS
 
     def _intersects_line(self, line):
         if self._contains(line.begin) or self._contains(line.end):
@@ -338,9 +623,9 @@ class Rectangle(Shape):
         return any(side.intersects(line) for side in self.sides)
 
     def _intersects_rectangle(self, rectangle):
-        if any(rectangle._contains(side.begin) for side in self.sides):
+        if any(rectangle._contains(corner) for corner in self._corners()):
             return True
-        if any(self._contains(side.begin) for side in rectangle.sides):
+        if any(self._contains(corner) for corner in rectangle._corners()):
             return True
         return False
 
@@ -350,7 +635,10 @@ class Rectangle(Shape):
         Returns:
             pygame.Vector2
         """
-        return Vector2(self.sides[0].begin + self.sides[2].begin)/2
+        if self._world_corners is None:
+            return self._to_world(self._local_center)
+        corners = self._world_corners
+        return (corners[0] + corners[2]) / 2
 
     def size(self):
         """Returns width and height of the rectangle.
@@ -358,30 +646,40 @@ class Rectangle(Shape):
         Returns:
             pygame.Vector2
         """
-        width = (self.sides[3].end - self.sides[3].begin).magnitude()
-        height = (self.sides[0].end - self.sides[0].begin).magnitude()
+        topleft, bottomleft, _, topright = self._local_corners
+        width = (topright - topleft).magnitude()
+        height = (bottomleft - topleft).magnitude()
         return Vector2(width, height)
 
     def __repr__(self):
-        return f"Rectangle(topleft = {self.sides[0].begin}, topright = {self.sides[3].begin}, \
-bottomleft = {self.sides[0].end}, location = {self.location}, rotation = {self.rotation})"
+        corners = self._corners()
+        return f"Rectangle(topleft = {corners[0]}, topright = {corners[3]}, \
+bottomleft = {corners[1]}, location = {self.location}, rotation = {self.rotation})"
 
 
 class Polyline(Shape):
     """A class representing a collection of Line objects.
 
+    The `lines` are indexed with a BoundingVolumeHierarchy so that
+    the intersection tests only check the nearby lines. The hierarchy is
+    rebuilt after the Polyline has been moved, so Polyline is best suited
+    for static geometry.
+
     Attributes:
-        `lines`: A list of Line objects
+        `lines`: A list of Line objects (read only)
+
+            NOTE: Should NOT be modified!
     """
+    __slots__ = ('_local_lines', '_lines', '_bounding_box', '_hierarchy')
+
     def __init__(self, lines):
         """Initializes a Polyline.
 
         Attributes:
             `lines`: A list of Line objects
         """
-        self.lines = lines
-        self._location = Vector2(0, 0)
-        self._rotation = 0.0
+        self._local_lines = lines
+        super().__init__()
 
     @classmethod
     def from_points(cls, points):
@@ -391,31 +689,62 @@ class Polyline(Shape):
         return cls(lines)
 
     @property
-    def location(self):
-        return self._location
-
-    @location.setter
-    def location(self, value):
-        for i in range(len(self.lines)):
-            self.lines[i].location = value
-        self._location = value
-
-    @property
-    def rotation(self):
-        return self._rotation
-
-    @rotation.setter
-    def rotation(self, value):
-        for i in range(len(self.lines)):
-            self.lines[i].rotation = value
-        self._rotation = value
-
-    def intersects(self, shape):
+    def lines(self):
+        if self._lines is None:
+            if self.rotation == 0 and self.location == Vector2(0, 0):
+                self._lines = self._local_lines
+            else:
+                self._lines = [Line(self._to_world(x.begin), self._to_world(x.end))
+                               for x in self._local_lines]
+        return self._lines
+
+    def _intersects_shape(self, shape):
+        # the hierarchy only returns the lines whose bounding boxes overlap
+        # the bounding box of `shape` so the lines are tested directly
+        line_test = _INTERSECTION_TESTS.get((Line, type(shape)))
+        if line_test is None:
+            raise _unknown_pair_error(type(self), type(shape))
+        nearby_lines = self.hierarchy().query(shape.bounding_box(), EPS)
+        return any(line_test(line, shape) for line in nearby_lines)
+
+    def hierarchy(self):
+        """Returns the BoundingVolumeHierarchy of `self.lines`.
+
+        Builds the hierarchy if `self` has been moved since the last call.
+        Call this once after loading static geometry to avoid building
+        the hierarchy during the game."""
+        if self._hierarchy is None:
+            self._hierarchy = BoundingVolumeHierarchy(self.lines)
+        return self._hierarchy
+
+    def bounding_box(self):
         """See the base class"""
-        return any(line.intersects(shape) for line in self.lines)
+        if self._bounding_box is None:
+            result = BoundingBox.empty()
+            for line in self.lines:
+                result = result.union(line.bounding_box())
+            self._bounding_box = result
+        return self._bounding_box
+
+    def _transform_changed(self):
+        self._lines = None
+        self._bounding_box = None
+        self._hierarchy = None
 
     def __repr__(self):
         line_strings = [f"[{x.begin}, {x.end}]" for x in self.lines]
         line_str = ",\n".join(line_strings)
         loc_rot_str = f"location = {self.location}, rotation = {self.rotation})"
         return "Polyline([\n" + line_str + "],\n" + loc_rot_str
+
+
+register_intersection(Circle, Circle, Circle._intersects_circle)
+register_intersection(Line, Circle, Line._intersects_circle)
+register_intersection(Line, Line, Line._intersects_line)
+register_intersection(Rectangle, Circle, Rectangle._intersects_circle)
+register_intersection(Rectangle, Line, Rectangle._intersects_line)
+register_intersection(Rectangle, Rectangle, Rectangle._intersects_rectangle)
+register_intersection(Polyline, Circle, Polyline._intersects_shape)
+register_intersection(Polyline, Line, Polyline._intersects_shape)
+register_intersection(Polyline, Rectangle, Polyline._intersects_shape)
+register_intersection(Polyline, Polyline, Polyline._intersects_shape)
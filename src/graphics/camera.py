@@ -1,4 +1,5 @@
 from pygame import Vector2
+from game.shapes import BoundingBox
 class Camera:
     """Camera class.
 
@@ -60,5 +61,39 @@ class Camera:
         _height = height / self._view_height
         self._drawing_surface.draw_image(image, _location, rotation, _height)
 
+    def draw_surface(self, surface, topleft):
+        """Draws a pygame.Surface on Camera without scaling it.
+
+        Arguments:
+            `surface`: A pygame.Surface
+                Should be drawn with the scale of `pixels_per_unit`.
+            `topleft`: A pygame.Vector2
+                The top left corner of `surface` in game world coordinates.
+        """
+        if self._drawing_surface is None:
+            return
+
+        self._drawing_surface.blit(surface, self._to_drawing_surface_coords(topleft))
+
+    def visible_area(self):
+        """Returns the BoundingBox of the game world visible to Camera.
+
+        Returns an empty BoundingBox if there is no drawing surface."""
+        if self._drawing_surface is None:
+            return BoundingBox.empty()
+        half_size = self._drawing_surface.get_size() * self._view_height / 2
+        return BoundingBox(self.location[0] - half_size[0],
+                           self.location[1] - half_size[1],
+                           self.location[0] + half_size[0],
+                           self.location[1] + half_size[1])
+
+    def pixels_per_unit(self):
+        """Returns the number of pixels per game world unit.
+
+        Returns 0 if there is no drawing surface."""
+        if self._drawing_surface is None:
+            return 0
+        return self._drawing_surface.get_height_pixels() / self._view_height
+
     def _to_drawing_surface_coords(self, world_coords):
         return (world_coords - self.location) / self._view_height + self._surface_center
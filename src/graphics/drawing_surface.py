@@ -1,7 +1,11 @@
-import math
 import pygame
 from pygame import Rect, Vector2
 from utils.float_rect import FloatRect
+from graphics.image import SPRITE_CACHE
+
+# the default color of the pixels of offscreen surfaces that are not drawn
+# NOTE: the graphics drawn on the offscreen surfaces should not use this color
+COLORKEY = (255, 0, 255)
 
 # NOTE the window resizing hasn't been implemented yet
 # but should work as long as we always create a new DrawingSurface
@@ -20,21 +24,58 @@ class DrawingSurface:
         The height of the DrawingSurface is 1 and the width depends
         on the aspect ratio.
     """
-    def __init__(self, surface, screen, absolute_topleft):
+    def __init__(self, surface, screen, absolute_topleft, sprite_cache=SPRITE_CACHE):
         """Initializes a DrawingSurface.
 
         Arguments:
             `surface`: A pygame.Surface
                 The Surface used for drawing.
-            `screen`: A Screen object
+            `screen`: A Screen object or None
                 The Screen containing the `surface` (maybe as a subsurface)
+                None if `surface` is an offscreen surface that is not
+                shown directly. The offscreen DrawingSurface cannot draw
+                text or lines with `scaled` == False.
             `absolute_topleft`: Vector2
                 The absolute pixel coordinates of the top left corner
+            `sprite_cache`: A SpriteCache
+                Rotates and scales the images drawn with `draw_image`
         """
 
         self._surface = surface
         self._screen = screen
         self._absolute_topleft = absolute_topleft
+        self._sprite_cache = sprite_cache
+
+    @classmethod
+    def offscreen(cls, width, height, colorkey=COLORKEY, alpha=False):
+        """Creates a DrawingSurface drawing to a new offscreen surface.
+
+        The surface is filled with `colorkey`, which is not drawn when
+        the surface is blitted (see `blit`). If `alpha` is True, the
+        surface has per pixel alpha and is filled with transparent
+        pixels instead, so the semi-transparent edges of the graphics
+        are not blended with `colorkey`.
+
+        Arguments:
+            `width`: A positive integer
+                The width of the surface in pixels
+            `height`: A positive integer
+                The height of the surface in pixels
+            `colorkey`: A tuple of length 3
+                Not used if `alpha` is True
+            `alpha`: A boolean
+
+        Returns:
+            A tuple (DrawingSurface, pygame.Surface)
+        """
+        if alpha:
+            surface = pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
+            surface.fill((0, 0, 0, 0))
+        else:
+            surface = pygame.Surface((width, height)).convert()
+            surface.fill(colorkey)
+            surface.set_colorkey(colorkey, pygame.RLEACCEL)
+        return cls(surface, None, Vector2(0, 0)), surface
 
     def subsurface(self, area):
         """Returns a new DrawingSurface corresponding to `area`.
@@ -53,7 +94,7 @@ class DrawingSurface:
         if size[0] <= 0 or size[1] <= 0:
             raise ValueError("Cannot make a subsurface with pixel area 0")
         return DrawingSurface(self._surface.subsurface(_area), self._screen,
-                              new_absolute_topleft)
+                              new_absolute_topleft, self._sprite_cache)
 
     def aspect_ratio_subsurface(self, aspect_ratio):
         """Returns the maximal subsurface with width/height = `aspect_ratio`.
@@ -124,6 +165,9 @@ class DrawingSurface:
     def draw_image(self, image, position, rotation, height):
         """Draws image to `self`
 
+        The rotated and scaled image is taken from the SpriteCache, so
+        the rotation is rounded to its angle step.
+
         Arguments:
             `image`: Image
             `position` Vector2 (relative DrawingSurface coordinates)
@@ -135,15 +179,23 @@ class DrawingSurface:
         """
         _position = self._to_pixel_coordinates(position)
         _height = height * self._surface.get_height()
-        degrees_rotation = math.degrees(rotation)
-        zoom_factor = _height / image.get_height_pixels()
-        final_image = pygame.transform.rotozoom(image.image, degrees_rotation,
-                                                zoom_factor)
+        final_image = self._sprite_cache.sprite(image, rotation, _height)
         area = final_image.get_rect()
         area.center = _position
         dirty_rect = self._surface.blit(final_image, area.topleft)
         self._add_dirty_rect(dirty_rect)
 
+    def blit(self, surface, position):
+        """Draws a pygame.Surface to `self` without scaling it.
+
+        Arguments:
+            `surface`: A pygame.Surface
+            `position`: A Vector2 (relative DrawingSurface coordinates)
+                The position of the top left corner of `surface`
+        """
+        dirty_rect = self._surface.blit(surface, self._to_pixel_coordinates(position))
+        self._add_dirty_rect(dirty_rect)
+
     def draw_image_from_array(self, array, position, height):
         """Draws image from a numpy array.
 
@@ -194,6 +246,10 @@ class DrawingSurface:
 
         return Vector2(self.get_relative_width(), 1)
 
+    def get_height_pixels(self):
+        """Returns the height of `self` in pixels"""
+        return self._surface.get_height()
+
     def get_font_height(self):
         """Returns the font height in relative DrawingSurface coordinates.
 
@@ -256,5 +312,7 @@ class DrawingSurface:
                 The pixel coordinates of the rect with respect to
                 `self._surface`
         """
+        if self._screen is None:
+            return
         dirty_rect.topleft += self._absolute_topleft
         self._screen.add_dirty_rect(dirty_rect)
@@ -1,12 +1,16 @@
 import random
 import math
+from collections import OrderedDict
 from pygame import Vector2
 from utils.rect_splitter import rect_splitter
 from graphics.graphics import ImageGraphic
+from graphics.static_layer import StaticLayer
+from graphics.camera import Camera
+from graphics.drawing_surface import DrawingSurface
 class GameRenderer:
     """A renderer class for Game"""
     def __init__(self, screen, game_views, game_background,
-                 pause_overlay, info_bar):
+                 pause_overlay, info_bar, static_layer=None):
         """Initializes GameRenderer.
 
         Arguments:
@@ -19,6 +23,10 @@ class GameRenderer:
                 The object rendering the pause text and effect
             `info_bar`: An InfoBar
                 The object rendering the info bar
+            `static_layer`: A StaticLayer or None
+                Draws the static GameObjects of the rendered GameState.
+                If None, then it is created from the static GameObjects
+                of the first rendered GameState.
 
         """
         self._screen = screen
@@ -26,6 +34,7 @@ class GameRenderer:
         self._game_background = game_background
         self._pause_overlay = pause_overlay
         self._info_bar = info_bar
+        self._static_layer = static_layer
 
         self._screen.surface.fill(self._game_background.fill_color, update=True)
         self._screen.update()
@@ -46,15 +55,35 @@ class GameRenderer:
 
         self._game_view_areas = rect_splitter(n_splits, self._game_area)
 
-    def render(self, game_state):
+    def render(self, game_state, alpha=1.0):
         """Renders non-paused `game_state`.
 
+        The GameObjects are drawn between their previous and current
+        states. Their transforms are returned to the current states
+        before returning.
+
         Arguments:
             `game_state`: A GameState
+            `alpha`: A float between 0 and 1
+                The interpolation factor between the previous (0) and
+                the current (1) state of the GameObjects.
         """
+        interpolated = [game_object.transform
+                        for game_object in game_state.game_objects
+                        if game_object.transform.interpolate(alpha)]
         self._render_common(game_state)
+        for transform in interpolated:
+            transform.restore()
         self._screen.update()
 
+    def render_stats(self):
+        """Returns the RenderStats of the last frame of each GameView.
+
+        Returns:
+            A list of RenderStats objects in the order of the GameViews
+        """
+        return [game_view.render_stats for game_view in self._game_views]
+
     def render_pause(self, game_state):
         """Renders paused `game_state`.
 
@@ -74,10 +103,13 @@ class GameRenderer:
         # NOTE: Currently also clears the InfoBar region which is not optimal.
         self._screen.surface.fill(self._game_background.fill_color)
 
+        if self._static_layer is None:
+            self._static_layer = StaticLayer(game_state.static_objects)
+
         for game_view, area in zip(self._game_views, self._game_view_areas):
             subsurface = self._screen.surface.subsurface(area)
             game_view.render(subsurface, game_state.game_objects,
-                             self._game_background)
+                             self._game_background, self._static_layer)
 
         info_surface = self._screen.surface.subsurface(self._info_bar_area)
         self._info_bar.render(info_surface,
@@ -145,8 +177,13 @@ class InfoBar:
         surface.midtop_text(text, midtop, self.font_color)
 
 class GameBackground:
-    """A class for rendering the game background"""
-    def __init__(self, graphic, n_graphics, repeat_area, fill_color):
+    """A class for rendering the game background.
+
+    The graphics form a pattern repeating every `repeat_area`. The pattern
+    is rendered once per camera scale to a tile covering one `repeat_area`,
+    and the tile is then blitted next to itself to cover the view.
+    """
+    def __init__(self, graphic, n_graphics, repeat_area, fill_color, max_scales=2):
         """Initializes GameBackground object.
 
         Arguments:
@@ -156,17 +193,22 @@ class GameBackground:
                 The number of graphics in one `repeat_area`
             `repeat_area`: Vector2 object
                 The size of the repeat in background.
-                NOTE: Should be large enough that at most one
-                copy of each cloud can be seen in each
+                NOTE: Should be at least as large as the area seen by
+                the cameras, so that at most four tiles are blitted in each
                 `render` call!
             `fill_color`: A tuple of length 3
                 The color used to fill the empty space
+            `max_scales`: A positive integer
+                The maximum number of rendered tiles kept in memory
         """
         self._graphic = graphic
         self._n_graphics = n_graphics
-        self._repeat_area = repeat_area
+        self._repeat_area = Vector2(repeat_area)
         self.fill_color = fill_color
+        self._max_scales = max_scales
         self._graphic_locations = self._generate_graphic_locations()
+        # pixels per unit -> pygame.Surface
+        self._tiles = OrderedDict()
 
     @classmethod
     def from_config(cls, background_config):
@@ -178,7 +220,7 @@ class GameBackground:
 
         background_graphic = ImageGraphic.from_image_path(
             background_config.image_file_path,
-            Vector2(0, 0), Vector2(background_config.image_size))
+            Vector2(0, 0), Vector2(background_config.image_size), rotates=False)
 
         return cls(
             background_graphic, background_config.n_images,
@@ -189,39 +231,85 @@ class GameBackground:
         random.seed(1337)
         result = []
         for i in range(self._n_graphics):
-            result.append(Vector2(random.randint(0, self._repeat_area[0]),
-                                  random.randint(0, self._repeat_area[1])))
+            result.append(Vector2(random.randint(0, int(self._repeat_area[0])),
+                                  random.randint(0, int(self._repeat_area[1]))))
         return result
 
-    def _closest_congruent(self, target, point, mod):
-        """Returns the closest point to `target`.
-
-        Considers all points congruent with `point` modulo `mod`"""
-
-        # Note that x % mod returns non-negative values if mod > 0
-        mod_distance = Vector2((point[0] - target[0]) % mod[0],
-                               (point[1] - target[1]) % mod[1])
-        for i in range(2):
-            if mod_distance[i]*2 > mod[i]:
-                mod_distance[i] -= mod[i]
-
-        return mod_distance + target
-
     def render(self, camera):
         """Renders `self` to `camera`.
 
         Arguments:
             `camera`: A Camera
         """
-        center_offset = camera.location
+        scale = camera.pixels_per_unit()
+        if scale <= 0:
+            return
+        tile = self._tile(scale)
+        visible = camera.visible_area()
+        width, height = self._repeat_area
+        for column in range(math.floor(visible.left / width),
+                            math.floor(visible.right / width) + 1):
+            for row in range(math.floor(visible.top / height),
+                             math.floor(visible.bottom / height) + 1):
+                camera.draw_surface(tile, Vector2(column * width, row * height))
+
+    def _tile(self, scale):
+        if scale in self._tiles:
+            self._tiles.move_to_end(scale)
+            return self._tiles[scale]
+
+        tile = self._render_tile(scale)
+        self._tiles[scale] = tile
+        while len(self._tiles) > self._max_scales:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def _render_tile(self, scale):
+        """Returns the pattern of one `repeat_area` with `scale` pixels per unit.
+
+        The graphics crossing the edges of the tile are wrapped to the
+        opposite edges."""
+        width = math.ceil(self._repeat_area[0] * scale)
+        height = math.ceil(self._repeat_area[1] * scale)
+        # the edges of the images are semi-transparent
+        drawing_surface, tile = DrawingSurface.offscreen(width, height, alpha=True)
+        camera = Camera(height / scale)
+        camera.set_drawing_surface(drawing_surface)
+        camera.location = Vector2(width, height) / scale / 2
         for location in self._graphic_locations:
-            graphic_location = self._closest_congruent(
-                center_offset, location, self._repeat_area)
-            self._graphic.location = graphic_location
-            self._graphic.draw(camera)
+            for x in (-1, 0, 1):
+                for y in (-1, 0, 1):
+                    self._graphic.location = location + Vector2(
+                        x * self._repeat_area[0], y * self._repeat_area[1])
+                    self._graphic.draw(camera)
+        return tile
+
+class RenderStats:
+    """A class for counting the GameObjects handled when rendering a view.
+
+    Attributes:
+        `drawn`: A non-negative integer
+            The number of GameObjects drawn to the view.
+        `culled`: A non-negative integer
+            The number of GameObjects skipped because they were
+            outside the view.
+    """
+    def __init__(self):
+        """Initializes RenderStats with zero counts."""
+        self.drawn = 0
+        self.culled = 0
+
+    def __repr__(self):
+        return f"RenderStats(drawn = {self.drawn}, culled = {self.culled})"
+
 
 class GameView:
-    """A class for rendering a single player's view to the game"""
+    """A class for rendering a single player's view to the game
+
+    Attributes:
+        `render_stats`: A RenderStats
+            The counts of the last rendered frame
+    """
     def __init__(self, player, camera, font_color):
         """Initializes GameView
 
@@ -236,8 +324,9 @@ class GameView:
         self._player = player
         self._camera = camera
         self._font_color = font_color
+        self.render_stats = RenderStats()
 
-    def render(self, surface, game_objects, game_background):
+    def render(self, surface, game_objects, game_background, static_layer=None):
         """Renders GameView.
 
         Arguments:
@@ -246,6 +335,11 @@ class GameView:
             `game_objects`: A list of GameObject objects
                 The rendered objects
             `game_background`: A GameBackground
+            `static_layer`: A StaticLayer or None
+                Drawn below `game_objects`
+
+        Only the `game_objects` whose graphics overlap the area seen by
+        `self._camera` are drawn.
         """
 
         self._camera.location = self._player.view_location()
@@ -253,8 +347,18 @@ class GameView:
 
         game_background.render(self._camera)
 
+        if static_layer is not None:
+            static_layer.draw(self._camera)
+
+        visible_area = self._camera.visible_area()
+        n_drawn = 0
         for game_object in game_objects:
-            game_object.graphic.draw(self._camera)
+            graphic = game_object.graphic
+            if graphic.bounding_box().overlaps(visible_area):
+                graphic.draw(self._camera)
+                n_drawn += 1
+        self.render_stats.drawn = n_drawn
+        self.render_stats.culled = len(game_objects) - n_drawn
 
         self._render_notification(surface)
         self._render_score(surface)
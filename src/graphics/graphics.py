@@ -2,8 +2,8 @@ import logging
 import sys
 import math
 from abc import ABC, abstractmethod
-from game.shapes import Rectangle
-from graphics.image import Image
+from game.shapes import Rectangle, BoundingBox
+from graphics.image import IMAGE_CACHE
 from utils.float_rect import FloatRect
 
 
@@ -16,14 +16,26 @@ class Graphic(ABC):
         `rotation`: Radians
             Positive rotation mean counter-clockwise
             (in coordinates where x grows right and y grows down)
+        `transform`: A Transform
+            Holds `location` and `rotation`. Can be shared with a Shape.
 
         NOTE: See Shape class for more detailed descriptions.
 
     """
+    __slots__ = ()
+
     @abstractmethod
     def draw(self, camera):
         pass
 
+    @abstractmethod
+    def bounding_box(self):
+        """Returns a BoundingBox containing everything drawn by `draw`.
+
+        NOTE: The returned BoundingBox should NOT be modified!
+        """
+        pass
+
     @property
     @abstractmethod
     def location(self):
@@ -44,9 +56,21 @@ class Graphic(ABC):
     def rotation(self, value):
         pass
 
+    @property
+    @abstractmethod
+    def transform(self):
+        pass
+
+    @transform.setter
+    @abstractmethod
+    def transform(self, value):
+        pass
+
 
 class PolylineGraphic(Graphic):
     """A class for drawing a polyline"""
+    __slots__ = ('_polyline', 'color', 'width')
+
     def __init__(self, polyline, color, width):
         """Initializes PolylineGraphic.
 
@@ -72,6 +96,13 @@ class PolylineGraphic(Graphic):
         for line in self._polyline.lines:
             camera.draw_line(line.begin, line.end, self.color, self.width)
 
+    def bounding_box(self):
+        """See the base class"""
+        box = self._polyline.bounding_box()
+        half_width = self.width / 2
+        return BoundingBox(box.left - half_width, box.top - half_width,
+                           box.right + half_width, box.bottom + half_width)
+
     @property
     def location(self):
         return self._polyline.location
@@ -88,11 +119,20 @@ class PolylineGraphic(Graphic):
     def rotation(self, value):
         self._polyline.rotation = value
 
+    @property
+    def transform(self):
+        return self._polyline.transform
+
+    @transform.setter
+    def transform(self, value):
+        self._polyline.transform = value
+
 
 class ImageGraphic(Graphic):
     """Class for movable and rotatable images."""
+    __slots__ = ('_rectangle', '_image', '_rotates')
 
-    def __init__(self, rectangle, image):
+    def __init__(self, rectangle, image, rotates=True):
         """Initializes ImageGraphic.
 
         Arguments:
@@ -103,6 +143,10 @@ class ImageGraphic(Graphic):
                 `rectangle.rotation` is used to determine the rotation
                 of the drawn `image`.
             `image`: An Image
+            `rotates`: A boolean
+                If False, the image is always drawn unrotated. Should be
+                False for the images that look the same in every rotation
+                so that they need only one sprite in the SpriteCache.
 
         NOTE: The drawing of the image is done by setting its height to
         match that of the `rectangle`. Therefore `rectangle` and `image`
@@ -119,12 +163,15 @@ class ImageGraphic(Graphic):
 
         self._rectangle = rectangle
         self._image = image
+        self._rotates = rotates
 
     @classmethod
-    def from_image_path(cls, image_path, center_offset, size):
+    def from_image_path(cls, image_path, center_offset, size,
+                        image_cache=IMAGE_CACHE, rotates=True):
         """Creates ImageGraphic from an image file.
 
-        Scales image to match the `size` aspect ratio.
+        Scales image to match the `size` aspect ratio. The image is
+        decoded only the first time it is requested with the same `size`.
 
         Arguments:
             `image_path`: pathlib.Path object
@@ -134,6 +181,10 @@ class ImageGraphic(Graphic):
                 `location` of the ImageGraphic
             `size`: Vector2
                 The dimensions of the image
+            `image_cache`: An ImageCache
+                The cache from which the image is loaded
+            `rotates`: A boolean
+                See the constructor
 
         Returns:
             An ImageGraphic object
@@ -144,13 +195,20 @@ class ImageGraphic(Graphic):
             center_offset[0]), math.floor(center_offset[1]))
         rectangle = Rectangle.from_rect(helper_rect)
         try:
-            image = Image(image_path)
+            image = image_cache.image(image_path, helper_rect.width,
+                                      helper_rect.height)
         except Exception:
             logging.critical(f"Failed loading image from {image_path}.")
             logging.critical(f"Are the configuration files OK?")
             sys.exit()
-        image.set_aspect_ratio(helper_rect.width, helper_rect.height)
-        return ImageGraphic(rectangle, image)
+        return ImageGraphic(rectangle, image, rotates)
+
+    def copy(self):
+        """Returns an ImageGraphic drawing the same Image as `self`.
+
+        The Image is shared but the returned ImageGraphic has its own
+        Rectangle with the Transform initialized to identity."""
+        return ImageGraphic(self._rectangle.copy(), self._image, self._rotates)
 
     def draw(self, camera):
         """Draws image on `camera`.
@@ -158,8 +216,19 @@ class ImageGraphic(Graphic):
         Arguments:
             `camera`: A Camera
         """
+        rotation = self._rectangle.rotation if self._rotates else 0
         camera.draw_image(self._image, self._rectangle.center(),
-                    self._rectangle.rotation, self._rectangle.size()[1])
+                    rotation, self._rectangle.size()[1])
+
+    def bounding_box(self):
+        """See the base class"""
+        if self._rotates:
+            return self._rectangle.bounding_box()
+        # the unrotated image is drawn even if the rectangle is rotated
+        center = self._rectangle.center()
+        half_size = self._rectangle.size() / 2
+        return BoundingBox(center[0] - half_size[0], center[1] - half_size[1],
+                           center[0] + half_size[0], center[1] + half_size[1])
 
     @property
     def location(self):
@@ -176,3 +245,11 @@ class ImageGraphic(Graphic):
     @rotation.setter
     def rotation(self, value):
         self._rectangle.rotation = value
+
+    @property
+    def transform(self):
+        return self._rectangle.transform
+
+    @transform.setter
+    def transform(self, value):
+        self._rectangle.transform = value
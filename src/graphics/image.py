@@ -1,4 +1,10 @@
+import math
+from collections import OrderedDict
+from pathlib import Path
+
 import pygame
+
+
 class Image:
     """Class for storing and drawing an image.
 
@@ -6,6 +12,7 @@ class Image:
         `image`: A pygame.Surface
             contains the image pixels
     """
+    __slots__ = ('image',)
 
     def __init__(self, image_path):
         """Initializes Image.
@@ -15,6 +22,17 @@ class Image:
         """
         self.image = pygame.image.load(image_path).convert_alpha()
 
+    @classmethod
+    def from_surface(cls, surface):
+        """Creates an Image drawing `surface` without copying it.
+
+        Arguments:
+            `surface`: A pygame.Surface
+        """
+        image = cls.__new__(cls)
+        image.image = surface
+        return image
+
     def set_aspect_ratio(self, width, height):
         """Changes the aspect ratio.
 
@@ -42,3 +60,162 @@ class Image:
 
     def get_width_pixels(self):
         return self.image.get_width()
+
+
+class ImageCache:
+    """A cache of decoded and scaled images.
+
+    Each image is loaded from the disk and scaled once per
+    (path, target size) pair. The resulting Surface is shared by all
+    of the Image objects created from the cache, so the Surfaces
+    should not be drawn on.
+    """
+    def __init__(self):
+        """Initializes an empty ImageCache."""
+        self._surfaces = {}
+
+    def image(self, image_path, width, height):
+        """Returns an Image with the aspect ratio of (`width`, `height`).
+
+        Loads the image if it is not in the cache. See
+        `Image.set_aspect_ratio` for the scaling.
+
+        Arguments:
+            `image_path`: A Path
+            `width`: A positive float
+            `height`: A positive float
+
+        Returns:
+            An Image:
+                Shares the Surface with the other Images of the same
+                path and size.
+        """
+        key = (Path(image_path), width, height)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            image = Image(image_path)
+            image.set_aspect_ratio(width, height)
+            surface = image.image
+            self._surfaces[key] = surface
+        return Image.from_surface(surface)
+
+    def preload(self, image_path, width, height):
+        """Loads an image to the cache in advance. See `image`."""
+        self.image(image_path, width, height)
+
+    def evict(self, image_path):
+        """Removes all of the sizes of `image_path` from the cache."""
+        image_path = Path(image_path)
+        for key in [x for x in self._surfaces if x[0] == image_path]:
+            del self._surfaces[key]
+
+    def clear(self):
+        """Removes all of the images from the cache."""
+        self._surfaces = {}
+
+    def __len__(self):
+        """Returns the number of cached Surfaces."""
+        return len(self._surfaces)
+
+
+# shared by all of the ImageGraphics of the process
+IMAGE_CACHE = ImageCache()
+
+
+class SpriteCache:
+    """A cache of rotated and scaled images.
+
+    The rotations are rounded to multiples of `angle_step` degrees and
+    the heights to whole pixels, so a moving image is rotated and scaled
+    only once per visited (rotation, height) pair. The sprites are keyed
+    by the Surface of the Image, so the Images sharing a Surface (see
+    ImageCache) share their sprites too.
+
+    When the sprites take more than `max_bytes` bytes, the least
+    recently used sprites are removed.
+
+    Attributes:
+        `hits`: A non-negative integer
+            The number of sprites found in the cache
+        `misses`: A non-negative integer
+            The number of sprites rendered by the cache
+    """
+    def __init__(self, angle_step=2, max_bytes=64 * 2**20):
+        """Initializes an empty SpriteCache.
+
+        Arguments:
+            `angle_step`: A positive float
+                The rotation resolution in degrees
+            `max_bytes`: A positive integer
+                The maximum total size of the cached sprites
+        """
+        self.configure(angle_step, max_bytes)
+
+    def configure(self, angle_step, max_bytes):
+        """Changes the settings of `self` and removes all of the sprites.
+
+        Arguments:
+            See the constructor
+        """
+        if angle_step <= 0:
+            raise ValueError("The angle step should be positive")
+        self._angle_step = angle_step
+        self._n_angles = max(1, round(360 / angle_step))
+        self._max_bytes = max_bytes
+        self.clear()
+
+    def sprite(self, image, rotation, height):
+        """Returns `image` rotated by `rotation` and scaled to `height`.
+
+        Arguments:
+            `image`: An Image
+            `rotation`: Radians
+                Positive rotation means counter-clockwise
+            `height`: A positive float
+                The height of the unrotated image in pixels
+
+        Returns:
+            A pygame.Surface:
+                Shared with the other callers. Should not be drawn on.
+        """
+        angle_index = round(math.degrees(rotation) / self._angle_step) % self._n_angles
+        height = max(1, round(height))
+        key = (image.image, angle_index, height)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = pygame.transform.rotozoom(image.image,
+                                           angle_index * 360 / self._n_angles,
+                                           height / image.get_height_pixels())
+        self._sprites[key] = sprite
+        self._n_bytes += self._size(sprite)
+        while self._n_bytes > self._max_bytes and len(self._sprites) > 1:
+            _, removed = self._sprites.popitem(last=False)
+            self._n_bytes -= self._size(removed)
+        return sprite
+
+    def clear(self):
+        """Removes all of the sprites from the cache."""
+        self._sprites = OrderedDict()
+        self._n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def n_bytes(self):
+        """Returns the total size of the cached sprites in bytes"""
+        return self._n_bytes
+
+    def __len__(self):
+        """Returns the number of cached sprites."""
+        return len(self._sprites)
+
+    def _size(self, sprite):
+        return sprite.get_bytesize() * sprite.get_width() * sprite.get_height()
+
+
+# shared by all of the DrawingSurfaces of the process
+SPRITE_CACHE = SpriteCache()
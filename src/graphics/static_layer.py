@@ -0,0 +1,154 @@
+import math
+from collections import OrderedDict
+
+from pygame import Vector2
+
+from game.shapes import BoundingBox, Polyline
+from graphics.camera import Camera
+from graphics.drawing_surface import DrawingSurface
+
+# the distance in pixels the rasterized graphics can extend outside
+# their bounding boxes, e.g. because of the minimum line width
+PIXEL_SLACK = 2
+
+
+class StaticLayer:
+    """A class for drawing the static GameObjects of a level.
+
+    The level is split into square tiles of `tile_size` pixels. The
+    graphics of the static GameObjects are rendered to a tile the first
+    time the tile is visible with the scale of the Camera, and the tile
+    is then blitted to the Camera on the following frames. Only the
+    tiles overlapping the visible area of the Camera are rendered and
+    drawn, and the tiles without any static GameObjects are skipped.
+
+    The tiles are aligned to a grid starting from the origin of the game
+    world, so the neighbouring tiles join without seams. When the window
+    size or the zoom changes, the tiles of the new scale are rendered
+    as they become visible and the least recently used tiles are removed
+    when there are more than `max_tiles` of them.
+    """
+    def __init__(self, game_objects, tile_size=512, max_tiles=48):
+        """Initializes StaticLayer.
+
+        The area covered by each graphic is taken from its
+        `bounding_box`, so e.g. the width of the lines is included.
+
+        Arguments:
+            `game_objects`: A list of GameObject objects
+                The static GameObjects of the level
+                NOTE: Should not be moved after creating StaticLayer
+            `tile_size`: A positive integer
+                The width and height of the tiles in pixels
+            `max_tiles`: A positive integer
+                The maximum number of rendered tiles kept in memory
+        """
+        # (shape, graphic, the bounding box of the graphic, the distance
+        # the graphic extends outside the bounding box of the shape)
+        self._items = []
+        self._tile_size = tile_size
+        self._max_tiles = max_tiles
+        self._bounding_box = BoundingBox.empty()
+        for game_object in game_objects:
+            graphic_box = game_object.graphic.bounding_box()
+            self._items.append((game_object.shape, game_object.graphic,
+                                graphic_box,
+                                self._extent(game_object.shape, graphic_box)))
+            self._bounding_box = self._bounding_box.union(graphic_box)
+        # (pixels per unit, column, row) -> pygame.Surface or None if empty
+        self._tiles = OrderedDict()
+
+    def __len__(self):
+        """Returns the number of tiles kept in memory, including the empty tiles"""
+        return len(self._tiles)
+
+    def draw(self, camera):
+        """Draws the tiles visible to `camera`.
+
+        Arguments:
+            `camera`: A Camera
+        """
+        if self._bounding_box.is_empty():
+            return
+        scale = camera.pixels_per_unit()
+        if scale <= 0:
+            return
+
+        tile_length = self._tile_size / scale
+        slack = PIXEL_SLACK / scale
+        visible = camera.visible_area()
+        left = max(visible.left, self._bounding_box.left - slack)
+        top = max(visible.top, self._bounding_box.top - slack)
+        right = min(visible.right, self._bounding_box.right + slack)
+        bottom = min(visible.bottom, self._bounding_box.bottom + slack)
+        for column in range(math.floor(left / tile_length),
+                            math.floor(right / tile_length) + 1):
+            for row in range(math.floor(top / tile_length),
+                             math.floor(bottom / tile_length) + 1):
+                tile = self._tile(scale, column, row)
+                if tile is not None:
+                    camera.draw_surface(tile, Vector2(column, row) * tile_length)
+
+    def _tile(self, scale, column, row):
+        key = (scale, column, row)
+        if key in self._tiles:
+            self._tiles.move_to_end(key)
+            return self._tiles[key]
+
+        tile = self._render_tile(scale, column, row)
+        self._tiles[key] = tile
+        while len(self._tiles) > self._max_tiles:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def _render_tile(self, scale, column, row):
+        """Returns the tile rendered with `scale` pixels per unit.
+
+        Returns None if there is nothing to draw on the tile."""
+        tile_length = self._tile_size / scale
+        topleft = Vector2(column, row) * tile_length
+        area = BoundingBox(topleft[0], topleft[1],
+                           topleft[0] + tile_length, topleft[1] + tile_length)
+        slack = PIXEL_SLACK / scale
+        items = [(graphic, extent) for shape, graphic, graphic_box, extent in self._items
+                 if self._covers(shape, graphic_box, extent + slack, area)]
+        if len(items) == 0:
+            return None
+
+        # pygame clips the lines to the surface before widening them, so
+        # the graphics are drawn to a larger surface containing the parts
+        # of their shapes that are close enough to reach the tile
+        padding = math.ceil(max(extent for graphic, extent in items) * scale) + PIXEL_SLACK
+        padded_size = self._tile_size + 2 * padding
+        drawing_surface, padded = DrawingSurface.offscreen(padded_size, padded_size)
+        camera = Camera(padded_size / scale)
+        camera.set_drawing_surface(drawing_surface)
+        camera.location = topleft + Vector2(tile_length, tile_length) / 2
+        for graphic, extent in items:
+            graphic.draw(camera)
+        return padded.subsurface((padding, padding, self._tile_size, self._tile_size)).copy()
+
+    def _covers(self, shape, graphic_box, margin, area):
+        """Returns True if the graphic of `shape` might be drawn on `area`.
+
+        Arguments:
+            `shape`: A Shape
+            `graphic_box`: The BoundingBox of the graphic of `shape`
+            `margin`: A non-negative float
+                The distance the graphic can extend outside `shape`
+            `area`: A BoundingBox
+        """
+        if not graphic_box.overlaps(area, margin):
+            return False
+        if isinstance(shape, Polyline):
+            return len(shape.hierarchy().query(area, margin)) > 0
+        return True
+
+    @staticmethod
+    def _extent(shape, graphic_box):
+        """Returns how far `graphic_box` extends outside the box of `shape`"""
+        shape_box = shape.bounding_box()
+        return max(0, shape_box.left - graphic_box.left,
+                   shape_box.top - graphic_box.top,
+                   graphic_box.right - shape_box.right,
+                   graphic_box.bottom - shape_box.bottom)
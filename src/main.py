@@ -1,5 +1,6 @@
 from config import CONFIG_PATH, Config
 from graphics.screen import Screen
+from graphics.image import SPRITE_CACHE
 from events import EventHandler
 from database_connection import get_database_connection
 from menu.setup import create_main_menu
@@ -9,6 +10,8 @@ def main():
     config = Config(CONFIG_PATH)
 
     screen = Screen(config.window_width, config.window_height, config.font_size)
+    SPRITE_CACHE.configure(config.sprite_angle_step,
+                           int(config.sprite_cache_megabytes * 2**20))
     event_handler = EventHandler()
     database_connection = get_database_connection(config.database_path)
     main_menu = create_main_menu(screen, event_handler, config, database_connection)
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+from pygame import Vector2
+
+from game.bvh import BoundingVolumeHierarchy
+from game.shapes import Line, Circle, Polyline, BoundingBox
+
+
+@pytest.fixture
+def random_lines():
+    rng = random.Random(1)
+    lines = []
+    for _ in range(500):
+        begin = Vector2(rng.uniform(-1000, 1000), rng.uniform(-1000, 1000))
+        end = begin + Vector2(rng.uniform(1, 50), rng.uniform(-50, 50))
+        lines.append(Line(begin, end))
+    return lines
+
+
+class TestBoundingVolumeHierarchy:
+    def test_constructor_fails_with_non_positive_leaf_size(self):
+        with pytest.raises(ValueError) as e:
+            BoundingVolumeHierarchy([], leaf_size=0)
+
+        assert "The leaf size should be positive" == str(e.value)
+
+    def test_query_empty_hierarchy(self):
+        hierarchy = BoundingVolumeHierarchy([])
+        assert hierarchy.query(BoundingBox(0, 0, 1, 1)) == []
+
+    def test_query_returns_only_overlapping_shapes(self):
+        lines = [Line(Vector2(0, 0), Vector2(1, 0)),
+                 Line(Vector2(10, 0), Vector2(11, 0))]
+        hierarchy = BoundingVolumeHierarchy(lines, leaf_size=1)
+        assert hierarchy.query(BoundingBox(-1, -1, 2, 1)) == [lines[0]]
+
+    def test_query_matches_brute_force(self, random_lines):
+        hierarchy = BoundingVolumeHierarchy(random_lines)
+        rng = random.Random(2)
+        for _ in range(100):
+            left = rng.uniform(-1000, 1000)
+            top = rng.uniform(-1000, 1000)
+            box = BoundingBox(left, top, left + rng.uniform(0, 200),
+                              top + rng.uniform(0, 200))
+            expected = [line for line in random_lines
+                        if line.bounding_box().overlaps(box)]
+            result = hierarchy.query(box)
+            assert len(result) == len(expected)
+            assert set(map(id, result)) == set(map(id, expected))
+
+
+class TestPolylineHierarchy:
+    def test_intersects_matches_testing_all_lines(self, random_lines):
+        polyline = Polyline(random_lines)
+        rng = random.Random(3)
+        for _ in range(200):
+            circle = Circle(Vector2(rng.uniform(-1000, 1000),
+                                    rng.uniform(-1000, 1000)), 20)
+            expected = any(line.intersects(circle) for line in random_lines)
+            assert polyline.intersects(circle) == expected
+
+    def test_hierarchy_is_rebuilt_after_moving(self):
+        polyline = Polyline.from_points([Vector2(0, 0), Vector2(10, 0)])
+        hierarchy = polyline.hierarchy()
+        polyline.location = Vector2(100, 0)
+        assert polyline.hierarchy() is not hierarchy
+        assert polyline.intersects(Circle(Vector2(105, 0), 1))
+        assert not polyline.intersects(Circle(Vector2(5, 0), 1))
@@ -61,3 +61,24 @@ class TestCamera(unittest.TestCase):
         self.drawing_surface.draw_image.assert_called_with(
             ANY, Vector2(1.5 - 0.5, 0.75 - 1), ANY, ANY)
 
+
+    def test_draw_surface_draws_to_top_left_corner(self):
+        surface = Mock()
+        self.camera.location = Vector2(1, 2)
+        self.camera.draw_surface(surface, Vector2(1, 2))
+        self.drawing_surface.blit.assert_called_with(surface, Vector2(1, 0.5))
+
+    def test_pixels_per_unit(self):
+        self.drawing_surface.get_height_pixels.return_value = 100
+        assert self.camera.pixels_per_unit() == 50
+
+    def test_pixels_per_unit_is_zero_if_no_drawing_surface(self):
+        assert Camera(2).pixels_per_unit() == 0
+
+    def test_visible_area(self):
+        self.camera.location = Vector2(1, 2)
+        area = self.camera.visible_area()
+        assert (area.left, area.top, area.right, area.bottom) == (-1, 1, 3, 3)
+
+    def test_visible_area_is_empty_if_no_drawing_surface(self):
+        assert Camera(2).visible_area().is_empty()
@@ -0,0 +1,316 @@
+import itertools
+import random
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from pygame import Vector2
+
+from game.collisions import CollisionStats, BruteForceBroadPhase
+from game.collisions import SpatialHashBroadPhase, SweepAndPruneBroadPhase
+from game.collisions import create_broad_phase, can_collide
+from game.collisions import circles_intersect_segments, CircleSegmentBatch
+from game.collisions import StaticObjectIndex, intersecting_pairs
+from game.shapes import Circle, Line, Polyline, Rectangle
+from game.game_objects import GROUND_CATEGORY, PLANE_CATEGORY, BULLET_CATEGORY
+from game.game_objects import ALL_CATEGORIES
+from constants import EPS
+
+
+def game_object(shape, category=PLANE_CATEGORY, mask=ALL_CATEGORIES):
+    mock = Mock()
+    mock.shape = shape
+    mock.collision_category = category
+    mock.collision_mask = mask
+    return mock
+
+
+def circle_object(x, y, radius=1):
+    return game_object(Circle(Vector2(x, y), radius))
+
+
+class TestCollisionStats:
+    def test_constructor_sets_counts_to_zero(self):
+        stats = CollisionStats()
+        assert stats.pairs_tested == 0
+        assert stats.pairs_hit == 0
+
+    def test_reset(self):
+        stats = CollisionStats()
+        stats.pairs_tested = 10
+        stats.pairs_hit = 2
+        stats.reset()
+        assert stats.pairs_tested == 0
+        assert stats.pairs_hit == 0
+
+    def test_hit_fraction(self):
+        stats = CollisionStats()
+        assert stats.hit_fraction() == 0.0
+        stats.pairs_tested = 4
+        stats.pairs_hit = 1
+        assert stats.hit_fraction() == 0.25
+
+
+class TestSpatialHashBroadPhase:
+    def test_constructor_fails_with_non_positive_cell_size(self):
+        with pytest.raises(ValueError) as e:
+            SpatialHashBroadPhase(0)
+
+        assert "The cell size should be positive" == str(e.value)
+
+    def test_distant_objects_are_not_paired(self):
+        objects = [circle_object(0, 0), circle_object(100, 100)]
+        assert SpatialHashBroadPhase(10).candidate_pairs(objects) == []
+
+    def test_nearby_objects_are_paired(self):
+        objects = [circle_object(1, 1), circle_object(2, 2)]
+        assert SpatialHashBroadPhase(10).candidate_pairs(objects) == [(objects[0], objects[1])]
+
+    def test_objects_across_cell_border_are_paired(self):
+        objects = [circle_object(-0.5, 0), circle_object(0.5, 0)]
+        assert SpatialHashBroadPhase(10).candidate_pairs(objects) == [(objects[0], objects[1])]
+
+    def test_pairs_sharing_many_cells_are_listed_once(self):
+        objects = [circle_object(0, 0, 30), circle_object(1, 1, 30)]
+        assert SpatialHashBroadPhase(10).candidate_pairs(objects) == [(objects[0], objects[1])]
+
+    def test_pairs_keep_the_object_order(self):
+        objects = [circle_object(0, 0), circle_object(50, 0), circle_object(1, 0)]
+        assert SpatialHashBroadPhase(10).candidate_pairs(objects) == [(objects[0], objects[2])]
+
+    def test_large_objects_are_paired_with_everything(self):
+        border = game_object(Polyline.from_points(
+            [Vector2(-1000, -1000), Vector2(1000, -1000), Vector2(1000, 1000)]))
+        objects = [circle_object(0, 0), border, circle_object(500, 500)]
+        pairs = SpatialHashBroadPhase(10, max_cells=4).candidate_pairs(objects)
+        assert pairs == [(objects[0], objects[1]), (objects[1], objects[2])]
+
+
+def test_can_collide_requires_both_masks():
+    ground = game_object(None, GROUND_CATEGORY, PLANE_CATEGORY | BULLET_CATEGORY)
+    plane = game_object(None, PLANE_CATEGORY, ALL_CATEGORIES)
+    bullet = game_object(None, BULLET_CATEGORY, GROUND_CATEGORY)
+    assert can_collide(ground, plane)
+    assert can_collide(plane, ground)
+    assert can_collide(ground, bullet)
+    assert not can_collide(ground, ground)
+    assert not can_collide(plane, bullet)
+    assert not can_collide(bullet, plane)
+
+
+@pytest.mark.parametrize("broad_phase", [
+    BruteForceBroadPhase(), SpatialHashBroadPhase(10), SweepAndPruneBroadPhase()
+])
+def test_broad_phases_skip_excluded_pairs(broad_phase):
+    objects = [circle_object(0, 0), circle_object(1, 0), circle_object(2, 0)]
+    objects[0].collision_category = GROUND_CATEGORY
+    objects[0].collision_mask = PLANE_CATEGORY
+    objects[1].collision_category = GROUND_CATEGORY
+    objects[1].collision_mask = PLANE_CATEGORY
+    assert broad_phase.candidate_pairs(objects) \
+        == [(objects[0], objects[2]), (objects[1], objects[2])]
+
+
+class TestBruteForceBroadPhase:
+    def test_all_pairs_are_returned(self):
+        objects = [circle_object(0, 0), circle_object(100, 0), circle_object(0, 100)]
+        assert BruteForceBroadPhase().candidate_pairs(objects) \
+            == list(itertools.combinations(objects, 2))
+
+
+class TestSweepAndPruneBroadPhase:
+    def test_distant_objects_are_not_paired(self):
+        objects = [circle_object(0, 0), circle_object(100, 100)]
+        assert SweepAndPruneBroadPhase().candidate_pairs(objects) == []
+
+    def test_objects_overlapping_only_horizontally_are_not_paired(self):
+        objects = [circle_object(0, 0), circle_object(0.5, 100)]
+        assert SweepAndPruneBroadPhase().candidate_pairs(objects) == []
+
+    def test_pairs_keep_the_object_order(self):
+        objects = [circle_object(1, 0), circle_object(50, 0), circle_object(0, 0)]
+        assert SweepAndPruneBroadPhase().candidate_pairs(objects) \
+            == [(objects[0], objects[2])]
+
+    def test_order_is_updated_when_objects_move(self):
+        objects = [circle_object(0, 0), circle_object(10, 0)]
+        broad_phase = SweepAndPruneBroadPhase()
+        assert broad_phase.candidate_pairs(objects) == []
+        objects[0].shape.location = Vector2(20, 0)
+        assert broad_phase.candidate_pairs(objects) == []
+        objects[0].shape.location = Vector2(9, 0)
+        assert broad_phase.candidate_pairs(objects) == [(objects[0], objects[1])]
+
+    def test_long_objects_stay_active_after_short_ones_end(self):
+        objects = [circle_object(0, 0), circle_object(40, 0, 40),
+                   circle_object(30, 0), circle_object(50, 0)]
+        assert SweepAndPruneBroadPhase().candidate_pairs(objects) \
+            == [(objects[0], objects[1]), (objects[1], objects[2]),
+                (objects[1], objects[3])]
+
+    def test_removed_objects_are_forgotten(self):
+        objects = [circle_object(0, 0), circle_object(1, 0)]
+        broad_phase = SweepAndPruneBroadPhase()
+        broad_phase.candidate_pairs(objects)
+        assert broad_phase.candidate_pairs(objects[1:]) == []
+
+
+@pytest.mark.parametrize("broad_phase_factory", [
+    lambda: SpatialHashBroadPhase(5),
+    SweepAndPruneBroadPhase,
+])
+def test_candidate_pairs_contain_all_intersecting_pairs(broad_phase_factory):
+    broad_phase = broad_phase_factory()
+    objects = [circle_object(x * 7 % 53, x * 13 % 47, 3) for x in range(40)]
+    for step in range(3):
+        for game_object in objects:
+            game_object.shape.location = Vector2(step * 2, -step)
+        pairs = broad_phase.candidate_pairs(objects)
+        for object_1, object_2 in itertools.combinations(objects, 2):
+            if object_1.shape.intersects(object_2.shape):
+                assert (object_1, object_2) in pairs
+
+
+class TestStaticObjectIndex:
+    def ground(self, points, mask=ALL_CATEGORIES):
+        return game_object(Polyline.from_points([Vector2(x) for x in points]),
+                           GROUND_CATEGORY, mask)
+
+    def test_pairs_contain_all_intersecting_pairs(self):
+        grounds = [self.ground([(x, 0), (x + 10, 10)]) for x in range(0, 100, 10)]
+        index = StaticObjectIndex(grounds)
+        objects = [circle_object(x * 7 % 103, x * 13 % 17, 2) for x in range(40)]
+        pairs = index.candidate_pairs(objects)
+        for game_object in objects:
+            for ground in grounds:
+                if game_object.shape.intersects(ground.shape):
+                    assert (game_object, ground) in pairs
+
+    def test_distant_objects_are_not_paired(self):
+        index = StaticObjectIndex([self.ground([(0, 0), (10, 0)])])
+        assert index.candidate_pairs([circle_object(5, 100)]) == []
+
+    def test_static_objects_are_not_paired_with_each_other(self):
+        grounds = [self.ground([(0, 0), (10, 0)]), self.ground([(5, 0), (5, 5)])]
+        index = StaticObjectIndex(grounds)
+        assert index.candidate_pairs([]) == []
+
+    def test_collision_masks_exclude_pairs(self):
+        ground = self.ground([(0, 0), (10, 0)], mask=BULLET_CATEGORY)
+        index = StaticObjectIndex([ground])
+        plane = circle_object(5, 0)
+        bullet = game_object(Circle(Vector2(5, 0), 1), BULLET_CATEGORY)
+        assert index.candidate_pairs([plane, bullet]) == [(bullet, ground)]
+
+
+def test_create_broad_phase():
+    assert isinstance(create_broad_phase("brute_force", 10), BruteForceBroadPhase)
+    assert isinstance(create_broad_phase("spatial_hash", 10), SpatialHashBroadPhase)
+    assert isinstance(create_broad_phase("sweep_and_prune", 10),
+                      SweepAndPruneBroadPhase)
+
+
+def test_create_broad_phase_fails_with_unknown_engine():
+    with pytest.raises(ValueError) as e:
+        create_broad_phase("quadtree", 10)
+
+    assert "Unknown collision engine 'quadtree'" == str(e.value)
+
+
+def random_circles_and_lines(seed, n):
+    rng = random.Random(seed)
+    circles = []
+    lines = []
+    for _ in range(n):
+        circles.append(Circle(Vector2(rng.uniform(-10, 10), rng.uniform(-10, 10)),
+                              rng.uniform(0, 3)))
+        begin = Vector2(rng.uniform(-10, 10), rng.uniform(-10, 10))
+        lines.append(Line(begin, begin + Vector2(rng.uniform(-5, 5), 1 + rng.uniform(0, 5))))
+    return circles, lines
+
+
+def to_arrays(circles, lines):
+    return (np.array([tuple(x.center) for x in circles]),
+            np.array([x.radius for x in circles]),
+            np.array([tuple(x.begin) for x in lines]),
+            np.array([tuple(x.end) for x in lines]))
+
+
+class TestCirclesIntersectSegments:
+    def test_matches_line_intersects_circle(self):
+        circles, lines = random_circles_and_lines(1, 2000)
+        hits = circles_intersect_segments(*to_arrays(circles, lines))
+        expected = [line._intersects_circle(circle)
+                    for circle, line in zip(circles, lines)]
+        assert list(hits) == expected
+        assert 0 < sum(expected) < len(expected)
+
+    def test_matches_line_intersects_circle_at_boundaries(self):
+        line = Line(Vector2(0, 0), Vector2(4, 0))
+        circles = [Circle(Vector2(-1, 0), 1), Circle(Vector2(-1 - EPS, 0), 1),
+                   Circle(Vector2(5 + EPS/2, 0), 1), Circle(Vector2(2, 1), 1),
+                   Circle(Vector2(2, 1 + EPS), 1), Circle(Vector2(2, 0), 0)]
+        lines = [line] * len(circles)
+        hits = circles_intersect_segments(*to_arrays(circles, lines))
+        assert list(hits) == [line._intersects_circle(x) for x in circles]
+
+
+class TestCircleSegmentBatch:
+    def test_accepts_only_circle_and_line_pairs(self):
+        circle = Circle(Vector2(0, 0), 1)
+        line = Line(Vector2(0, 0), Vector2(1, 0))
+        polyline = Polyline([line])
+        rectangle = Rectangle(Vector2(0, 0), Vector2(1, 0), Vector2(0, 1))
+        assert CircleSegmentBatch.accepts(circle, line)
+        assert CircleSegmentBatch.accepts(polyline, circle)
+        assert not CircleSegmentBatch.accepts(circle, circle)
+        assert not CircleSegmentBatch.accepts(circle, rectangle)
+        assert not CircleSegmentBatch.accepts(line, polyline)
+
+    def test_resolve_empty_batch(self):
+        assert CircleSegmentBatch().resolve() == []
+
+    def test_resolve_matches_shape_intersects(self):
+        circles, lines = random_circles_and_lines(2, 100)
+        polylines = [Polyline(lines[i:i + 10]) for i in range(0, 100, 10)]
+        circle_objects = [game_object(x) for x in circles]
+        segment_objects = [game_object(x) for x in polylines + lines[:10]]
+        batch = CircleSegmentBatch()
+        expected = []
+        for i, (circle, segments) in enumerate(
+                itertools.product(circle_objects, segment_objects)):
+            pair = (circle, segments) if i % 2 else (segments, circle)
+            batch.add(*pair)
+            if circle.shape.intersects(segments.shape):
+                expected.append(pair)
+        assert batch.resolve() == expected
+        assert len(expected) > 0
+
+    def test_resolve_indices_match_resolve(self):
+        circle = circle_object(0, 0)
+        batch = CircleSegmentBatch()
+        batch.add(circle, game_object(Line(Vector2(5, 0), Vector2(6, 0))))
+        batch.add(game_object(Line(Vector2(0, 0), Vector2(1, 0))), circle)
+        assert batch.resolve_indices() == [1]
+
+    def test_resolve_empties_batch(self):
+        batch = CircleSegmentBatch()
+        batch.add(circle_object(0, 0), game_object(Line(Vector2(0, 0), Vector2(1, 0))))
+        assert len(batch.resolve()) == 1
+        assert batch.resolve() == []
+
+
+def test_intersecting_pairs_keep_the_candidate_order():
+    circles, lines = random_circles_and_lines(3, 20)
+    circle_objects = [game_object(x) for x in circles]
+    line_objects = [game_object(x) for x in lines]
+    # batched circle and line pairs mixed with circle pairs tested one by one
+    candidate_pairs = list(itertools.product(circle_objects,
+                                             circle_objects + line_objects))
+    random.Random(5).shuffle(candidate_pairs)
+    expected = [(x, y) for x, y in candidate_pairs if x.shape.intersects(y.shape)]
+    stats = CollisionStats()
+    assert intersecting_pairs(candidate_pairs, stats) == expected
+    assert stats.pairs_hit == len(expected)
+    assert any(isinstance(y.shape, Line) for _, y in expected)
+    assert any(isinstance(y.shape, Circle) for _, y in expected)
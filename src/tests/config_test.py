@@ -0,0 +1,25 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from config import PlaneConfig, ValidationError
+
+TEST_ASSETS_PATH = Path(__file__).parent / "assets"
+
+
+def write_plane_config(tmp_path, wing_profile):
+    data = json.load(open(TEST_ASSETS_PATH / "plane.json"))
+    data["wing_profile"] = wing_profile
+    path = tmp_path / "plane.json"
+    json.dump(data, open(path, "w"))
+    return path
+
+
+class TestPlaneConfig:
+    def test_wing_profile_with_different_lengths_fails_validation(self, tmp_path):
+        path = write_plane_config(tmp_path, {"angles_of_attack": [-90, 0, 90],
+                                             "lift_coefficients": [0, 1],
+                                             "drag_coefficients": [1, 0, 1]})
+        with pytest.raises(ValidationError):
+            PlaneConfig(path)
@@ -0,0 +1,9 @@
+import pytest
+import pygame
+
+
+@pytest.fixture
+def hidden_display():
+    """Initializes pygame with a hidden display for the tests drawing pixels"""
+    pygame.init()
+    pygame.display.set_mode((1, 1), flags=pygame.HIDDEN)
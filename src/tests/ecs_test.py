@@ -0,0 +1,114 @@
+from unittest.mock import Mock
+
+import pytest
+from pygame import Vector2
+
+from game.ecs import ComponentStore, World, TimerSystem, PhysicsSystem
+from game.ecs import dead_entities
+from game.shapes import Transform
+from utils.timing import Timer
+
+
+class TestComponentStore:
+    @pytest.fixture
+    def store(self):
+        store = ComponentStore()
+        for entity in range(4):
+            store.add(entity, f"c{entity}")
+        return store
+
+    def test_get_returns_added_component(self, store):
+        assert store.get(2) == "c2"
+        assert 2 in store
+        assert len(store) == 4
+
+    def test_get_returns_default_for_missing_entity(self, store):
+        assert store.get(10) is None
+        assert store.get(10, "x") == "x"
+
+    def test_add_replaces_component(self, store):
+        store.add(1, "new")
+        assert store.get(1) == "new"
+        assert len(store) == 4
+
+    def test_remove_moves_last_component(self, store):
+        store.remove(0)
+        assert 0 not in store
+        assert store.entities == [3, 1, 2]
+        assert store.components == ["c3", "c1", "c2"]
+        assert store.get(3) == "c3"
+
+    def test_remove_missing_entity_does_nothing(self, store):
+        store.remove(10)
+        assert len(store) == 4
+
+    def test_iter_returns_pairs(self, store):
+        assert list(store) == [(0, "c0"), (1, "c1"), (2, "c2"), (3, "c3")]
+
+
+class TestWorld:
+    @pytest.fixture
+    def world(self):
+        world = World()
+        world.add_entity(0, {"transform": "t0", "physics": "p0"})
+        world.add_entity(1, {"transform": "t1"})
+        world.add_entity(2, {"physics": "p2", "timer": "timer2"})
+        return world
+
+    def test_query_returns_entities_with_all_components(self, world):
+        assert list(world.query("transform", "physics")) == [(0, "t0", "p0")]
+
+    def test_query_returns_components_in_order_of_names(self, world):
+        assert list(world.query("physics", "transform")) == [(0, "p0", "t0")]
+
+    def test_remove_entity_removes_all_components(self, world):
+        world.remove_entity(0)
+        assert 0 not in world.store("transform")
+        assert 0 not in world.store("physics")
+        assert list(world.query("transform", "physics")) == []
+
+    def test_unknown_component_raises_value_error(self, world):
+        with pytest.raises(ValueError):
+            world.add_entity(3, {"velocity": Vector2(0, 0)})
+
+
+class TestSystems:
+    def test_timer_system_updates_timers(self):
+        world = World()
+        timer = Timer(1)
+        world.add_entity(0, {"timer": timer})
+        TimerSystem().update(world, 2)
+        assert timer.expired()
+
+    def test_physics_system_moves_transforms(self):
+        world = World()
+        physics = Mock()
+        physics.location = Vector2(0, 0)
+        physics.front = Vector2(0, 1)
+
+        def update(delta_time):
+            physics.location = Vector2(delta_time, 0)
+        physics.update.side_effect = update
+        transform = Transform()
+        world.add_entity(0, {"physics": physics, "transform": transform})
+        PhysicsSystem().update(world, 3)
+        assert transform.location == Vector2(3, 0)
+        assert transform.rotation == pytest.approx(-1.5707963)
+
+    def test_physics_system_skips_entities_without_transform(self):
+        world = World()
+        physics = Mock()
+        world.add_entity(0, {"physics": physics})
+        PhysicsSystem().update(world, 1)
+        physics.update.assert_not_called()
+
+    def test_dead_entities(self):
+        world = World()
+        alive = Mock()
+        alive.alive.return_value = True
+        dead = Mock()
+        dead.alive.return_value = False
+        world.add_entity(0, {"health": alive})
+        world.add_entity(1, {"health": dead})
+        world.add_entity(2, {"transform": Mock()})
+        assert dead_entities(world) == [1]
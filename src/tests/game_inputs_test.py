@@ -40,3 +40,11 @@ class TestGameInput(unittest.TestCase):
         self.event_handler.get_pressed.return_value[pygame.K_x] = True
         self.game_input.handle_inputs()
         x_mock.assert_called()
+
+    def test_handle_held_keys_calls_pressed_key_functions(self):
+        x_mock = Mock()
+        self.game_input.bind_key(pygame.K_x, x_mock)
+        self.event_handler.get_pressed.return_value[pygame.K_x] = True
+        self.game_input.handle_held_keys()
+        x_mock.assert_called_once()
+        self.event_handler.get_events.assert_not_called()
@@ -1,14 +1,19 @@
 from unittest.mock import Mock, ANY, create_autospec
 import unittest
+import pytest
 from pathlib import Path
 
 from pygame import Vector2
 
-from game.game_objects import Plane, Gun, Bullet, Ground, BulletFactory
+from game.game_objects import Plane, Gun, Ground
 from game.game_objects import damage_score_generator, PlaneFactory
-from game.shapes import Shape
-from graphics.graphics import Graphic
-from game.physics import PhysicsController
+from game.game_objects import collision_mask_from_names, GROUND_CATEGORY
+from game.game_objects import PLANE_CATEGORY, BULLET_CATEGORY, ALL_CATEGORIES
+from game.shapes import Shape, Circle
+from graphics.graphics import Graphic, ImageGraphic
+from game.projectiles import ProjectileSystem
+from game.physics import ControlledPhysics
+from game.ecs import World, TimerSystem, PhysicsSystem
 from game.game import Player
 from utils.timing import Timer
 
@@ -20,10 +25,23 @@ def test_damage_score_generator():
     generator = damage_score_generator(10, 100)
     assert generator(1, True) == 110
 
+def test_collision_mask_from_names():
+    assert collision_mask_from_names([]) == 0
+    assert collision_mask_from_names(["plane", "bullet"]) \
+        == PLANE_CATEGORY | BULLET_CATEGORY
+    assert collision_mask_from_names(["ground", "plane", "bullet"]) == ALL_CATEGORIES
+
+def test_collision_mask_from_names_fails_with_unknown_name():
+    with pytest.raises(ValueError) as e:
+        collision_mask_from_names(["cloud"])
+
+    assert "Unknown collision category 'cloud'" == str(e.value)
+
 class TestPlaneFactory(unittest.TestCase):
     def setUp(self):
         config_path = Path(__file__).parent / "./assets/plane.json"
-        self.factory = PlaneFactory(PlaneConfig(config_path))
+        self.factory = PlaneFactory(PlaneConfig(config_path),
+                                    create_autospec(ProjectileSystem))
 
     def test_plane_cost(self):
         assert self.factory.get_plane_cost() == 20
@@ -33,11 +51,16 @@ class TestPlaneFactory(unittest.TestCase):
         plane = self.factory.plane(Mock(), owner)
         assert plane.owner is owner
 
+    def test_plane_collision_category_and_mask(self):
+        plane = self.factory.plane(Mock(), create_autospec(Player))
+        assert plane.collision_category == PLANE_CATEGORY
+        assert plane.collision_mask == ALL_CATEGORIES
+
 class TestPlane(unittest.TestCase):
     def setUp(self):
-        self.shape = create_autospec(Shape)
+        self.shape = Circle(Vector2(0, 0), 1)
         self.graphic = create_autospec(Graphic)
-        self.plane_physics = create_autospec(PhysicsController)
+        self.plane_physics = create_autospec(ControlledPhysics)
         self.plane_physics.location = Vector2(1, 2)
         self.plane_physics.velocity = Vector2(1, 1)
         self.plane_physics.front = Vector2(0, 1)
@@ -48,7 +71,7 @@ class TestPlane(unittest.TestCase):
         self.plane = Plane(self.shape, self.graphic, self.plane_physics,
                            self.gun, self.score_generator, self.owner, health=100,
                            collision_damage = 100)
-        self.plane2_physics = create_autospec(PhysicsController)
+        self.plane2_physics = create_autospec(ControlledPhysics)
         self.plane2_physics.location = Vector2(1, 2)
         self.plane2_physics.velocity = Vector2(1, 1)
         self.plane2_physics.front = Vector2(0, 1)
@@ -56,12 +79,16 @@ class TestPlane(unittest.TestCase):
         self.plane2 = Plane(Mock(), Mock(), self.plane2_physics,
                             Mock(), self.score_generator2, Mock(), health = 100, collision_damage = 10)
 
+    def test_graphic_and_shape_share_transform(self):
+        assert self.plane.transform is self.shape.transform
+        assert self.graphic.transform is self.shape.transform
+
     def test_constructor_updates_locations_to_physics_location(self):
-        assert self.plane.graphic.location == Vector2(1, 2)
+        assert self.plane.transform.location == Vector2(1, 2)
         assert self.plane.shape.location == Vector2(1, 2)
 
     def test_constructor_updates_rotations_to_physics_rotation(self):
-        self.assertAlmostEqual(self.plane.graphic.rotation, -pi/2)
+        self.assertAlmostEqual(self.plane.transform.rotation, -pi/2)
         self.assertAlmostEqual(self.plane.shape.rotation, -pi/2)
 
     def test_shoot_calls_gun_with_correct_arguments(self):
@@ -74,6 +101,12 @@ class TestPlane(unittest.TestCase):
         new_objects = self.plane.new_objects()
         assert self.gun.shoot.return_value[0] in new_objects
 
+    def test_destroyed_plane_does_not_shoot(self):
+        self.plane.health = 0
+        self.plane.shoot()
+        self.gun.shoot.assert_not_called()
+        assert len(self.plane.new_objects()) == 0
+
     def test_alive_when_no_health(self):
         self.plane.health = 1
         assert self.plane.alive()
@@ -109,63 +142,83 @@ class TestPlane(unittest.TestCase):
         self.plane.collide(self.plane2)
         assert self.plane.health == 90
 
-    def test_update_updates_gun_and_physics_if_alive(self):
-        self.plane.update(10)
-        self.gun.update.assert_called_with(10)
-        self.plane_physics.update.assert_called_with(10)
+    def update_with_systems(self, delta_time):
+        world = World()
+        world.add_entity(0, self.plane.components())
+        for system in (TimerSystem(), PhysicsSystem()):
+            system.update(world, delta_time)
 
-    def test_update_does_not_update_gun_and_physics_if_dead(self):
-        self.plane.health = 0
-        self.plane.update(10)
-        self.gun.update.assert_not_called()
-        self.plane_physics.update.assert_not_called()
+    def test_systems_update_gun_timer_and_physics(self):
+        self.update_with_systems(10)
+        self.gun.timer.update.assert_called_with(10)
+        self.plane_physics.update.assert_called_with(10)
 
-    def test_update_updates_locations(self):
+    def test_physics_system_updates_locations(self):
         def f(x):
             self.plane_physics.location = Vector2(1, 20)
         self.plane_physics.update.side_effect = f
-        self.plane.update(10)
+        self.update_with_systems(10)
+        assert self.plane.transform.location == Vector2(1, 20)
         assert self.plane.shape.location == Vector2(1, 20)
-        assert self.plane.graphic.location == Vector2(1, 20)
 
-    def test_new_objects_contain_plane_when_alive(self):
-        assert self.plane in self.plane.new_objects()
+    def test_new_objects_do_not_contain_plane(self):
+        assert self.plane not in self.plane.new_objects()
+
+    def test_new_objects_are_returned_once(self):
+        self.plane.shoot()
+        self.plane.new_objects()
+        assert len(self.plane.new_objects()) == 0
 
-    def test_new_objects_do_not_contain_plane_when_dead(self):
+    def test_dead_after_collision_with_self(self):
         self.plane.collide(self.plane)
-        assert self.plane not in self.plane.new_objects()
+        assert not self.plane.alive()
+
+    def test_plane_is_not_static(self):
+        assert not self.plane.static
+
+    def test_components(self):
+        components = self.plane.components()
+        assert components["transform"] is self.plane.transform
+        assert components["physics"] is self.plane_physics
+        assert components["timer"] is self.gun.timer
+        assert components["collider"] is self.plane
+        assert components["health"] is self.plane
+        assert components["graphic"] is self.graphic
+        assert components["owner"] is self.owner
+        assert components["spawner"] is self.plane
 
 class TestBullet(unittest.TestCase):
     def setUp(self):
-        self.shape = create_autospec(Shape)
-        self.graphic = create_autospec(Graphic)
-        self.physics = create_autospec(PhysicsController)
-        self.physics.location = Vector2(1, 2)
-        self.physics.velocity = Vector2(1, 1)
-        self.physics.front = Vector2(0, 1)
-        self.gun = create_autospec(Gun)
-        self.gun.shoot.return_value = [Mock()]
-        self.score_generator = Mock()
+        self.image_graphic = create_autospec(ImageGraphic)
+        self.image_graphic.copy.side_effect = lambda: create_autospec(Graphic)
+        bullet_config = Mock(diameter=1, gravity=0, body_drag=0, health=100,
+                             collision_damage=100, timeout=5,
+                             collision_mask=ALL_CATEGORIES, pool_size=0)
+        self.projectile_system = ProjectileSystem(self.image_graphic, bullet_config)
         self.owner = create_autospec(Player)
-        self.timer = create_autospec(Timer)
-        self.timer.expired.return_value = False
-        self.bullet = Bullet(self.shape, self.graphic, self.physics,
-                             self.owner,self.timer,
-                             health=100, collision_damage = 100)
-
-        self.bullet2 = Bullet(Mock(), Mock(), self.physics,
-                              Mock(), Mock(),
-                              health=100, collision_damage = 10)
+        self.bullet = self.projectile_system.bullet(
+            Vector2(1, 2), Vector2(1, 1), Vector2(0, 1), self.owner)
+        self.bullet2 = self.projectile_system.bullet(
+            Vector2(1, 2), Vector2(1, 1), Vector2(0, 1), Mock())
+        self.bullet2.collision_damage = 10
 
+    def test_graphic_and_shape_share_transform(self):
+        assert self.bullet.graphic.transform is self.bullet.shape.transform
 
     def test_constructor_updates_locations_to_physics_location(self):
-        assert self.bullet.graphic.location == Vector2(1, 2)
+        assert self.bullet.transform.location == Vector2(1, 2)
         assert self.bullet.shape.location == Vector2(1, 2)
 
     def test_constructor_updates_rotations_to_physics_rotation(self):
-        self.assertAlmostEqual(self.bullet.graphic.rotation, -pi/2)
+        self.assertAlmostEqual(self.bullet.transform.rotation, -pi/2)
         self.assertAlmostEqual(self.bullet.shape.rotation, -pi/2)
 
+    def test_owner_set_correctly(self):
+        assert self.bullet.owner is self.owner
+
+    def test_collision_category(self):
+        assert self.bullet.collision_category == BULLET_CATEGORY
+
     def test_alive_when_no_health(self):
         self.bullet.health = 1
         assert self.bullet.alive()
@@ -181,36 +234,33 @@ class TestBullet(unittest.TestCase):
         self.bullet.collide(self.bullet2)
         assert self.bullet2.health == 100
 
-    def test_update_updates_timer_and_physics_if_alive(self):
-        self.bullet.update(10)
-        self.physics.update.assert_called_with(10)
-        self.timer.update.assert_called_with(10)
-
-    def test_update_does_not_update_physics_if_dead(self):
-        self.bullet.health = 0
-        self.bullet.update(10)
-        self.physics.update.assert_not_called()
-        self.timer.update.assert_not_called()
-
     def test_update_updates_locations(self):
-        def f(x):
-            self.physics.location = Vector2(1, 20)
-        self.physics.update.side_effect = f
-        self.bullet.update(10)
-        assert self.bullet.shape.location == Vector2(1, 20)
-        assert self.bullet.graphic.location == Vector2(1, 20)
+        self.projectile_system.update(10)
+        assert self.bullet.shape.location == Vector2(11, 12)
 
     def test_update_kills_bullet_after_time_limit(self):
-        self.timer.expired.return_value = True
-        self.bullet.update(10)
+        self.projectile_system.update(10)
         assert not self.bullet.alive()
 
-    def test_new_objects_contain_bullet_when_alive(self):
-        assert self.bullet in self.bullet.new_objects()
+    def test_new_objects_is_empty(self):
+        assert len(self.bullet.new_objects()) == 0
 
-    def test_new_objects_do_not_contain_bullet_when_dead(self):
+    def test_dead_after_collision_with_self(self):
         self.bullet.collide(self.bullet)
-        assert self.bullet not in self.bullet.new_objects()
+        assert not self.bullet.alive()
+
+    def test_components_do_not_include_physics(self):
+        components = self.bullet.components()
+        assert "physics" not in components
+        assert "spawner" not in components
+        assert components["health"] is self.bullet
+        assert components["transform"] is self.bullet.transform
+
+    def test_removed_bullet_stays_dead(self):
+        self.bullet.health = 0
+        self.projectile_system.update(1)
+        assert not self.bullet.alive()
+        assert self.bullet.owner is None
 
 class TestGround(unittest.TestCase):
     def setUp(self):
@@ -225,16 +275,34 @@ class TestGround(unittest.TestCase):
         assert self.ground.owner is self.owner
         assert self.ground.collision_damage == 123
 
-    def test_new_objects_contain_self(self):
-        assert self.ground in self.ground.new_objects()
+    def test_new_objects_is_empty(self):
+        assert len(self.ground.new_objects()) == 0
+
+    def test_always_alive(self):
+        self.ground.collide(self.ground)
+        assert self.ground.alive()
+
+    def test_ground_does_not_collide_with_ground_by_default(self):
+        assert self.ground.collision_category == GROUND_CATEGORY
+        assert self.ground.collision_mask & GROUND_CATEGORY == 0
+
+    def test_ground_is_static(self):
+        assert self.ground.static
+
+    def test_components_do_not_include_health_or_physics(self):
+        components = self.ground.components()
+        assert "health" not in components
+        assert "physics" not in components
+        assert components["collider"] is self.ground
+        assert components["graphic"] is self.graphic
 
 class TestGun(unittest.TestCase):
     def setUp(self):
-        self.bullet_factory = create_autospec(BulletFactory)
-        self.bullet_factory.bullet.return_value = Mock()
+        self.projectile_system = create_autospec(ProjectileSystem)
+        self.projectile_system.bullet.return_value = Mock()
         self.timer = create_autospec(Timer)
         self.timer.expired.return_value = True
-        self.gun = Gun(self.bullet_factory, self.timer, 1, 10)
+        self.gun = Gun(self.projectile_system, self.timer, 1, 10)
         self.owner = create_autospec(Player)
 
     def test_update_updates_timer(self):
@@ -252,11 +320,11 @@ class TestGun(unittest.TestCase):
     def test_shoot_return_new_bullet(self):
         result = self.gun.shoot(Vector2(1, 2), Vector2(2, 3), Vector2(1, 0), self.owner)
         assert len(result) == 1
-        assert result[0] == self.bullet_factory.bullet.return_value
+        assert result[0] == self.projectile_system.bullet.return_value
 
-    def test_shoot_calls_bullet_factory_correctly(self):
+    def test_shoot_calls_projectile_system_correctly(self):
         self.gun.shoot(Vector2(1, 2), Vector2(2, 3), Vector2(1, 0), self.owner)
-        self.bullet_factory.bullet.assert_called_with(
+        self.projectile_system.bullet.assert_called_with(
             Vector2(1, 2) + Vector2(1, 0),
             Vector2(2, 3) + Vector2(1, 0) * 10,
             Vector2(1, 0),
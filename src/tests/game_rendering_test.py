@@ -0,0 +1,133 @@
+from unittest.mock import Mock, create_autospec
+
+import pytest
+import pygame
+from pygame import Vector2
+
+from graphics.camera import Camera
+from graphics.drawing_surface import DrawingSurface
+from graphics.game_rendering import GameBackground, GameView
+from game.shapes import BoundingBox, Rectangle
+from graphics.graphics import Graphic, ImageGraphic
+from graphics.image import Image
+
+from tests.rendering_helpers import RED, BLACK, camera
+
+pytestmark = pytest.mark.usefixtures("hidden_display")
+
+
+def square_graphic(surface):
+    half = surface.get_width() / 2
+    rectangle = Rectangle(Vector2(-half, -half), Vector2(half, -half),
+                          Vector2(-half, half))
+    return ImageGraphic(rectangle, Image.from_surface(surface), rotates=False)
+
+
+def red_square(size=10):
+    surface = pygame.Surface((size, size))
+    surface.fill(RED)
+    return square_graphic(surface)
+
+
+def translucent_white_square(size=10):
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    surface.fill((255, 255, 255, 128))
+    return square_graphic(surface)
+
+
+class TestGameBackground:
+    def test_pattern_repeats(self):
+        background = GameBackground(red_square(), 5, Vector2(150, 120), BLACK)
+        first_camera, first = camera(location=(0, 0))
+        background.render(first_camera)
+        second_camera, second = camera(location=(150 * 3, -120 * 2))
+        background.render(second_camera)
+        assert any(first.get_at((x, y)) == RED
+                   for x in range(200) for y in range(100))
+        for x in range(200):
+            for y in range(100):
+                assert first.get_at((x, y)) == second.get_at((x, y))
+
+    def test_graphics_on_tile_edges_are_wrapped(self):
+        graphic = red_square()
+        background = GameBackground(graphic, 0, Vector2(100, 100), BLACK)
+        background._graphic_locations = [Vector2(0, 0)]
+        target_camera, surface = camera(view_height=100, size=(100, 100),
+                                        location=(50, 50))
+        background.render(target_camera)
+        for corner in [(0, 0), (99, 0), (0, 99), (99, 99)]:
+            assert surface.get_at(corner) == RED
+
+    def test_translucent_pixels_are_not_blended_with_colorkey(self):
+        background = GameBackground(translucent_white_square(), 0,
+                                    Vector2(100, 100), BLACK)
+        background._graphic_locations = [Vector2(50, 50)]
+        target_camera, surface = camera(view_height=100, size=(100, 100),
+                                        location=(50, 50))
+        background.render(target_camera)
+        assert surface.get_at((50, 50))[0] > 0
+        # white blended with black is gray
+        for x in range(100):
+            for y in range(100):
+                red, green, blue, _ = surface.get_at((x, y))
+                assert red == green == blue
+
+    def test_at_most_four_tiles_are_drawn(self):
+        background = GameBackground(red_square(), 5, Vector2(300, 200), BLACK)
+        target_camera = Mock()
+        target_camera.pixels_per_unit.return_value = 1
+        target_camera.visible_area.return_value = \
+            camera(location=(290, 190))[0].visible_area()
+        background.render(target_camera)
+        assert target_camera.draw_surface.call_count == 4
+
+    def test_tile_is_rendered_once_per_scale(self):
+        graphic = create_autospec(Graphic)
+        background = GameBackground(graphic, 2, Vector2(300, 200), BLACK)
+        for _ in range(3):
+            background.render(camera()[0])
+        n_draws = graphic.draw.call_count
+        assert n_draws > 0
+        background.render(camera(view_height=50)[0])
+        assert graphic.draw.call_count == 2 * n_draws
+
+
+def game_object(left, top, right, bottom):
+    result = Mock()
+    result.graphic = create_autospec(Graphic)
+    result.graphic.bounding_box.return_value = BoundingBox(left, top, right, bottom)
+    return result
+
+
+class TestGameView:
+    @pytest.fixture
+    def camera_mock(self):
+        result = create_autospec(Camera)
+        result.visible_area.return_value = BoundingBox(0, 0, 100, 50)
+        return result
+
+    def render(self, game_view, game_objects):
+        surface = create_autospec(DrawingSurface)
+        surface.get_rect.return_value = pygame.Rect(0, 0, 100, 50)
+        game_view.render(surface, game_objects, Mock())
+
+    def test_objects_outside_the_view_are_culled(self, camera_mock):
+        inside = game_object(10, 10, 20, 20)
+        partially_inside = game_object(-5, 45, 5, 55)
+        outside = game_object(101, 0, 110, 10)
+        game_view = GameView(Mock(), camera_mock, BLACK)
+        self.render(game_view, [inside, partially_inside, outside])
+        inside.graphic.draw.assert_called_once_with(camera_mock)
+        partially_inside.graphic.draw.assert_called_once_with(camera_mock)
+        outside.graphic.draw.assert_not_called()
+
+    def test_render_stats_count_drawn_and_culled(self, camera_mock):
+        game_objects = [game_object(10, 10, 20, 20), game_object(0, -20, 10, -10),
+                        game_object(200, 10, 210, 20)]
+        game_view = GameView(Mock(), camera_mock, BLACK)
+        self.render(game_view, game_objects)
+        assert game_view.render_stats.drawn == 1
+        assert game_view.render_stats.culled == 2
+        self.render(game_view, game_objects[:1])
+        assert game_view.render_stats.drawn == 1
+        assert game_view.render_stats.culled == 0
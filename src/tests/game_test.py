@@ -4,9 +4,15 @@ import unittest
 from pygame import Vector2
 
 from game.game import GameState, Player, Game, GameNotification, GameOrganizer
+from game.collisions import CollisionStats
+from game.shapes import Circle, Polyline
+from game.game_objects import GROUND_CATEGORY, PLANE_CATEGORY, ALL_CATEGORIES
 from utils.timing import Timer, Clock
 
 from game.inputs import GameInput
+from game.physics import ControlledPhysics
+from config import GameInputConfig
+from events import EventHandler
 from graphics.game_rendering import GameRenderer
 
 from game.game_stats import PlayerRecorder, ResultsViewer
@@ -143,7 +149,17 @@ class TestGameState:
     def game_object_mock(self):
         mock = Mock()
         mock.new_objects.side_effect = lambda: []
+        mock.alive.return_value = True
         mock.shape.intersects.return_value = True
+        mock.collision_category = PLANE_CATEGORY
+        mock.collision_mask = ALL_CATEGORIES
+        mock.static = False
+        mock.physics.location = Vector2(0, 0)
+        mock.physics.front = Vector2(1, 0)
+        mock.components.side_effect = lambda: {
+            "transform": mock.transform, "physics": mock.physics,
+            "collider": mock, "health": mock, "graphic": mock.graphic,
+            "spawner": mock}
         return mock
 
     def player_mock(self):
@@ -157,12 +173,52 @@ class TestGameState:
                          [self.player_mock(), self.player_mock()],
                          "level1", Timer(10))
 
+    def replace_objects(self, game_state, new_objects):
+        """Makes the first object spawn `new_objects` and all of the
+        present objects die on the next tick"""
+        game_state.game_objects[0].new_objects.side_effect = lambda: new_objects
+        for game_object in game_state.game_objects:
+            game_object.alive.return_value = False
+
     def test_run_tick_updates_newly_created_objects(self, game_state):
-        newly_created = Mock()
+        newly_created = self.game_object_mock()
         game_state.game_objects[0].new_objects.side_effect = lambda: [
             newly_created]
         game_state.run_tick(1)
-        newly_created.update.assert_called_with(ANY)
+        newly_created.physics.update.assert_called_with(ANY)
+
+    def test_run_tick_removes_dead_objects(self, game_state):
+        dead = game_state.game_objects[0]
+        alive = game_state.game_objects[1]
+        dead.alive.return_value = False
+        game_state.run_tick(1)
+        assert game_state.game_objects == [alive]
+        dead.physics.update.assert_not_called()
+
+    def test_run_tick_spawns_player_objects(self, game_state):
+        plane = self.game_object_mock()
+        game_state.players[0].new_objects.side_effect = lambda: [plane]
+        game_state.run_tick(1)
+        assert plane in game_state.game_objects
+        plane.physics.update.assert_called_once_with(1)
+
+    def test_registry_sends_spawn_and_death_events(self, game_state):
+        spawned = []
+        died = []
+        game_state.registry.bind_spawn(lambda i, x: spawned.append(x))
+        game_state.registry.bind_death(lambda i, x: died.append(x))
+        bullet = self.game_object_mock()
+        game_state.game_objects[0].new_objects.side_effect = lambda: [bullet]
+        game_state.game_objects[1].alive.return_value = False
+        dead = game_state.game_objects[1]
+        game_state.run_tick(1)
+        assert bullet in spawned
+        assert died == [dead]
+
+    def test_run_tick_stores_previous_transforms(self, game_state):
+        game_state.run_tick(1)
+        for game_object in game_state.game_objects:
+            game_object.transform.store_previous.assert_called_once()
 
     def test_game_over_returns_false_if_timer_not_expired(self, game_state):
         assert not game_state.game_over()
@@ -191,13 +247,105 @@ class TestGameState:
         new_objects[0].shape.intersects.side_effect = i0
         new_objects[1].shape.intersects.side_effect = i1
         new_objects[2].shape.intersects.side_effect = i2
-        game_state.game_objects[0].new_objects.side_effect = lambda : new_objects
+        self.replace_objects(game_state, new_objects)
 
         game_state.run_tick(5)
         new_objects[0].collide.assert_called_once_with(new_objects[1])
         new_objects[1].collide.assert_called_once_with(new_objects[0])
         new_objects[2].collide.assert_not_called()
 
+    def test_collision_stats_count_tested_and_hit_pairs(self, game_state):
+        new_objects = [self.game_object_mock(), self.game_object_mock(),
+                       self.game_object_mock()]
+        new_objects[0].shape.intersects.return_value = False
+        for game_object in new_objects[1:]:
+            game_object.shape.intersects.side_effect = \
+                lambda x: x is not new_objects[0].shape
+        self.replace_objects(game_state, new_objects)
+        game_state.run_tick(1)
+        assert game_state.collision_stats.pairs_tested == 3
+        assert game_state.collision_stats.pairs_hit == 1
+
+    def test_circle_and_polyline_collide(self):
+        circle = self.game_object_mock()
+        circle.shape = Circle(Vector2(0, 0.5), 1)
+        ground = self.game_object_mock()
+        ground.shape = Polyline.from_points([Vector2(-1, 0), Vector2(1, 0)])
+        far_ground = self.game_object_mock()
+        far_ground.shape = Polyline.from_points([Vector2(-1, 5), Vector2(1, 5)])
+        objects = [circle, ground, far_ground]
+        game_state = GameState(objects, [], "level1", Timer(10))
+        game_state.run_tick(1)
+        circle.collide.assert_called_once_with(ground)
+        ground.collide.assert_called_once_with(circle)
+        far_ground.collide.assert_not_called()
+        assert game_state.collision_stats.pairs_hit == 1
+
+    def test_collision_masks_exclude_pairs(self, game_state):
+        new_objects = [self.game_object_mock(), self.game_object_mock(),
+                       self.game_object_mock()]
+        new_objects[0].collision_category = GROUND_CATEGORY
+        new_objects[0].collision_mask = PLANE_CATEGORY
+        new_objects[1].collision_category = GROUND_CATEGORY
+        new_objects[1].collision_mask = PLANE_CATEGORY
+        self.replace_objects(game_state, new_objects)
+        game_state.run_tick(1)
+        new_objects[0].collide.assert_called_once_with(new_objects[2])
+        new_objects[1].collide.assert_called_once_with(new_objects[2])
+        assert game_state.collision_stats.pairs_tested == 2
+
+    def test_static_objects_are_not_updated_or_registered(self):
+        ground = self.game_object_mock()
+        ground.static = True
+        game_state = GameState([ground, self.game_object_mock()], [],
+                               "level1", Timer(10))
+        game_state.run_tick(1)
+        assert game_state.static_objects == [ground]
+        assert ground not in game_state.game_objects
+        ground.physics.update.assert_not_called()
+        ground.new_objects.assert_not_called()
+        ground.transform.store_previous.assert_not_called()
+
+    def test_static_objects_collide_only_with_dynamic_objects(self):
+        circle = self.game_object_mock()
+        circle.shape = Circle(Vector2(0, 0.5), 1)
+        grounds = [self.game_object_mock(), self.game_object_mock()]
+        grounds[0].shape = Polyline.from_points([Vector2(-1, 0), Vector2(1, 0)])
+        grounds[1].shape = Polyline.from_points([Vector2(0, -1), Vector2(0, 1)])
+        for ground in grounds:
+            ground.static = True
+        game_state = GameState(grounds + [circle], [], "level1", Timer(10))
+        game_state.run_tick(1)
+        assert game_state.collision_stats.pairs_tested == 2
+        grounds[0].collide.assert_called_once_with(circle)
+        grounds[1].collide.assert_called_once_with(circle)
+
+    def test_static_collisions_are_handled_first(self):
+        ground = self.game_object_mock()
+        ground.shape = Polyline.from_points([Vector2(-1, 0), Vector2(1, 0)])
+        ground.static = True
+        plane = self.game_object_mock()
+        plane.shape = Circle(Vector2(0, 0.5), 1)
+        bullet = self.game_object_mock()
+        bullet.shape = Circle(Vector2(0, 1), 0.1)
+        collided = []
+        plane.collide.side_effect = collided.append
+        game_state = GameState([plane, bullet, ground], [], "level1", Timer(10))
+        game_state.run_tick(1)
+        assert collided == [ground, bullet]
+
+    def test_broad_phase_selects_tested_pairs(self):
+        objects = [self.game_object_mock(), self.game_object_mock(),
+                   self.game_object_mock()]
+        broad_phase = Mock()
+        broad_phase.candidate_pairs.side_effect = lambda x: [(x[0], x[2])]
+        game_state = GameState(objects, [], "level1", Timer(10), broad_phase)
+        game_state.run_tick(1)
+        objects[0].collide.assert_called_once_with(objects[2])
+        objects[1].collide.assert_not_called()
+        assert game_state.collision_stats.pairs_tested == 1
+        assert game_state.collision_stats.pairs_hit == 1
+
 
 
 class TestGame(unittest.TestCase):
@@ -211,7 +359,9 @@ class TestGame(unittest.TestCase):
         self.game_state.game_over.side_effect = [False, True]
         self.game_input.should_quit = False
         self.clock.delta_time = 2
+        self.clock.frame_time.return_value = 2
         self.clock.busy_fraction.return_value = 0.1
+        self.game_state.collision_stats = CollisionStats()
 
     def test_game_over_quits_game(self):
         self.game_state.game_over.side_effect = [False, False, True]
@@ -249,6 +399,57 @@ class TestGame(unittest.TestCase):
         self.game_input.handle_pause_inputs.assert_called()
         self.game_renderer.render_pause.assert_called()
 
+    def test_late_frame_runs_extra_ticks(self):
+        self.game_state.game_over.side_effect = lambda: \
+            self.game_renderer.render.call_count >= 2
+        self.clock.frame_time.return_value = 5
+        self.game.run()
+        # 1 tick on the first frame and 2 on the second
+        assert self.game_state.run_tick.call_count == 3
+        self.game_renderer.render.assert_called_with(self.game_state, 0.5)
+
+    def test_held_keys_are_applied_to_every_tick_of_a_frame(self):
+        event_handler = create_autospec(EventHandler)
+        event_handler.get_events.return_value = []
+        event_handler.get_pressed.return_value = {1: True}
+        game_input = GameInput(event_handler, GameInputConfig(2, 3))
+        physics = ControlledPhysics(Vector2(0), Vector2(0), Vector2(1, 0),
+                                    0, 0.1, [])
+        game_input.bind_key(1, physics.up)
+        rotations = []
+        def run_tick(delta_time):
+            front = Vector2(physics.front)
+            physics.update(delta_time)
+            rotations.append(front.angle_to(physics.front))
+        self.game_state.run_tick.side_effect = run_tick
+        self.game_state.game_over.side_effect = lambda: \
+            self.game_renderer.render.call_count >= 2
+        self.clock.frame_time.return_value = 5
+        self.game = Game(game_input, self.game_state, self.game_renderer,
+                         self.clock)
+        self.game.run()
+        # 1 tick on the first frame and 2 on the second from one input poll
+        assert event_handler.get_events.call_count == 2
+        assert len(rotations) == 3
+        for rotation in rotations:
+            assert rotation == pytest.approx(-11.459, abs=0.01)
+
+    def test_ticks_per_frame_are_limited(self):
+        self.game = Game(self.game_input, self.game_state, self.game_renderer,
+                         self.clock, max_ticks_per_frame=3)
+        self.game_state.game_over.side_effect = lambda: \
+            self.game_renderer.render.call_count >= 2
+        self.clock.frame_time.return_value = 100
+        self.game.run()
+        assert self.game_state.run_tick.call_count == 4
+        self.game_renderer.render.assert_called_with(self.game_state, 0.0)
+
+    def test_catch_up_stops_at_game_over(self):
+        self.game_state.game_over.side_effect = [False, True, True]
+        self.clock.frame_time.return_value = 6
+        self.game.run()
+        assert self.game_state.run_tick.call_count == 2
+
     def test_get_player_recorders(self):
         player_1 = Mock()
         player_1.player_recorder = PlayerRecorder(player_1, Timer(1))
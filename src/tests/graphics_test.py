@@ -6,7 +6,7 @@ import pygame
 from pygame import Rect, Vector2
 
 from graphics.graphics import ImageGraphic, PolylineGraphic
-from graphics.image import Image
+from graphics.image import Image, ImageCache, SpriteCache
 from game.shapes import Rectangle, Polyline
 
 from graphics.screen import Screen
@@ -55,6 +55,11 @@ class TestPolylineGraphics:
         polyline_graphic.rotation = 1.2
         assert polyline_graphic.rotation == 1.2
 
+    def test_bounding_box_includes_line_width(self, polyline_graphic):
+        polyline_graphic.location = Vector2(1, 0)
+        box = polyline_graphic.bounding_box()
+        assert (box.left, box.top, box.right, box.bottom) == (0, -1, 7, 5)
+
     def test_location_and_draw(self, polyline_graphic, camera_stub):
         polyline_graphic.location = Vector2(1, 2)
         polyline_graphic.draw(camera_stub)
@@ -107,6 +112,20 @@ class TestImageGraphics:
         image_graphic.draw(camera_stub)
         camera_stub.draw_image.assert_called_with(ANY, Vector2(1.5, 1), 0, 2)
 
+    def test_non_rotating_graphic_is_drawn_unrotated(self, image, camera_stub):
+        rectangle = Rectangle(Vector2(0, 0), Vector2(3, 0), Vector2(0, 2))
+        image_graphic = ImageGraphic(rectangle, image, rotates=False)
+        image_graphic.rotation = 1.0
+        image_graphic.copy().draw(camera_stub)
+        camera_stub.draw_image.assert_called_with(ANY, ANY, 0, ANY)
+
+    def test_copy_shares_image_but_not_transform(self, image_graphic, camera_stub):
+        image_graphic.location = Vector2(1, 1)
+        copy = image_graphic.copy()
+        assert copy.transform is not image_graphic.transform
+        copy.draw(camera_stub)
+        camera_stub.draw_image.assert_called_with(image_graphic._image, Vector2(1.5, 1), 0, 2)
+
     def test_location_sets_location(self, image_graphic):
         image_graphic.location = Vector2(13, 37)
         assert image_graphic.location == Vector2(13, 37)
@@ -133,3 +152,106 @@ class TestImageGraphics:
         print(image_graphic.location, image_graphic._rectangle.center())
         image_graphic.draw(camera_stub)
         camera_stub.draw_image.assert_called_with(ANY, Vector2(1, 1.5), math.pi/2, ANY)
+
+    def test_bounding_box_follows_rotation(self, image_graphic):
+        image_graphic.rotation = math.pi / 2
+        box = image_graphic.bounding_box()
+        assert box.right - box.left == pytest.approx(2)
+        assert box.bottom - box.top == pytest.approx(3)
+
+    def test_non_rotating_bounding_box_is_unrotated(self, image):
+        rectangle = Rectangle(Vector2(0, 0), Vector2(3, 0), Vector2(0, 2))
+        image_graphic = ImageGraphic(rectangle, image, rotates=False)
+        image_graphic.rotation = math.pi / 2
+        box = image_graphic.bounding_box()
+        assert box.right - box.left == pytest.approx(3)
+        assert box.bottom - box.top == pytest.approx(2)
+
+
+class TestImageCache:
+    @pytest.fixture
+    def image_path(self, image):
+        return Path(__file__).parent / "assets/test_image_1.png"
+
+    def test_image_is_decoded_once_per_size(self, image_path, monkeypatch):
+        load = Mock(side_effect=pygame.image.load)
+        monkeypatch.setattr(pygame.image, "load", load)
+        cache = ImageCache()
+        image_1 = cache.image(image_path, 10, 10)
+        image_2 = cache.image(image_path, 10, 10)
+        assert load.call_count == 1
+        assert image_1 is not image_2
+        assert image_1.image is image_2.image
+        cache.image(image_path, 20, 10)
+        assert load.call_count == 2
+        assert len(cache) == 2
+
+    def test_image_has_aspect_ratio(self, image_path):
+        image = ImageCache().image(image_path, 20, 10)
+        assert image.get_width_pixels() == 2 * image.get_height_pixels()
+
+    def test_preload_and_evict(self, image_path):
+        cache = ImageCache()
+        cache.preload(image_path, 10, 10)
+        cache.preload(image_path, 20, 10)
+        assert len(cache) == 2
+        cache.evict(image_path)
+        assert len(cache) == 0
+
+    def test_from_image_path_uses_cache(self, image_path, camera_stub):
+        cache = ImageCache()
+        graphic_1 = ImageGraphic.from_image_path(image_path, Vector2(0), Vector2(3, 2),
+                                                 cache)
+        graphic_2 = ImageGraphic.from_image_path(image_path, Vector2(0), Vector2(3, 2),
+                                                 cache)
+        assert len(cache) == 1
+        graphic_1.draw(camera_stub)
+        graphic_2.draw(camera_stub)
+        images = [x[0][0] for x in camera_stub.draw_image.call_args_list]
+        assert images[0].image is images[1].image
+
+
+class TestSpriteCache:
+    def test_close_rotations_share_sprite(self, image):
+        cache = SpriteCache(angle_step=2)
+        sprite = cache.sprite(image, math.radians(10.2), 20)
+        assert cache.sprite(image, math.radians(9.5), 20.3) is sprite
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_different_rotations_and_heights_get_own_sprites(self, image):
+        cache = SpriteCache(angle_step=2)
+        sprite = cache.sprite(image, 0, 20)
+        assert cache.sprite(image, math.radians(4), 20) is not sprite
+        assert cache.sprite(image, 0, 30) is not sprite
+        assert len(cache) == 3
+
+    def test_full_turn_is_same_as_no_rotation(self, image):
+        cache = SpriteCache(angle_step=2)
+        assert cache.sprite(image, 2 * math.pi, 20) is cache.sprite(image, 0, 20)
+
+    def test_sprite_has_requested_height(self, image):
+        sprite = SpriteCache().sprite(image, 0, 20)
+        assert sprite.get_height() == 20
+        assert sprite.get_width() == 30
+
+    def test_images_sharing_surface_share_sprites(self, image):
+        cache = SpriteCache()
+        other = Image.from_surface(image.image)
+        assert cache.sprite(image, 0, 20) is cache.sprite(other, 0, 20)
+
+    def test_least_recently_used_sprite_is_evicted(self, image):
+        # the sprites take 1600-2400 bytes so only two fit
+        cache = SpriteCache(max_bytes=5000)
+        first = cache.sprite(image, 0, 20)
+        cache.sprite(image, math.pi, 20)
+        cache.sprite(image, 0, 20)
+        cache.sprite(image, math.pi / 2, 20)
+        assert len(cache) == 2
+        assert cache.n_bytes() <= 5000
+        assert cache.sprite(image, 0, 20) is first
+        assert cache.misses == 3
+
+    def test_non_positive_angle_step_raises_value_error(self):
+        with pytest.raises(ValueError):
+            SpriteCache(angle_step=0)
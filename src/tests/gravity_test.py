@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from pygame import Vector2
+
+from game.gravity import UniformGravity, GridGravity
+
+
+class TestUniformGravity:
+    def test_at_returns_the_same_vector_everywhere(self):
+        gravity = UniformGravity(Vector2(0, 400))
+        assert gravity.at(Vector2(10, -30)) == Vector2(0, 400)
+        assert gravity.at(Vector2(0, 0)) is gravity.at(Vector2(1e6, 5))
+
+    def test_at_array_broadcasts(self):
+        gravity = UniformGravity(Vector2(1, 2))
+        locations = np.zeros((3, 2))
+        assert (locations + gravity.at_array(locations) == [[1, 2]] * 3).all()
+
+    def test_scaled(self):
+        assert UniformGravity(Vector2(0, 1)).scaled(400).at(Vector2(0)) == Vector2(0, 400)
+
+
+class TestGridGravity:
+    @pytest.fixture
+    def gravity(self):
+        return GridGravity(Vector2(-10, 0), 10,
+                           [[Vector2(0, 1), Vector2(0, 2)],
+                            [Vector2(1, 0), Vector2(2, 0)]])
+
+    def test_at_returns_the_cell_value(self, gravity):
+        assert gravity.at(Vector2(-5, 5)) == Vector2(0, 1)
+        assert gravity.at(Vector2(5, 5)) == Vector2(0, 2)
+        assert gravity.at(Vector2(-5, 15)) == Vector2(1, 0)
+        assert gravity.at(Vector2(0, 10)) == Vector2(2, 0)
+
+    def test_at_uses_closest_cell_outside_grid(self, gravity):
+        assert gravity.at(Vector2(-100, -100)) == Vector2(0, 1)
+        assert gravity.at(Vector2(100, 100)) == Vector2(2, 0)
+
+    def test_at_returns_shared_vectors(self, gravity):
+        assert gravity.at(Vector2(-5, 5)) is gravity.at(Vector2(-1, 1))
+
+    def test_at_array_matches_at(self, gravity):
+        locations = np.array([[-5, 5], [5, 5], [-5, 15], [100, 100], [-100, 0]])
+        result = gravity.at_array(locations)
+        for location, value in zip(locations, result):
+            assert gravity.at(Vector2(*location)) == Vector2(*value)
+
+    def test_scaled(self, gravity):
+        assert gravity.scaled(2).at(Vector2(5, 5)) == Vector2(0, 4)
+
+    def test_uneven_rows_fail(self):
+        with pytest.raises(ValueError):
+            GridGravity(Vector2(0), 1, [[Vector2(0)], [Vector2(0), Vector2(0)]])
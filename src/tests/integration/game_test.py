@@ -258,7 +258,8 @@ class TestGameIntegration:
         game = factory.game()
         game.run()
 
-        assert len(game.game_state.game_objects) == 2
+        assert len(game.game_state.game_objects) == 0
+        assert len(game.game_state.static_objects) == 2
 
     def test_planes_can_respawn(self, game_factory_factory):
         keys = []
@@ -4,6 +4,10 @@ from pygame import Vector2
 import math
 
 from game.physics import BasePhysics, BodyPhysics, angle_between, WingPhysics, PhysicsController
+from game.physics import ForcePhysics, ControlledPhysics, BodyForce, WingForce
+from game.physics import SemiImplicitEuler, VelocityVerlet, RungeKutta4
+from game.physics import create_integrator, WingProfile, _symmetric_lift_coefficient
+import pytest
 from constants import EPS
 
 class TestBasePhysics(unittest.TestCase):
@@ -134,3 +138,192 @@ class TestAngleBetween(unittest.TestCase):
     def test_large_angles(self):
         assert (angle_between(Vector2(1, 0), Vector2(-1, -1)) - (math.pi*3/4)) < EPS
         assert (angle_between(Vector2(1, 0), Vector2(-1, 1)) - (-math.pi*3/4)) < EPS
+
+
+def gravity_callback(position):
+    return Vector2(0, 1) * 400
+
+class TestForcePhysics(unittest.TestCase):
+    def test_without_force_generators_moves_like_base_physics(self):
+        physics = ForcePhysics(Vector2(0), Vector2(1, 0), Vector2(1, 0), [])
+        physics.acceleration = Vector2(1, 0)
+        physics.update(0.5)
+        assert physics.location == Vector2(0.5, 0)
+        assert physics.velocity == Vector2(1.5, 0)
+        assert physics.acceleration == Vector2(0)
+
+    def test_body_force_matches_body_physics(self):
+        physics = ForcePhysics(Vector2(0), Vector2(3, -2), Vector2(1, 0),
+                               [BodyForce(0.5, gravity_callback)])
+        decorated = BodyPhysics(BasePhysics(Vector2(0), Vector2(3, -2), Vector2(1, 0)),
+                                0.5, gravity_callback)
+        for _ in range(10):
+            physics.update(0.01)
+            decorated.update(0.01)
+        assert physics.location == decorated.location
+        assert physics.velocity == decorated.velocity
+
+    def test_wing_force_matches_wing_physics(self):
+        front = Vector2(1, -1) / math.sqrt(2)
+        physics = ForcePhysics(Vector2(0), Vector2(2, 0), front, [WingForce(1)])
+        decorated = WingPhysics(BasePhysics(Vector2(0), Vector2(2, 0), front), 1)
+        physics.update(2)
+        decorated.update(2)
+        physics.update(2)
+        decorated.update(2)
+        assert physics.location == decorated.location
+        assert abs(physics.location[1] + 16) < EPS
+
+
+class TestControlledPhysics(unittest.TestCase):
+    def test_identical_trajectory_to_decorator_chain(self):
+        physics = ControlledPhysics(
+            Vector2(10, 20), Vector2(0), Vector2(1, 0), 500, 2.5,
+            [WingForce(0.002), BodyForce(0.0001, gravity_callback)])
+        tmp = BasePhysics(Vector2(10, 20), Vector2(0), Vector2(1, 0))
+        tmp = BodyPhysics(tmp, 0.0001, gravity_callback)
+        tmp = WingPhysics(tmp, 0.002)
+        decorated = PhysicsController(tmp, 500, 2.5)
+        for i in range(500):
+            for controlled in (physics, decorated):
+                controlled.accelerate()
+                if i % 70 < 30:
+                    controlled.up()
+                elif i % 70 > 50:
+                    controlled.down()
+                controlled.update(1 / 60)
+            assert physics.location == decorated.location
+            assert physics.velocity == decorated.velocity
+            assert physics.front == decorated.front
+
+    def test_up(self):
+        physics = ControlledPhysics(Vector2(0), Vector2(0), Vector2(1, 0), 2, math.pi, [])
+        physics.up()
+        physics.update(0.5)
+        assert (physics.front - Vector2(0, -1)).magnitude() < EPS
+
+    def test_controls_are_reset_after_update(self):
+        physics = ControlledPhysics(Vector2(0), Vector2(0), Vector2(1, 0), 2, math.pi, [])
+        physics.accelerate()
+        physics.down()
+        physics.update(0.5)
+        physics.update(0.5)
+        assert (physics.front - Vector2(0, 1)).magnitude() < EPS
+        assert (physics.velocity - Vector2(0, 1)).magnitude() < EPS
+
+
+def glide(integrator_name, delta_time, duration=2):
+    physics = ForcePhysics(Vector2(0), Vector2(600, 0), Vector2(1, -0.2),
+                           [WingForce(0.004),
+                            BodyForce(0.00025, gravity_callback)],
+                           create_integrator(integrator_name))
+    for _ in range(round(duration / delta_time)):
+        physics.update(delta_time)
+    return physics.location
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return glide("runge_kutta_4", 1 / 4000)
+
+
+class TestIntegrators:
+
+    def test_semi_implicit_euler_uses_new_velocity(self):
+        physics = BasePhysics(Vector2(0), Vector2(1, 0), Vector2(1, 0),
+                              SemiImplicitEuler())
+        physics.acceleration = Vector2(1, 0)
+        physics.update(0.5)
+        assert physics.location == Vector2(0.75, 0)
+        assert physics.velocity == Vector2(1.5, 0)
+
+    def test_higher_order_integrators_are_exact_with_constant_acceleration(self):
+        for integrator in (VelocityVerlet(), RungeKutta4()):
+            physics = BasePhysics(Vector2(0), Vector2(1, 0), Vector2(1, 0),
+                                  integrator)
+            physics.acceleration = Vector2(0, 2)
+            physics.update(0.5)
+            assert physics.location == Vector2(0.5, 0.25)
+            assert physics.velocity == Vector2(1, 1)
+
+    @pytest.mark.parametrize("name, min_error_ratio", [
+        ("explicit_euler", 1.8),
+        ("semi_implicit_euler", 1.8),
+        ("velocity_verlet", 2.5),
+        ("runge_kutta_4", 12),
+    ])
+    def test_error_shrinks_with_the_order_of_the_integrator(
+            self, reference, name, min_error_ratio):
+        error_30 = (glide(name, 1 / 30) - reference).magnitude()
+        error_60 = (glide(name, 1 / 60) - reference).magnitude()
+        assert error_30 / error_60 > min_error_ratio
+
+    def test_higher_order_integrators_are_accurate_at_30_hz(self, reference):
+        assert (glide("velocity_verlet", 1 / 30) - reference).magnitude() < 0.1
+        assert (glide("runge_kutta_4", 1 / 30) - reference).magnitude() < 0.01
+
+    def test_controls_are_applied_once_per_update(self):
+        physics = ControlledPhysics(Vector2(0), Vector2(0), Vector2(1, 0), 2,
+                                    math.pi, [], RungeKutta4())
+        physics.accelerate()
+        physics.up()
+        physics.update(0.5)
+        assert (physics.front - Vector2(0, -1)).magnitude() < EPS
+        assert (physics.velocity - Vector2(0, -1)).magnitude() < EPS
+
+    def test_create_integrator_fails_with_unknown_name(self):
+        with pytest.raises(ValueError):
+            create_integrator("leapfrog")
+
+
+class TestWingProfile:
+    def test_symmetric_matches_the_analytic_curves(self):
+        profile = WingProfile.symmetric()
+        # the lift jumps at the stall angles
+        stall_angles = [math.pi / 9, -math.pi / 9,
+                        math.pi - math.pi / 9, -math.pi + math.pi / 9]
+        for i in range(-1000, 1001):
+            angle = i / 1000 * math.pi
+            if min(abs(angle - x) for x in stall_angles) < 2 * math.pi / 720:
+                continue
+            lift, drag = profile.coefficients(angle)
+            assert abs(lift - _symmetric_lift_coefficient(angle)) < 1e-4
+            assert abs(drag - (1 - math.cos(2 * angle))) < 1e-4
+
+    def test_angle_of_attack_matches_angle_between(self):
+        angles = [i / 100 * math.pi for i in range(-100, 100)]
+        profile = WingProfile(angles, [math.sin(x) for x in angles],
+                              [0] * len(angles))
+        front = Vector2(1, 2).normalize()
+        for i in range(36):
+            velocity = Vector2(3, 0).rotate(i * 10 + 5)
+            lift = math.sin(angle_between(velocity, front))
+            expected = lift * velocity.magnitude() * velocity.rotate_rad(-math.pi / 2)
+            assert (profile.acceleration(velocity, front, 1) - expected).magnitude() < 0.01
+
+    def test_sampled_curves_are_interpolated(self):
+        profile = WingProfile.from_config({"angles_of_attack": [-90, 0, 90],
+                                           "lift_coefficients": [0, 1, 0],
+                                           "drag_coefficients": [2, 0, 2]})
+        lift, drag = profile.coefficients(math.radians(45))
+        assert abs(lift - 0.5) < EPS
+        assert abs(drag - 1) < EPS
+
+    def test_sampled_curves_are_periodic(self):
+        profile = WingProfile.from_config({"angles_of_attack": [-90, 90],
+                                           "lift_coefficients": [1, 3],
+                                           "drag_coefficients": [0, 0]})
+        assert abs(profile.coefficients(math.pi)[0] - 2) < EPS
+        assert abs(profile.coefficients(-math.pi)[0] - 2) < EPS
+        assert abs(profile.coefficients(-3 * math.pi / 4)[0] - 1.5) < EPS
+
+    def test_mismatched_curves_fail(self):
+        with pytest.raises(ValueError):
+            WingProfile([0, 1], [0], [0, 1])
+
+    def test_wing_force_uses_profile(self):
+        profile = WingProfile([0], [0], [1])
+        physics = ForcePhysics(Vector2(0), Vector2(2, 0), Vector2(1, 0),
+                               [WingForce(1, profile)])
+        physics.update(0.1)
+        assert (physics.velocity - Vector2(2 - 0.4, 0)).magnitude() < EPS
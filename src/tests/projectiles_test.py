@@ -0,0 +1,162 @@
+from unittest.mock import Mock, create_autospec
+
+from pygame import Vector2
+
+from game.projectiles import ProjectileSystem
+from game.physics import BasePhysics, BodyPhysics
+from graphics.graphics import Graphic, ImageGraphic
+from game.game_objects import ALL_CATEGORIES
+from game.gravity import GridGravity
+
+
+def projectile_system(gravity=400, body_drag=0.001, timeout=5, capacity=64,
+                      gravity_field=None, pool_size=0):
+    image_graphic = create_autospec(ImageGraphic)
+    image_graphic.copy.side_effect = lambda: create_autospec(Graphic)
+    bullet_config = Mock(diameter=10, gravity=gravity, body_drag=body_drag,
+                         health=1, collision_damage=100, timeout=timeout,
+                         collision_mask=ALL_CATEGORIES, pool_size=pool_size)
+    return ProjectileSystem(image_graphic, bullet_config,
+                            gravity_field=gravity_field, capacity=capacity)
+
+
+def reference_physics(location, velocity, front, gravity, body_drag):
+    def gravity_callback(position):
+        return Vector2(0, 1) * gravity
+    return BodyPhysics(BasePhysics(Vector2(location), Vector2(velocity), front),
+                       body_drag, gravity_callback)
+
+
+class TestProjectileSystem:
+    def test_bullet_adds_bullet(self):
+        system = projectile_system()
+        bullet = system.bullet(Vector2(1, 2), Vector2(3, 4), Vector2(1, 0), Mock())
+        assert len(system) == 1
+        assert bullet.alive()
+        assert bullet.shape.location == Vector2(1, 2)
+        assert bullet.graphic.transform is bullet.shape.transform
+
+    def test_update_matches_body_physics(self):
+        system = projectile_system()
+        starts = [(Vector2(0, 0), Vector2(1000, 0)),
+                  (Vector2(10, -5), Vector2(-300, -200)),
+                  (Vector2(3, 3), Vector2(0, 0))]
+        bullets = []
+        references = []
+        for location, velocity in starts:
+            bullets.append(system.bullet(location, velocity, Vector2(1, 0), Mock()))
+            references.append(reference_physics(location, velocity, Vector2(1, 0),
+                                                400, 0.001))
+        for _ in range(20):
+            system.update(0.05)
+            for bullet, reference in zip(bullets, references):
+                reference.update(0.05)
+                assert (bullet.shape.location - reference.location).magnitude() < 1e-6
+
+    def test_update_uses_gravity_field(self):
+        field = GridGravity(Vector2(0, 0), 10, [[Vector2(0, 1), Vector2(-1, 0)]])
+        system = projectile_system(gravity=2, body_drag=0, gravity_field=field)
+        left = system.bullet(Vector2(5, 5), Vector2(0, 0), Vector2(1, 0), Mock())
+        right = system.bullet(Vector2(15, 5), Vector2(0, 0), Vector2(1, 0), Mock())
+        system.update(1)
+        system.update(1)
+        assert left.shape.location == Vector2(5, 7)
+        assert right.shape.location == Vector2(13, 5)
+
+    def test_bullets_die_after_timeout(self):
+        system = projectile_system(timeout=1)
+        bullet = system.bullet(Vector2(0, 0), Vector2(0, 0), Vector2(1, 0), Mock())
+        system.update(0.6)
+        assert bullet.alive()
+        system.update(0.6)
+        assert not bullet.alive()
+
+    def test_dead_bullets_are_removed_on_next_update(self):
+        system = projectile_system(gravity=0, body_drag=0)
+        bullets = [system.bullet(Vector2(i, 0), Vector2(0, i), Vector2(1, 0), Mock())
+                   for i in range(4)]
+        bullets[1].health = 0
+        bullets[2].health = 0
+        system.update(1)
+        assert len(system) == 2
+        assert not bullets[1].alive()
+        assert not bullets[2].alive()
+        assert bullets[0].shape.location == Vector2(0, 0)
+        assert bullets[3].shape.location == Vector2(3, 3)
+        bullets[3].health = 0
+        assert bullets[0].alive()
+
+    def test_arrays_grow_when_full(self):
+        system = projectile_system(gravity=0, body_drag=0, capacity=2)
+        owners = [Mock() for _ in range(5)]
+        bullets = [system.bullet(Vector2(i, 0), Vector2(1, 0), Vector2(1, 0),
+                                 owners[i]) for i in range(5)]
+        system.update(1)
+        assert len(system) == 5
+        for i, bullet in enumerate(bullets):
+            assert bullet.shape.location == Vector2(i + 1, 0)
+            assert bullet.owner is owners[i]
+
+    def test_set_owner(self):
+        system = projectile_system()
+        bullet = system.bullet(Vector2(0, 0), Vector2(0, 0), Vector2(1, 0), Mock())
+        owner = Mock()
+        bullet.owner = owner
+        assert bullet.owner is owner
+
+    def test_bullets_share_owners(self):
+        system = projectile_system()
+        owner = Mock()
+        bullets = [system.bullet(Vector2(0, 0), Vector2(0, 0), Vector2(1, 0), owner)
+                   for _ in range(3)]
+        assert all(x.owner is owner for x in bullets)
+        assert len(system._owners) == 1
+
+
+class TestBulletPool:
+    def test_removed_views_are_reused(self):
+        system = projectile_system(gravity=0, body_drag=0)
+        old = system.bullet(Vector2(0, 0), Vector2(1, 0), Vector2(1, 0), Mock())
+        old.health = 0
+        system.update(1)
+        owner = Mock()
+        new = system.bullet(Vector2(5, 5), Vector2(0, 1), Vector2(0, 1), owner)
+        assert new is old
+        assert new.alive()
+        assert new.owner is owner
+        assert new.shape.location == Vector2(5, 5)
+        system.update(1)
+        assert new.shape.location == Vector2(5, 6)
+
+    def test_reused_view_is_not_interpolated_from_old_location(self):
+        system = projectile_system(gravity=0, body_drag=0)
+        old = system.bullet(Vector2(0, 0), Vector2(0, 0), Vector2(1, 0), Mock())
+        old.transform.store_previous()
+        old.health = 0
+        system.update(1)
+        new = system.bullet(Vector2(100, 0), Vector2(0, 0), Vector2(1, 0), Mock())
+        new.transform.interpolate(0.5)
+        assert new.shape.location == Vector2(100, 0)
+
+    def test_writes_to_dead_views_are_ignored(self):
+        system = projectile_system()
+        bullet = system.bullet(Vector2(0, 0), Vector2(0, 0), Vector2(1, 0), Mock())
+        bullet.health = 0
+        system.update(1)
+        bullet.health = 5
+        bullet.owner = Mock()
+        assert not bullet.alive()
+        assert bullet.owner is None
+
+    def test_stats(self):
+        system = projectile_system(pool_size=1)
+        bullets = [system.bullet(Vector2(0, 0), Vector2(0, 0), Vector2(1, 0), Mock())
+                   for _ in range(3)]
+        for bullet in bullets:
+            bullet.health = 0
+        system.update(1)
+        system.bullet(Vector2(0, 0), Vector2(0, 0), Vector2(1, 0), Mock())
+        assert system.pool_stats.hits == 2
+        assert system.pool_stats.misses == 2
+        assert system.pool_stats.high_water_mark == 3
+        assert system.pool_stats.hit_fraction() == 0.5
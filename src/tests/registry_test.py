@@ -0,0 +1,70 @@
+from unittest.mock import Mock
+
+import pytest
+
+from game.registry import GameObjectRegistry
+
+
+def game_object():
+    return Mock()
+
+
+class TestGameObjectRegistry:
+    @pytest.fixture
+    def objects(self):
+        return [game_object() for _ in range(4)]
+
+    @pytest.fixture
+    def registry(self, objects):
+        registry = GameObjectRegistry()
+        for x in objects:
+            registry.spawn(x)
+        return registry
+
+    def test_spawned_objects_are_present(self, registry, objects):
+        assert registry.objects == objects
+        assert len(registry) == 4
+        assert list(registry) == objects
+
+    def test_spawn_returns_new_ids(self, registry):
+        first = registry.spawn(game_object())
+        second = registry.spawn(game_object())
+        assert first != second
+        assert first in registry
+
+    def test_get_returns_spawned_object(self, registry):
+        new_object = game_object()
+        object_id = registry.spawn(new_object)
+        assert registry.get(object_id) is new_object
+
+    def test_despawn_moves_last_object(self, registry, objects):
+        object_id = registry.spawn(game_object())
+        last = registry.get(object_id)
+        registry.despawn(0)
+        assert registry.objects == [last] + objects[1:]
+        assert 0 not in registry
+        assert registry.get(object_id) is last
+        assert registry.get(3) is objects[3]
+
+    def test_ids_stay_valid_after_many_despawns(self, registry, objects):
+        registry.despawn(1)
+        registry.despawn(0)
+        registry.despawn(3)
+        assert registry.objects == [objects[2]]
+        assert registry.get(2) is objects[2]
+
+    def test_ids_are_not_reused(self, registry):
+        registry.despawn(3)
+        assert registry.spawn(game_object()) == 4
+
+    def test_events(self, registry, objects):
+        spawned = []
+        died = []
+        registry.bind_spawn(lambda i, x: spawned.append((i, x)))
+        registry.bind_death(lambda i, x: died.append((i, x)))
+        new_object = game_object()
+        object_id = registry.spawn(new_object)
+        registry.despawn(1)
+        registry.despawn(object_id)
+        assert spawned == [(object_id, new_object)]
+        assert died == [(1, objects[1]), (object_id, new_object)]
@@ -0,0 +1,21 @@
+"""Helpers for the tests comparing the drawn pixels."""
+from unittest.mock import Mock
+
+import pygame
+from pygame import Vector2
+
+from graphics.camera import Camera
+from graphics.drawing_surface import DrawingSurface
+
+RED = (255, 0, 0)
+BLACK = (0, 0, 0)
+
+
+def camera(view_height=100, size=(200, 100), location=(0, 0)):
+    """Returns a Camera drawing to a new black surface and the surface"""
+    surface = pygame.Surface(size)
+    surface.fill(BLACK)
+    result = Camera(view_height)
+    result.set_drawing_surface(DrawingSurface(surface, Mock(), Vector2(0, 0)))
+    result.location = Vector2(location)
+    return result, surface
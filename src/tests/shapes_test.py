@@ -1,9 +1,12 @@
 import math
 
+from unittest.mock import Mock, patch
+
 import pytest
 from pygame import Vector2
 
-from game.shapes import Circle, Line, Rectangle, Polyline
+from game.shapes import Circle, Line, Rectangle, Polyline, BoundingBox
+from game.shapes import register_intersection, Transform
 from constants import EPS
 
 
@@ -23,6 +26,37 @@ def polyline_eq(p1, p2):
     return all([line_eq(x, y) for x, y in zip(p1.lines, p2.lines)])
 
 
+def box_eq(b1, b2):
+    return abs(b1.left - b2.left) < EPS and abs(b1.top - b2.top) < EPS \
+        and abs(b1.right - b2.right) < EPS and abs(b1.bottom - b2.bottom) < EPS
+
+
+class TestBoundingBox:
+    def test_from_points(self):
+        box = BoundingBox.from_points([Vector2(1, 5), Vector2(-2, 3), Vector2(0, 7)])
+        assert box_eq(box, BoundingBox(-2, 3, 1, 7))
+
+    def test_empty_box_is_empty(self):
+        assert BoundingBox.empty().is_empty()
+        assert not BoundingBox(0, 0, 0, 0).is_empty()
+
+    def test_empty_box_does_not_overlap(self):
+        assert not BoundingBox.empty().overlaps(BoundingBox(0, 0, 1, 1))
+        assert not BoundingBox(0, 0, 1, 1).overlaps(BoundingBox.empty())
+
+    def test_union(self):
+        box = BoundingBox(0, 0, 1, 1).union(BoundingBox(2, -1, 3, 0.5))
+        assert box_eq(box, BoundingBox(0, -1, 3, 1))
+
+    def test_overlaps(self):
+        assert BoundingBox(0, 0, 2, 2).overlaps(BoundingBox(1, 1, 3, 3))
+        assert BoundingBox(0, 0, 2, 2).overlaps(BoundingBox(2, 2, 3, 3))
+        assert not BoundingBox(0, 0, 2, 2).overlaps(BoundingBox(2.5, 0, 3, 3))
+
+    def test_overlaps_with_margin(self):
+        assert BoundingBox(0, 0, 2, 2).overlaps(BoundingBox(2.5, 0, 3, 3), 1)
+
+
 class TestCircle:
     @pytest.fixture
     def circle1(self):
@@ -60,6 +94,31 @@ class TestCircle:
         circle1.rotation = math.pi / 2
         assert vec_eq(circle1.center, Vector2(2 + 1, -1 + 3))
 
+    def test_bounding_box(self, circle1):
+        circle1.location = Vector2(1, 3)
+        assert box_eq(circle1.bounding_box(), BoundingBox(-1, 2, 5, 8))
+
+    def test_bounding_box_is_cached(self, circle1):
+        assert circle1.bounding_box() is circle1.bounding_box()
+
+    def test_center_is_computed_lazily_and_cached(self, circle1):
+        circle1.location = Vector2(1, 3)
+        circle1.rotation = math.pi / 2
+        assert circle1._center is None
+        assert circle1.center is circle1.center
+
+    def test_constructor_copies_center(self):
+        center = Vector2(1, 2)
+        circle = Circle(center, 1)
+        circle.location = Vector2(1, 1)
+        circle.center
+        assert center == Vector2(1, 2)
+
+    def test_bounding_box_recomputed_after_rotation(self, circle1):
+        circle1.bounding_box()
+        circle1.rotation = math.pi / 2
+        assert box_eq(circle1.bounding_box(), BoundingBox(-1, -4, 5, 2))
+
     def test_repr(self, circle1):
         assert "Circle(center = [1, 2], radius = 3, location = [0, 0], rotation = 0.0)" \
             == repr(circle1)
@@ -141,11 +200,71 @@ class TestLine:
         assert pytest.approx(line_45_degrees.distance_to(
             point), EPS) == math.sqrt(2)
 
+    def test_bounding_box(self, line1):
+        line1.location = Vector2(1, 3)
+        assert box_eq(line1.bounding_box(), BoundingBox(2, 4, 4, 5))
+
     def test_repr(self, line1):
         assert "Line(begin = [1, 2], end = [3, 1], location = [0, 0], rotation = 0.0)" \
             == repr(line1)
 
 
+class TestTransform:
+    def test_shared_transform_moves_all_shapes(self):
+        circle = Circle(Vector2(1, 0), 1)
+        rect = Rectangle(Vector2(0, 0), Vector2(2, 0), Vector2(0, 1))
+        rect.transform = circle.transform
+        circle.bounding_box()
+        rect.bounding_box()
+        circle.transform.set(Vector2(1, 3), math.pi / 2)
+        assert vec_eq(circle.center, Vector2(1, 2))
+        assert rect.location == Vector2(1, 3)
+        assert rect_eq(rect, Rectangle(Vector2(1, 3), Vector2(0 + 1, -2 + 3),
+                                       Vector2(1 + 1, 0 + 3)))
+
+    def test_setting_transform_uses_its_location(self):
+        transform = Transform()
+        transform.location = Vector2(1, 3)
+        circle = Circle(Vector2(1, 2), 3)
+        circle.center
+        circle.transform = transform
+        assert vec_eq(circle.center, Vector2(2, 5))
+
+    def test_replaced_transform_no_longer_moves_shape(self):
+        circle = Circle(Vector2(1, 2), 3)
+        old_transform = circle.transform
+        circle.transform = Transform()
+        old_transform.location = Vector2(10, 10)
+        assert vec_eq(circle.center, Vector2(1, 2))
+
+    def test_interpolate_moves_between_previous_and_current(self):
+        circle = Circle(Vector2(1, 0), 1)
+        circle.transform.store_previous()
+        circle.transform.set(Vector2(4, 2), math.pi / 2)
+        assert circle.transform.interpolate(0.5)
+        assert vec_eq(circle.location, Vector2(2, 1))
+        assert abs(circle.rotation - math.pi / 4) < 1e-9
+        assert vec_eq(circle.center, Vector2(2, 1) + Vector2(1, 0).rotate_rad(-math.pi / 4))
+        circle.transform.restore()
+        assert vec_eq(circle.center, Vector2(4, 1))
+
+    def test_interpolate_rotates_along_shorter_arc(self):
+        transform = Transform()
+        transform.rotation = 3
+        transform.store_previous()
+        transform.rotation = -3
+        transform.interpolate(0.5)
+        assert abs(abs(transform.rotation) - math.pi) < 1e-9
+
+    def test_interpolate_does_nothing_without_change(self):
+        transform = Transform()
+        assert not transform.interpolate(0.5)
+        transform.location = Vector2(1, 1)
+        transform.store_previous()
+        assert not transform.interpolate(0.5)
+        assert transform.location == Vector2(1, 1)
+
+
 class TestRectangle:
     @pytest.fixture
     def rect1(self):
@@ -193,6 +312,37 @@ class TestRectangle:
         assert rect_eq(rect1, Rectangle(Vector2(1, 3), Vector2(0 + 1, -2 + 3),
                                         Vector2(1 + 1, 0 + 3)))
 
+    def test_repeated_rotations_do_not_accumulate_errors(self, rect1):
+        for i in range(1000):
+            rect1.location = Vector2(i, 2 * i)
+            rect1.rotation = i * 0.1
+        rect1.location = Vector2(1, 3)
+        rect1.rotation = math.pi / 2
+        assert rect_eq(rect1, Rectangle(Vector2(1, 3), Vector2(0 + 1, -2 + 3),
+                                        Vector2(1 + 1, 0 + 3)))
+
+    def test_sides_are_built_only_when_needed(self, rect1):
+        rect1.location = Vector2(1, 3)
+        rect1.rotation = math.pi / 2
+        rect1.bounding_box()
+        assert rect1._sides is None
+        assert rect1.sides is rect1.sides
+
+    def test_copy_has_local_geometry_and_own_transform(self, rect1):
+        rect1.location = Vector2(1, 3)
+        copy = rect1.copy()
+        assert copy.transform is not rect1.transform
+        assert rect_eq(copy, Rectangle(Vector2(0, 0), Vector2(2, 0), Vector2(0, 1)))
+
+    def test_size_does_not_depend_on_rotation(self, rect1):
+        rect1.rotation = 0.3
+        assert vec_eq(rect1.size(), Vector2(2, 1))
+
+    def test_bounding_box_follows_rotation(self, rect1):
+        rect1.bounding_box()
+        rect1.rotation = math.pi / 2
+        assert box_eq(rect1.bounding_box(), BoundingBox(0, -2, 1, 0))
+
     def test_repr(self, rect1):
         assert "Rectangle(topleft = [0, 0], topright = [2, 0], bottomleft = [0, 1], location = [0, 0], rotation = 0.0)" \
             == repr(rect1)
@@ -244,6 +394,17 @@ class TestPolyline:
         assert polyline_eq(polyline1, Polyline([Line(Vector2(0+1, 0+3), Vector2(0+1, -2+3)),
                                                 Line(Vector2(1+1, 0+3), Vector2(2+1, -2+3))]))
 
+    def test_bounding_box(self, polyline1):
+        assert box_eq(polyline1.bounding_box(), BoundingBox(0, 0, 2, 2))
+
+    def test_bounding_box_recomputed_after_location_change(self, polyline1):
+        polyline1.bounding_box()
+        polyline1.location = Vector2(1, 3)
+        assert box_eq(polyline1.bounding_box(), BoundingBox(1, 3, 3, 5))
+
+    def test_bounding_box_without_lines_is_empty(self):
+        assert Polyline([]).bounding_box().is_empty()
+
     def test_repr(self, polyline1):
         assert """Polyline([
 [[0, 0], [2, 0]],
@@ -300,6 +461,44 @@ class TestCollisions:
         assert line1.intersects(line2)
         assert line2.intersects(line1)
 
+    def test_distant_collinear_lines_do_not_intersect(self):
+        line1 = Line(Vector2(0, 0), Vector2(1, 0))
+        line2 = Line(Vector2(100, 0), Vector2(101, 0))
+        assert not line1.intersects(line2)
+        assert not line2.intersects(line1)
+
+    def test_distant_shapes_are_rejected_before_exact_test(self):
+        rect = Rectangle(Vector2(0, 0), Vector2(1, 0), Vector2(0, 1))
+        line = Line(Vector2(1000, 1000), Vector2(1001, 1000))
+        with patch.object(Rectangle, "_contains") as contains:
+            assert not rect.intersects(line)
+            assert not line.intersects(rect)
+        contains.assert_not_called()
+
+    def test_unknown_shape_pair_raises_type_error(self, unit_circle):
+        class Triangle(Circle):
+            pass
+
+        triangle = Triangle(Vector2(0, 0), 1)
+        with pytest.raises(TypeError) as e:
+            unit_circle.intersects(triangle)
+
+        assert "No intersection test between 'Circle' and 'Triangle'" == str(e.value)
+
+    def test_registered_test_is_used_in_both_orders(self, unit_circle):
+        class Point(Circle):
+            pass
+
+        test = Mock(return_value=True)
+        register_intersection(Point, Circle, test)
+        point = Point(Vector2(0, 0), 0)
+        assert point.intersects(unit_circle)
+        assert unit_circle.intersects(point)
+        assert test.call_count == 2
+        for call in test.call_args_list:
+            assert call.args[0] is point
+            assert call.args[1] is unit_circle
+
     def test_rectangle_circle_no_intersection(self, unit_circle):
         rect = Rectangle(Vector2(1.1, 0), Vector2(2, 0), Vector2(1.1, 1))
         assert not unit_circle.intersects(rect)
@@ -0,0 +1,112 @@
+from unittest.mock import Mock, create_autospec
+
+import pytest
+from pygame import Vector2
+
+from game.shapes import Circle, Polyline
+from graphics.graphics import Graphic, PolylineGraphic
+from graphics.static_layer import StaticLayer
+
+from tests.rendering_helpers import RED, camera
+
+pytestmark = pytest.mark.usefixtures("hidden_display")
+
+
+def ground(points, width=3):
+    game_object = Mock()
+    game_object.shape = Polyline.from_points([Vector2(x) for x in points])
+    game_object.graphic = PolylineGraphic(game_object.shape, RED, width)
+    return game_object
+
+
+def counted_ground(points):
+    game_object = Mock()
+    game_object.shape = Polyline.from_points([Vector2(x) for x in points])
+    game_object.graphic = create_autospec(Graphic)
+    game_object.graphic.bounding_box.return_value = game_object.shape.bounding_box()
+    return game_object
+
+
+def assert_draws_same_pixels_as_graphics(grounds, **camera_arguments):
+    direct_camera, direct = camera(**camera_arguments)
+    for game_object in grounds:
+        game_object.graphic.draw(direct_camera)
+    layer_camera, layered = camera(**camera_arguments)
+    StaticLayer(grounds, tile_size=16).draw(layer_camera)
+
+    width, height = direct.get_size()
+    n_different = 0
+    for x in range(width):
+        for y in range(height):
+            if direct.get_at((x, y)) != layered.get_at((x, y)):
+                n_different += 1
+    # the rounding can move the line edges by a pixel
+    assert n_different < 30
+    return direct
+
+
+class TestStaticLayer:
+    def test_draws_same_pixels_as_graphics(self):
+        grounds = [ground([(-50, 10), (0, 30), (40, 30)]),
+                   ground([(-20, -40), (-20, 0)])]
+        direct = assert_draws_same_pixels_as_graphics(grounds)
+        assert direct.get_at((100, 80)) == RED
+
+    def test_wide_lines_are_not_clipped(self):
+        # the edges of the line are on tiles far from the line itself
+        grounds = [ground([(-10, 0), (10, 0)], width=60)]
+        direct = assert_draws_same_pixels_as_graphics(grounds)
+        assert direct.get_at((100, 25)) == RED
+
+    def test_only_visible_tiles_are_rendered(self):
+        game_object = counted_ground([(0, 0), (1000, 0)])
+        layer = StaticLayer([game_object], tile_size=100)
+        # 1 pixel per unit and the view is 200 units wide
+        layer.draw(camera(location=(500, 0))[0])
+        assert 0 < game_object.graphic.draw.call_count <= 3 * 2
+
+    def test_tiles_are_rendered_once_per_scale(self):
+        game_object = counted_ground([(0, 0), (10, 0)])
+        layer = StaticLayer([game_object], tile_size=64)
+        for _ in range(3):
+            layer.draw(camera()[0])
+        n_tiles = game_object.graphic.draw.call_count
+        assert n_tiles > 0
+        layer.draw(camera(view_height=50)[0])
+        assert game_object.graphic.draw.call_count > n_tiles
+
+    def test_tiles_without_graphics_are_not_drawn(self):
+        # a square border with an empty interior
+        game_object = counted_ground([(-1000, -1000), (1000, -1000), (1000, 1000),
+                                      (-1000, 1000), (-1000, -1000)])
+        layer = StaticLayer([game_object], tile_size=64)
+        target_camera = Mock()
+        target_camera.pixels_per_unit.return_value = 1
+        target_camera.visible_area.return_value = \
+            camera(location=(0, 0))[0].visible_area()
+        layer.draw(target_camera)
+        game_object.graphic.draw.assert_not_called()
+        target_camera.draw_surface.assert_not_called()
+        assert len(layer) > 0
+
+    def test_least_recently_used_tiles_are_evicted(self):
+        game_object = counted_ground([(0, 0), (10, 0)])
+        layer = StaticLayer([game_object], tile_size=64, max_tiles=2)
+        for view_height in [100, 50, 25, 100]:
+            layer.draw(camera(view_height=view_height)[0])
+        assert len(layer) == 2
+
+    def test_empty_layer_draws_nothing(self):
+        layer = StaticLayer([])
+        camera_mock = Mock()
+        layer.draw(camera_mock)
+        camera_mock.draw_surface.assert_not_called()
+
+    def test_shapes_are_covered_by_bounding_box(self):
+        game_object = Mock()
+        game_object.shape = Circle(Vector2(5, 5), 2)
+        game_object.graphic = create_autospec(Graphic)
+        game_object.graphic.bounding_box.return_value = Circle(Vector2(5, 5), 2).bounding_box()
+        layer = StaticLayer([game_object], tile_size=64)
+        layer.draw(camera()[0])
+        game_object.graphic.draw.assert_called_once()
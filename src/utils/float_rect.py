@@ -1,5 +1,6 @@
 class FloatRect:
     """Similar class to pygame.Rect but with floats"""
+    __slots__ = ('_x', '_y', '_width', '_height')
 
     def __init__(self, x, y, width, height):
         """Initializes FloatRect
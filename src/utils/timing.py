@@ -6,6 +6,8 @@ class Timer:
     """A resettable timer with an optional time limit.
 
     NOTE: Doesn't access clock but has to be updated manually."""
+    __slots__ = ('_current_time', '_length')
+
     def __init__(self, length=float('inf')):
         """Initializes Timer.
 
@@ -87,6 +89,7 @@ class Clock:
         self.delta_time = 1/fps
         self._previous_time = time.time()
         self._last_sleep = 0
+        self._frame_time = self.delta_time
         self._wait_fn = wait_fn
         self._log_skipping_frames = log_skipping_frames
 
@@ -97,6 +100,7 @@ class Clock:
         """
         self._previous_time = time.time()
         self._last_sleep = 0
+        self._frame_time = self.delta_time
 
     def tick(self):
         """Waits until end of the tick."""
@@ -107,7 +111,16 @@ class Clock:
 
         self._wait_fn(next_time)
 
-        self._previous_time = time.time()
+        current_time = time.time()
+        self._frame_time = current_time - self._previous_time
+        self._previous_time = current_time
+
+    def frame_time(self):
+        """Returns the real time in seconds that the last tick took.
+
+        Longer than `self.delta_time` if the frame was late. Before the
+        first tick returns `self.delta_time`."""
+        return self._frame_time
 
     def busy_fraction(self):
         """Returns the fraction of last frame spent outside the Clock.
@@ -32,6 +32,22 @@ def lint(ctx):
 def format(ctx):
     ctx.run("autopep8 --in-place --recursive src")
 
+@task
+def benchmark_collisions(ctx):
+    ctx.run("cd src && python3 -m benchmarks.collision_benchmark")
+
+@task
+def benchmark_shape_dispatch(ctx):
+    ctx.run("cd src && python3 -m benchmarks.shape_dispatch_benchmark")
+
+@task
+def benchmark_physics(ctx):
+    ctx.run("cd src && python3 -m benchmarks.physics_benchmark")
+
+@task
+def benchmark_memory(ctx):
+    ctx.run("cd src && python3 -m benchmarks.memory_benchmark")
+
 @task
 def init_database(ctx):
     ctx.run("python3 src/init_database.py")